@@ -0,0 +1,263 @@
+# coding: utf-8
+"""
+Cache das respostas da API.
+
+As respostas às requisições GET são armazenadas no cache do Django, indexadas
+pelo caminho do recurso, parâmetros da requisição, formato e coleções do
+usuário, além da versão dos dados. A versão é derivada da data de modificação
+mais recente de `Journal` e `Issue` e da geração do cache, renovada sempre que
+algum dos modelos serializados pelos recursos da API (`INVALIDATING_MODELS`) é
+salvo, removido ou tem as suas relações muitos-para-muitos alteradas, e
+após as alterações em lote (`journalmanager.models.bulk_updated`). Os
+usuários renovam a geração apenas quando algum dos seus campos serializados é
+alterado, e não a cada login (ver `USER_IGNORED_FIELDS`).
+Respostas armazenadas em versões anteriores são, portanto, simplesmente
+ignoradas até que expirem.
+
+As respostas são acompanhadas dos cabeçalhos `ETag` e `Last-Modified`, de
+maneira que requisições condicionais de dados não modificados são respondidas
+com 304.
+
+Para que a invalidação seja efetiva entre diferentes processos, deve ser
+utilizado um backend de cache compartilhado (memcached, por exemplo).
+"""
+import time
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.db.models import Max
+from django.db.models.signals import (post_init, post_save, post_delete,
+        m2m_changed)
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+
+from journalmanager import models
+from journalmanager.models import Journal, Issue
+from editorialmanager import models as em_models
+
+
+GENERATION_KEY = 'api:generation'
+GENERATION_TIMEOUT = 60 * 60 * 24 * 30
+RESPONSE_KEY_PREFIX = 'api:response:'
+
+# modelos serializados, diretamente ou por meio de relações, pelos recursos
+# das versões 1 e 2 da API.
+INVALIDATING_MODELS = (
+    models.UserCollections,
+    models.Collection,
+    models.Journal,
+    models.JournalMission,
+    models.JournalTitle,
+    models.JournalTimeline,
+    models.Membership,
+    models.Language,
+    models.StudyArea,
+    models.SubjectCategory,
+    models.Sponsor,
+    models.UseLicense,
+    models.Section,
+    models.SectionTitle,
+    models.Issue,
+    models.IssueTitle,
+    models.PressRelease,
+    models.PressReleaseTranslation,
+    models.PressReleaseArticle,
+    em_models.EditorialBoard,
+    em_models.EditorialMember,
+    em_models.RoleType,
+    em_models.RoleTypeTranslation,
+)
+
+# campos de `User` cujas alterações não invalidam o cache: `last_login`, que é
+# salvo a cada login, e os campos que não são serializados pelos recursos.
+USER_IGNORED_FIELDS = ('last_login', 'password', 'email', 'is_active',
+                       'is_staff', 'is_superuser')
+
+
+def get_generation():
+    """ Retorna a geração corrente do cache, representada pelo timestamp do
+    momento em que foi criada.
+    """
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = time.time()
+        cache.set(GENERATION_KEY, generation, GENERATION_TIMEOUT)
+
+    return generation
+
+
+def renew_generation():
+    """ Inicia uma nova geração do cache, invalidando todas as respostas
+    armazenadas.
+    """
+    cache.set(GENERATION_KEY, time.time(), GENERATION_TIMEOUT)
+
+
+def invalidate_on_change(sender, **kwargs):
+    if issubclass(sender, INVALIDATING_MODELS):
+        renew_generation()
+
+
+def _user_state(user):
+    return [getattr(user, field.attname) for field in user._meta.fields
+            if field.attname not in USER_IGNORED_FIELDS]
+
+
+def remember_user_state(sender, instance, **kwargs):
+    instance._httpcache_state = _user_state(instance)
+
+
+def invalidate_on_user_save(sender, instance, **kwargs):
+    state = _user_state(instance)
+    if state != getattr(instance, '_httpcache_state', None):
+        instance._httpcache_state = state
+        renew_generation()
+
+
+def invalidate_on_user_delete(sender, **kwargs):
+    renew_generation()
+
+
+def invalidate_on_relations_change(sender, instance, action, **kwargs):
+    # `sender` é o modelo intermediário da relação
+    if (action in ('post_add', 'post_remove', 'post_clear') and
+            isinstance(instance, INVALIDATING_MODELS)):
+        renew_generation()
+
+
+def invalidate_on_bulk_update(sender, **kwargs):
+    renew_generation()
+
+
+post_save.connect(invalidate_on_change,
+        dispatch_uid='api.httpcache.invalidate_on_save')
+post_delete.connect(invalidate_on_change,
+        dispatch_uid='api.httpcache.invalidate_on_delete')
+post_init.connect(remember_user_state, sender=User,
+        dispatch_uid='api.httpcache.remember_user_state')
+post_save.connect(invalidate_on_user_save, sender=User,
+        dispatch_uid='api.httpcache.invalidate_on_user_save')
+post_delete.connect(invalidate_on_user_delete, sender=User,
+        dispatch_uid='api.httpcache.invalidate_on_user_delete')
+m2m_changed.connect(invalidate_on_relations_change,
+        dispatch_uid='api.httpcache.invalidate_on_relations_change')
+models.bulk_updated.connect(invalidate_on_bulk_update,
+        dispatch_uid='api.httpcache.invalidate_on_bulk_update')
+
+
+def _timestamp(value):
+    # as datas são armazenadas no fuso horário local (`TIME_ZONE`)
+    return int(time.mktime(value.timetuple())) if value else 0
+
+
+def get_data_version():
+    """ Retorna o par (versão, timestamp da última modificação) dos dados
+    servidos pela API.
+    """
+    journals = Journal.objects.aggregate(last=Max('updated'))['last']
+    issues = Issue.objects.aggregate(last=Max('updated'))['last']
+    generation = get_generation()
+
+    version = u'%s:%s:%r' % (journals, issues, generation)
+    last_modified = max(_timestamp(journals), _timestamp(issues),
+                        int(generation))
+
+    return version, last_modified
+
+
+def get_user_scope(user):
+    """ Retorna a lista de ids das coleções do usuário.
+    """
+    if not user.is_authenticated():
+        return []
+
+    return list(user.usercollections_set.order_by(
+            'collection').values_list('collection', flat=True))
+
+
+def make_response_key(request, version):
+    """ Retorna a chave da resposta à requisição `request` na versão
+    `version` dos dados.
+    """
+    parts = [
+        request.path,
+        u'&'.join(u'%s=%s' % (k, v) for k, v in sorted(request.GET.lists())),
+        request.META.get('HTTP_ACCEPT', u''),
+        u','.join(unicode(pk) for pk in get_user_scope(request.user)),
+        version,
+    ]
+    digest = hashlib.md5(u'|'.join(parts).encode('utf-8')).hexdigest()
+
+    return RESPONSE_KEY_PREFIX + digest
+
+
+def is_not_modified(request, etag, last_modified):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = [tag.strip() for tag in if_none_match.split(',')]
+        return etag in etags or '*' in etags
+
+    if_modified_since = parse_http_date_safe(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'))
+    if if_modified_since is not None:
+        return last_modified <= if_modified_since
+
+    return False
+
+
+def cached_response(request, view):
+    """ Retorna a resposta de `view` para `request`, obtida do cache sempre
+    que possível.
+
+    :param request: instância de `HttpRequest`, já autenticada.
+    :param view: função sem argumentos que produz a resposta.
+    """
+    timeout = getattr(settings, 'API_CACHE_TIMEOUT', 0)
+    if not timeout or request.method != 'GET':
+        return view()
+
+    version, last_modified = get_data_version()
+    key = make_response_key(request, version)
+    etag = '"%s"' % key[len(RESPONSE_KEY_PREFIX):]
+
+    if is_not_modified(request, etag, last_modified):
+        response = HttpResponseNotModified()
+    else:
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+        else:
+            response = view()
+            if response.status_code != 200:
+                return response
+
+            cache.set(key, (response.content, response['Content-Type']),
+                      timeout)
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ('Accept', 'Authorization'))
+
+    return response
+
+
+class CachedResponseMixin(object):
+    """
+    Serves the responses of `get_list` and `get_detail` from the cache.
+
+    These methods are called after authentication and authorization, so the
+    cache is never hit by anonymous requests.
+    """
+    def get_list(self, request, **kwargs):
+        return cached_response(request,
+                lambda: super(CachedResponseMixin, self).get_list(request,
+                                                                  **kwargs))
+
+    def get_detail(self, request, **kwargs):
+        return cached_response(request,
+                lambda: super(CachedResponseMixin, self).get_detail(request,
+                                                                    **kwargs))
@@ -0,0 +1,4 @@
+# coding: utf-8
+# os receivers que invalidam o cache das respostas são conectados na
+# importação do módulo, e devem estar ativos também nos workers do celery.
+from api import httpcache
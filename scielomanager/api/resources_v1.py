@@ -27,6 +27,7 @@ from journalmanager.models import (
 )
 
 from scielomanager.utils import usercontext
+from api.httpcache import CachedResponseMixin
 
 
 logger = logging.getLogger(__name__)
@@ -45,7 +46,7 @@ class ApiKeyAuthMeta:
     authorization = DjangoAuthorization()
 
 
-class SectionResource(ModelResource):
+class SectionResource(CachedResponseMixin, ModelResource):
     journal = fields.ForeignKey('api.resources_v1.JournalResource',
                                 'journal')
     issues = fields.OneToManyField('api.resources_v1.IssueResource',
@@ -66,14 +67,14 @@ class SectionResource(ModelResource):
             for title in bundle.obj.titles.all()]
 
 
-class UseLicenseResource(ModelResource):
+class UseLicenseResource(CachedResponseMixin, ModelResource):
     class Meta(ApiKeyAuthMeta):
         queryset = UseLicense.objects.all()
         resource_name = 'uselicenses'
         allowed_methods = ['get', ]
 
 
-class IssueResource(ModelResource):
+class IssueResource(CachedResponseMixin, ModelResource):
     """
     IMPORTANT: is_press_release was removed on V2
     """
@@ -154,7 +155,7 @@ class IssueResource(ModelResource):
             return ''
 
 
-class CollectionResource(ModelResource):
+class CollectionResource(CachedResponseMixin, ModelResource):
 
     class Meta(ApiKeyAuthMeta):
         queryset = Collection.objects.all()
@@ -162,21 +163,21 @@ class CollectionResource(ModelResource):
         allowed_methods = ['get', ]
 
 
-class SubjectCategoryResource(ModelResource):
+class SubjectCategoryResource(CachedResponseMixin, ModelResource):
     class Meta(ApiKeyAuthMeta):
         queryset = SubjectCategory.objects.all()
         resource_name = 'subjectcategory'
         allowed_methods = ['get', ]
 
 
-class SponsorResource(ModelResource):
+class SponsorResource(CachedResponseMixin, ModelResource):
     class Meta(ApiKeyAuthMeta):
         queryset = Sponsor.objects.all()
         resource_name = 'sponsors'
         allowed_methods = ['get', ]
 
 
-class UserResource(ModelResource):
+class UserResource(CachedResponseMixin, ModelResource):
     class Meta(ApiKeyAuthMeta):
         queryset = User.objects.all()
         resource_name = 'users'
@@ -190,7 +191,7 @@ class UserResource(ModelResource):
         ]
 
 
-class JournalResource(ModelResource):
+class JournalResource(CachedResponseMixin, ModelResource):
     missions = fields.CharField(readonly=True)
     other_titles = fields.CharField(readonly=True)
     creator = fields.ForeignKey(UserResource, 'creator')
@@ -353,7 +354,7 @@ class JournalResource(ModelResource):
         return bundle
 
 
-class PressReleaseTranslationResource(ModelResource):
+class PressReleaseTranslationResource(CachedResponseMixin, ModelResource):
     language = fields.CharField(readonly=True)
 
     class Meta(ApiKeyAuthMeta):
@@ -365,7 +366,7 @@ class PressReleaseTranslationResource(ModelResource):
         return bundle.obj.language.iso_code
 
 
-class PressReleaseResource(ModelResource):
+class PressReleaseResource(CachedResponseMixin, ModelResource):
     issue_uri = fields.ForeignKey(IssueResource, 'issue')
     translations = fields.OneToManyField(PressReleaseTranslationResource,
                                          'translations',
@@ -426,7 +427,7 @@ class PressReleaseResource(ModelResource):
         return meta_data
 
 
-class AheadPressReleaseResource(ModelResource):
+class AheadPressReleaseResource(CachedResponseMixin, ModelResource):
     journal_uri = fields.ForeignKey(JournalResource, 'journal')
     translations = fields.OneToManyField(PressReleaseTranslationResource,
                                          'translations',
@@ -13,6 +13,7 @@ from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
 
 from journalmanager import models
 from editorialmanager import models as em_models
+from api.httpcache import CachedResponseMixin
 
 
 logger = logging.getLogger(__name__)
@@ -23,27 +24,52 @@ class ApiKeyAuthMeta:
     authorization = DjangoAuthorization()
 
 
-class UseLicenseResource(ModelResource):
+class PrefetchPlanMixin(object):
+    """
+    Applies to the object list the prefetch plan declared by the resource,
+    so a whole page is hydrated from a fixed number of queries.
+
+    The plan is declared at the Meta class by the attributes `select_related`
+    and `prefetch_related`, that must list every relation accessed during
+    dehydration. Filters built at `build_filters` must be applied directly
+    to the object list instead of through `pk__in` subqueries.
+    """
+    def get_object_list(self, request):
+        object_list = super(PrefetchPlanMixin, self).get_object_list(request)
+
+        select_related = getattr(self._meta, 'select_related', None)
+        if select_related:
+            object_list = object_list.select_related(*select_related)
+
+        prefetch_related = getattr(self._meta, 'prefetch_related', None)
+        if prefetch_related:
+            object_list = object_list.prefetch_related(*prefetch_related)
+
+        return object_list
+
+
+class UseLicenseResource(CachedResponseMixin, ModelResource):
     class Meta(ApiKeyAuthMeta):
         queryset = models.UseLicense.objects.all()
         resource_name = 'uselicenses'
         allowed_methods = ['get', ]
 
 
-class SponsorResource(ModelResource):
+class SponsorResource(CachedResponseMixin, ModelResource):
     class Meta(ApiKeyAuthMeta):
         queryset = models.Sponsor.objects.all()
         resource_name = 'sponsors'
         allowed_methods = ['get', ]
 
 
-class UserResource(ModelResource):
+class UserResource(CachedResponseMixin, PrefetchPlanMixin, ModelResource):
     collections = fields.CharField(readonly=True)
 
     class Meta(ApiKeyAuthMeta):
         queryset = User.objects.all()
         resource_name = 'users'
         allowed_methods = ['get', ]
+        prefetch_related = ['usercollections_set__collection']
         excludes = [
             'username',
             'email',
@@ -65,7 +91,7 @@ class UserResource(ModelResource):
         return bundle
 
 
-class CollectionResource(ModelResource):
+class CollectionResource(CachedResponseMixin, ModelResource):
 
     class Meta(ApiKeyAuthMeta):
         queryset = models.Collection.objects.all()
@@ -73,14 +99,14 @@ class CollectionResource(ModelResource):
         allowed_methods = ['get', ]
 
 
-class SubjectCategoryResource(ModelResource):
+class SubjectCategoryResource(CachedResponseMixin, ModelResource):
     class Meta(ApiKeyAuthMeta):
         queryset = models.SubjectCategory.objects.all()
         resource_name = 'subjectcategory'
         allowed_methods = ['get', ]
 
 
-class SectionResource(ModelResource):
+class SectionResource(CachedResponseMixin, PrefetchPlanMixin, ModelResource):
     journal = fields.ForeignKey('api.resources_v2.JournalResource', 'journal')
     issues = fields.OneToManyField('api.resources_v2.IssueResource', 'issue_set')
     titles = fields.CharField(readonly=True)
@@ -93,6 +119,8 @@ class SectionResource(ModelResource):
         filtering = {
             "journal": ('exact'),
         }
+        select_related = ['journal']
+        prefetch_related = ['issue_set', 'titles__language']
 
     def build_filters(self, filters=None):
         """
@@ -103,17 +131,11 @@ class SectionResource(ModelResource):
 
         orm_filters = super(SectionResource, self).build_filters(filters)
 
-        param_filters = {}
-
         if 'journal_eissn' in filters:
-            param_filters['journal__eletronic_issn'] = filters['journal_eissn']
+            orm_filters['journal__eletronic_issn'] = filters['journal_eissn']
 
         if 'journal_pissn' in filters:
-            param_filters['journal__print_issn'] = filters['journal_pissn']
-
-        sections = models.Section.objects.filter(**param_filters)
-
-        orm_filters['pk__in'] = sections
+            orm_filters['journal__print_issn'] = filters['journal_pissn']
 
         return orm_filters
 
@@ -122,7 +144,7 @@ class SectionResource(ModelResource):
             for title in bundle.obj.titles.all())
 
 
-class IssueResource(ModelResource):
+class IssueResource(CachedResponseMixin, PrefetchPlanMixin, ModelResource):
     journal = fields.ForeignKey('api.resources_v2.JournalResource', 'journal')
     sections = fields.ManyToManyField(SectionResource, 'section')
     thematic_titles = fields.CharField(readonly=True)
@@ -143,6 +165,9 @@ class IssueResource(ModelResource):
             "suppl_number": ('exact'),
             "suppl_volume": ('exact')
         }
+        select_related = ['journal', 'use_license']
+        prefetch_related = ['section__titles__language',
+                            'issuetitle_set__language']
 
     def build_filters(self, filters=None):
         """
@@ -174,9 +199,7 @@ class IssueResource(ModelResource):
             query_filters['number'] = ''
             query_filters['volume'] = filters['suppl_volume']
 
-        issues = models.Issue.objects.filter(**query_filters)
-
-        orm_filters['pk__in'] = issues
+        orm_filters.update(query_filters)
 
         return orm_filters
 
@@ -211,7 +234,7 @@ class IssueResource(ModelResource):
         return section_list
 
 
-class JournalResource(ModelResource):
+class JournalResource(CachedResponseMixin, PrefetchPlanMixin, ModelResource):
     missions = fields.CharField(readonly=True)
     other_titles = fields.CharField(readonly=True)
     abstract_keyword_languages = fields.CharField(readonly=True)
@@ -246,6 +269,13 @@ class JournalResource(ModelResource):
             'eletronic_issn': ('exact',),
             'print_issn': ('exact',),
         }
+        select_related = ['creator', 'use_license', 'previous_title',
+                          'succeeding_title']
+        prefetch_related = ['missions__language', 'other_titles',
+                            'languages', 'statuses', 'study_areas',
+                            'membership_set__collection', 'collections',
+                            'subject_categories', 'sponsor', 'issue_set',
+                            'section_set']
 
     def build_filters(self, filters=None):
         """
@@ -254,21 +284,29 @@ class JournalResource(ModelResource):
         if filters is None:
             filters = {}
 
-        query_filters = {}
-
         orm_filters = super(JournalResource, self).build_filters(filters)
 
+        # ambos os filtros se referem à mesma relação `membership`, de
+        # maneira que o status é verificado na coleção informada.
         if 'collection' in filters:
-            query_filters['collections__name_slug'] = filters['collection']
+            orm_filters['membership__collection__name_slug'] = filters['collection']
 
         if 'pubstatus' in filters:
-            query_filters['membership__status__in'] = filters.getlist('pubstatus')
+            orm_filters['membership__status__in'] = filters.getlist('pubstatus')
 
-        journals = models.Journal.objects.filter(**query_filters)
+        return orm_filters
 
-        orm_filters['pk__in'] = journals
+    def apply_filters(self, request, applicable_filters):
+        object_list = super(JournalResource, self).apply_filters(request,
+                applicable_filters)
 
-        return orm_filters
+        # um mesmo periódico pode satisfazer o filtro por status em mais de
+        # uma coleção.
+        if ('membership__status__in' in applicable_filters and
+                'membership__collection__name_slug' not in applicable_filters):
+            object_list = object_list.distinct()
+
+        return object_list
 
     def dehydrate_missions(self, bundle):
         return {mission.language.iso_code: mission.description
@@ -283,20 +321,23 @@ class JournalResource(ModelResource):
             for language in bundle.obj.languages.all()]
 
     def dehydrate_pub_status_history(self, bundle):
+        # a ordenação é feita em memória para aproveitar os dados pré-carregados
+        events = sorted(bundle.obj.statuses.all(),
+                        key=lambda event: event.since, reverse=True)
         return [{'date': event.since,
                 'status': event.status}
-            for event in bundle.obj.statuses.order_by('-since').all()]
+            for event in events]
 
     def dehydrate_study_areas(self, bundle):
         return [area.study_area for area in bundle.obj.study_areas.all()]
 
     def dehydrate_pub_status(self, bundle):
-        return {col.name: bundle.obj.membership_info(col, 'status')
-            for col in bundle.obj.collections.all()}
+        return {membership.collection.name: membership.status
+            for membership in bundle.obj.membership_set.all()}
 
     def dehydrate_pub_status_reason(self, bundle):
-        return {col.name: bundle.obj.membership_info(col, 'reason')
-            for col in bundle.obj.collections.all()}
+        return {membership.collection.name: membership.reason
+            for membership in bundle.obj.membership_set.all()}
 
     def dehydrate_collections(self, bundle):
         return [col.name for col in bundle.obj.collections.all()]
@@ -311,19 +352,20 @@ class JournalResource(ModelResource):
         return bundle
 
 
-class PressReleaseTranslationResource(ModelResource):
+class PressReleaseTranslationResource(CachedResponseMixin, PrefetchPlanMixin, ModelResource):
     language = fields.CharField(readonly=True)
 
     class Meta(ApiKeyAuthMeta):
         resource_name = 'prtranslations'
         queryset = models.PressReleaseTranslation.objects.all()
         allowed_methods = ['get', ]
+        select_related = ['language']
 
     def dehydrate_language(self, bundle):
         return bundle.obj.language.iso_code
 
 
-class PressReleaseResource(ModelResource):
+class PressReleaseResource(CachedResponseMixin, PrefetchPlanMixin, ModelResource):
     issue_uri = fields.ForeignKey(IssueResource, 'issue')
     translations = fields.OneToManyField(PressReleaseTranslationResource,
                                          'translations',
@@ -336,6 +378,8 @@ class PressReleaseResource(ModelResource):
         queryset = models.RegularPressRelease.objects.all()
         allowed_methods = ['get', ]
         ordering = ['id']
+        select_related = ['issue__journal']
+        prefetch_related = ['translations__language', 'articles']
 
     def build_filters(self, filters=None):
         """
@@ -385,7 +429,7 @@ class PressReleaseResource(ModelResource):
         return meta_data
 
 
-class AheadPressReleaseResource(ModelResource):
+class AheadPressReleaseResource(CachedResponseMixin, PrefetchPlanMixin, ModelResource):
     journal_uri = fields.ForeignKey(JournalResource, 'journal')
     translations = fields.OneToManyField(PressReleaseTranslationResource,
                                          'translations',
@@ -396,6 +440,8 @@ class AheadPressReleaseResource(ModelResource):
         resource_name = 'apressreleases'
         queryset = models.AheadPressRelease.objects.all()
         allowed_methods = ['get', ]
+        select_related = ['journal']
+        prefetch_related = ['translations__language', 'articles']
 
     def dehydrate_articles(self, bundle):
         return [art.article_pid for art in bundle.obj.articles.all()]
@@ -422,16 +468,17 @@ class AheadPressReleaseResource(ModelResource):
         return orm_filters
 
 
-class EditorialBoardResource(ModelResource):
+class EditorialBoardResource(CachedResponseMixin, PrefetchPlanMixin, ModelResource):
     issue = fields.ToOneField(IssueResource, 'issue')
 
     class Meta(ApiKeyAuthMeta):
         resource_name = 'editorialboard'
         queryset = em_models.EditorialBoard.objects.all()
         allowed_methods = ['get', ]
+        select_related = ['issue']
 
 
-class RoleTypeResource(ModelResource):
+class RoleTypeResource(CachedResponseMixin, ModelResource):
 
     class Meta(ApiKeyAuthMeta):
         resource_name = 'roletype'
@@ -440,7 +487,7 @@ class RoleTypeResource(ModelResource):
         ordering = ('name', )
 
 
-class EditorialMemberResource(ModelResource):
+class EditorialMemberResource(CachedResponseMixin, PrefetchPlanMixin, ModelResource):
     role = fields.ForeignKey(RoleTypeResource, 'role')
     board = fields.ForeignKey(EditorialBoardResource, 'board')
 
@@ -449,9 +496,10 @@ class EditorialMemberResource(ModelResource):
         queryset = em_models.EditorialMember.objects.all()
         allowed_methods = ['get', ]
         ordering = ('board', 'order', 'pk')
+        select_related = ['role', 'board']
 
 
-class LanguageResource(ModelResource):
+class LanguageResource(CachedResponseMixin, ModelResource):
 
     class Meta(ApiKeyAuthMeta):
         resource_name = 'language'
@@ -460,7 +508,7 @@ class LanguageResource(ModelResource):
         ordering = ('name', )
 
 
-class RoleTypeTranslationResource(ModelResource):
+class RoleTypeTranslationResource(CachedResponseMixin, PrefetchPlanMixin, ModelResource):
     role = fields.ForeignKey(RoleTypeResource, 'role')
     language = fields.ForeignKey(LanguageResource, 'language')
 
@@ -468,3 +516,4 @@ class RoleTypeTranslationResource(ModelResource):
         resource_name = 'roletypetranslation'
         queryset = em_models.RoleTypeTranslation.objects.all()
         allowed_methods = ['get', ]
+        select_related = ['role', 'language']
@@ -0,0 +1,120 @@
+#coding: utf-8
+import datetime
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+from django_webtest import WebTest
+from django_factory_boy import auth
+
+from journalmanager import models
+from journalmanager.tests import modelfactories
+
+
+def _make_auth_environ(username, token):
+    return {'HTTP_AUTHORIZATION': 'ApiKey {0}:{1}'.format(username, token)}
+
+
+@override_settings(API_CACHE_TIMEOUT=60)
+class CachedResponseTests(WebTest):
+
+    def setUp(self):
+        cache.clear()
+        self.user = auth.UserF(is_active=True)
+        self.extra_environ = _make_auth_environ(self.user.username,
+            self.user.api_key.key)
+        self.journal = modelfactories.JournalFactory.create()
+
+    def _get(self, url, status=200, **headers):
+        return self.app.get(url, headers=headers, status=status,
+            extra_environ=self.extra_environ)
+
+    def test_responses_carry_validators(self):
+        response = self._get('/api/v2/journals/')
+
+        self.assertTrue(response.headers.get('ETag'))
+        self.assertTrue(response.headers.get('Last-Modified'))
+
+    def test_unchanged_resources_are_answered_with_304(self):
+        etag = self._get('/api/v2/journals/').headers['ETag']
+
+        self._get('/api/v2/journals/', status=304, **{'If-None-Match': etag})
+
+    def test_not_modified_since(self):
+        last_modified = self._get('/api/v2/journals/').headers['Last-Modified']
+
+        self._get('/api/v2/journals/', status=304,
+                **{'If-Modified-Since': last_modified})
+
+    def test_cached_bodies_are_reused(self):
+        first = self._get('/api/v2/journals/')
+
+        # `update` não dispara signals nem altera `Journal.updated`
+        models.Journal.objects.filter(pk=self.journal.pk).update(
+                title=u'Other title')
+        second = self._get('/api/v2/journals/')
+
+        self.assertEqual(first.content, second.content)
+
+    def test_filters_are_part_of_the_key(self):
+        all_journals = self._get('/api/v2/journals/')
+        filtered = self._get('/api/v2/journals/?print_issn=0000-0000')
+
+        self.assertNotEqual(all_journals.headers['ETag'],
+                            filtered.headers['ETag'])
+        self.assertEqual(filtered.json['objects'], [])
+
+    def test_changes_invalidate_the_cache(self):
+        etag = self._get('/api/v2/journals/').headers['ETag']
+
+        self.journal.title = u'Other title'
+        self.journal.save()
+
+        response = self._get('/api/v2/journals/', **{'If-None-Match': etag})
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(response.json['objects'][0]['title'], u'Other title')
+
+    def test_deletions_invalidate_the_cache(self):
+        etag = self._get('/api/v2/journals/').headers['ETag']
+
+        self.journal.delete()
+
+        response = self._get('/api/v2/journals/', **{'If-None-Match': etag})
+        self.assertEqual(response.json['objects'], [])
+
+    def test_changes_of_related_models_invalidate_the_cache(self):
+        etag = self._get('/api/v2/collections/').headers['ETag']
+
+        modelfactories.CollectionFactory.create()
+
+        response = self._get('/api/v2/collections/', **{'If-None-Match': etag})
+        self.assertEqual(len(response.json['objects']), 1)
+
+    def test_changes_of_users_invalidate_the_cache(self):
+        etag = self._get('/api/v2/users/').headers['ETag']
+
+        self.user.first_name = u'Other name'
+        self.user.save()
+
+        response = self._get('/api/v2/users/', **{'If-None-Match': etag})
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_logins_keep_the_cache(self):
+        etag = self._get('/api/v2/users/').headers['ETag']
+
+        # `login` salva `last_login`
+        self.user.last_login = datetime.datetime.now()
+        self.user.save()
+
+        self._get('/api/v2/users/', status=304, **{'If-None-Match': etag})
+
+    def test_changes_of_unserialized_models_keep_the_cache(self):
+        etag = self._get('/api/v2/journals/').headers['ETag']
+
+        modelfactories.ArticleFactory.create()
+
+        self._get('/api/v2/journals/', status=304, **{'If-None-Match': etag})
+
+    def test_unauthenticated_requests_are_not_served(self):
+        self._get('/api/v2/journals/')
+
+        self.app.get('/api/v2/journals/', status=401)
@@ -2,6 +2,7 @@
 
 import json
 import datetime
+from django.db import connection
 from django_webtest import WebTest
 from django_factory_boy import auth
 
@@ -30,6 +31,20 @@ def _makePermission(perm, model, app_label='journalmanager'):
     return auth_models.Permission.objects.get(codename=perm, content_type=ct)
 
 
+def _count_queries(func, *args, **kwargs):
+    """
+    Returns the number of database queries performed by `func`.
+    """
+    old_debug_cursor = connection.use_debug_cursor
+    connection.use_debug_cursor = True
+    try:
+        start = len(connection.queries)
+        func(*args, **kwargs)
+        return len(connection.queries) - start
+    finally:
+        connection.use_debug_cursor = old_debug_cursor
+
+
 def _makeUseLicense():
     from journalmanager.models import UseLicense
     ul = UseLicense(license_code='TEST')
@@ -280,6 +295,43 @@ class JournalRestAPITest(WebTest):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(json.loads(response.content)['objects']), 1)
 
+    def test_filter_by_pubstatus_does_not_repeat_journals(self):
+        col = modelfactories.CollectionFactory()
+        col2 = modelfactories.CollectionFactory()
+
+        journal = modelfactories.JournalFactory.create()
+        journal.join(col, self.user)
+        journal.change_status(col, 'current', 'testing', self.user)
+        journal.join(col2, self.user)
+        journal.change_status(col2, 'current', 'testing', self.user)
+
+        response = self.app.get('/api/v2/journals/?pubstatus=current',
+            extra_environ=self.extra_environ)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)['objects']), 1)
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        def make_journal():
+            col = modelfactories.CollectionFactory()
+            journal = modelfactories.JournalFactory.create()
+            journal.join(col, self.user)
+            journal.change_status(col, 'current', 'testing', self.user)
+            modelfactories.IssueFactory.create(journal=journal)
+
+        def get_journals():
+            self.app.get('/api/v2/journals/?limit=100',
+                extra_environ=self.extra_environ)
+
+        make_journal()
+        single = _count_queries(get_journals)
+
+        for _ in range(3):
+            make_journal()
+        many = _count_queries(get_journals)
+
+        self.assertEqual(single, many)
+
     def test_filter_print_issn(self):
         col = modelfactories.CollectionFactory()
 
@@ -492,6 +544,20 @@ class IssuesRestAPITest(WebTest):
         self.assertEqual(response.status_code, 200)
         self.assertTrue('objects' in response.content)
 
+    def test_list_queries_do_not_grow_with_page_size(self):
+        def get_issues():
+            self.app.get('/api/v2/issues/?limit=100',
+                extra_environ=self.extra_environ)
+
+        modelfactories.IssueFactory.create()
+        single = _count_queries(get_issues)
+
+        for _ in range(3):
+            modelfactories.IssueFactory.create()
+        many = _count_queries(get_issues)
+
+        self.assertEqual(single, many)
+
     def test_issue_filters(self):
         resource_filters = IssueResource().Meta
         mandatory_filters = ['journal', 'is_marked_up']
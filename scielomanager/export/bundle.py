@@ -1,10 +1,14 @@
 # coding: utf-8
 import os
+import time
 import tarfile
 import zipfile
 import StringIO
 import tempfile
-from datetime import datetime
+
+
+# prefix of the files being written by `Bundle.deploy`
+TEMP_PREFIX = '.bundle-'
 
 
 class Bundle(object):
@@ -16,14 +20,15 @@ class Bundle(object):
         """
         self._data = dict(args)
 
-    def _tar(self):
+    def _tar(self, target=None):
         """
         Generate a tarball containing the data passed at init time.
 
-        Returns a file handler.
+        The tarball is written to the file object `target`, or to a temporary
+        file if it is not given. Returns the file handler.
         """
-        tmp = tempfile.NamedTemporaryFile(delete=True)
-        out = tarfile.open(tmp.name, 'w')
+        tmp = target or tempfile.NamedTemporaryFile(delete=True)
+        out = tarfile.open(fileobj=tmp, mode='w')
 
         try:
             for name, data in self._data.items():
@@ -36,9 +41,9 @@ class Bundle(object):
         tmp.seek(0)
         return tmp
 
-    def _zip(self):
-        tmp = tempfile.NamedTemporaryFile(delete=True)
-        out = zipfile.ZipFile(tmp.name, mode='w')
+    def _zip(self, target=None):
+        tmp = target or tempfile.NamedTemporaryFile(delete=True)
+        out = zipfile.ZipFile(tmp, mode='w')
 
         try:
             for name, data in self._data.items():
@@ -54,28 +59,63 @@ class Bundle(object):
         return tmp
 
     def deploy(self, target):
+        """
+        Writes the bundle at `target`.
 
-        if target.endswith('tar'):
-            data = self._tar()
-        else:
-            data = self._zip()
-
-        base_path = os.path.split(os.path.splitext(target)[-2])[0]
+        The bundle is written to a hidden file in the same directory, which is
+        then renamed to `target`, so that partially written bundles are never
+        visible at `target`.
+        """
+        base_path = os.path.dirname(target)
         if not os.path.exists(base_path):
-            os.makedirs(base_path, 0755)
-
-        with open(target, 'w') as f:
-            f.write(data.read())
-
-        data.close()
+            try:
+                os.makedirs(base_path, 0755)
+            except OSError:
+                # created concurrently by another process
+                if not os.path.isdir(base_path):
+                    raise
+
+        fd, tmp_path = tempfile.mkstemp(dir=base_path, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'w+b') as f:
+                if target.endswith('tar'):
+                    self._tar(f)
+                else:
+                    self._zip(f)
+
+            os.chmod(tmp_path, 0644)
+            os.rename(tmp_path, target)
+        except:
+            os.unlink(tmp_path)
+            raise
+
+
+def remove_stale_files(directory, prefix, max_age):
+    """
+    Removes the files in `directory` whose names start with `prefix` and that
+    were not modified in the last `max_age` seconds.
+
+    Returns the number of removed files.
+    """
+    try:
+        filenames = os.listdir(directory)
+    except OSError:
+        return 0
+
+    threshold = time.time() - max_age
+    removed = 0
+    for filename in filenames:
+        if not filename.startswith(prefix):
+            continue
+
+        path = os.path.join(directory, filename)
+        try:
+            if os.path.getmtime(path) < threshold:
+                os.unlink(path)
+                removed += 1
+        except OSError:
+            # removed concurrently by another process
+            pass
 
+    return removed
 
-def generate_filename(prefix,
-                      filetype='tar',
-                      fmt='%Y%m%d-%H:%M:%S:%f'):
-        """
-        Generates a string to be used as the bundle filename.
-        Format: <prefix>-<data-fmt>.<filetype>>
-        """
-        now = datetime.strftime(datetime.now(), fmt)
-        return '{0}.{1}'.format('-'.join([prefix, now]), filetype)
@@ -0,0 +1,58 @@
+# coding: utf-8
+"""Inicia a exportação dos arquivos de markup de uma coleção.
+"""
+import datetime
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+
+from journalmanager.models import Collection
+from export import tasks
+from export.models import MarkupFilesExport
+
+
+_HELP = u"""\
+Produz, em segundo plano, um único pacote com os arquivos de markup de todos
+os fascículos da coleção <name_slug>, ou apenas dos fascículos alterados a
+partir da data informada em --since (AAAA-MM-DD). O progresso pode ser
+acompanhado pelo registro MarkupFilesExport exibido.
+"""
+
+
+def _to_bytestring(text):
+    return text.encode('utf-8')
+
+
+class Command(BaseCommand):
+    args = '<name_slug>'
+    help = _HELP
+    option_list = BaseCommand.option_list + (
+        make_option('--since', action='store', dest='since', default=None),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 1:
+            raise CommandError(_to_bytestring(
+                    u'Informe o name_slug da coleção'))
+
+        try:
+            collection = Collection.objects.get(name_slug=args[0])
+        except Collection.DoesNotExist:
+            raise CommandError(_to_bytestring(
+                    u'Coleção inexistente: %s' % args[0]))
+
+        since = None
+        if options['since']:
+            try:
+                since = datetime.datetime.strptime(
+                        options['since'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError(_to_bytestring(
+                        u'--since deve estar no formato AAAA-MM-DD'))
+
+        export = MarkupFilesExport.objects.create(collection=collection,
+                                                  since=since)
+        tasks.export_markup_files.delay(export.pk)
+
+        self.stdout.write(_to_bytestring(
+            u'Exportação %s iniciada: %s\n' % (export.pk, export)))
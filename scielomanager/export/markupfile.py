@@ -1,4 +1,7 @@
 # coding: utf-8
+import os
+import hashlib
+
 from django.conf import settings
 
 from . import bundle
@@ -6,6 +9,15 @@ from . import bundle
 MEDIA_ROOT = settings.MEDIA_ROOT + '/export/'
 MEDIA_URL = settings.MEDIA_URL + '/export/'
 
+BUNDLE_PREFIX = 'markupfiles-'
+# must be changed whenever the content of the bundles changes for the same
+# inputs, so that bundles cached by previous versions are not reused.
+BUNDLE_FORMAT_VERSION = 1
+# bundles not requested for this many seconds are removed.
+BUNDLE_MAX_AGE = getattr(settings, 'MARKUP_BUNDLE_MAX_AGE', 60 * 60 * 24 * 7)
+# files left behind by interrupted deploys are removed after this many seconds.
+TEMP_MAX_AGE = 60 * 60
+
 standards = {
     'iso690': ('icitat', 'iso', u'iso 690/87 - international standard organization'),
     'nbr6023': ('acitat', 'abnt', u'nbr 6023/89 - associação nacional de normas técnicas'),
@@ -125,10 +137,22 @@ class Issue(object):
 
 class L10nIssue(Automata, Issue):
 
-    def __init__(self, journal, issue, language):
+    def __init__(self, journal, issue, language, sections=None):
+        """
+        `sections` is an optional list of the available sections of `issue`,
+        preloaded by the caller, whose items are rendered with `unicode` and
+        have the `actual_code` attribute.
+        """
         self._journal = journal
         self._issue = issue
         self._language = language
+        self._sections = sections
+
+    def _available_sections(self):
+        if self._sections is None:
+            return self._issue.section.available(True).all()
+
+        return self._sections
 
     @property
     def abbrev_title(self):
@@ -195,12 +219,12 @@ class L10nIssue(Automata, Issue):
 
     @property
     def sections(self):
-        sections = ';'.join([unicode(section) for section in self._issue.section.available(True).all()])
+        sections = ';'.join([unicode(section) for section in self._available_sections()])
         return sections + u';' + L10ISSUEMGS[self._language][0] if sections else L10ISSUEMGS[self._language][0]
 
     @property
     def sections_ids(self):
-        ids = ';'.join([unicode(section.actual_code) for section in self._issue.section.available(True).all()])
+        ids = ';'.join([unicode(section.actual_code) for section in self._available_sections()])
         return ids + u';nd' if ids else u'nd'
 
     @property
@@ -291,16 +315,81 @@ class JournalStandard(L10nIssue):
         return self.journal_meta
 
 
-def generate(journal, issue):
+def journal_state(journal):
+    """
+    Returns the values of `journal` that are exported in the bundles.
+    """
+    study_areas = list(journal.study_areas.order_by('pk').values_list(
+        'pk', 'study_area'))
+
+    return [journal.pk, journal.updated, study_areas]
+
+
+def issue_state(issue):
+    """
+    Returns the values of `issue` and its available sections that are
+    exported in the bundles.
+    """
+    from journalmanager import models
+    sections = list(issue.section.available(True).order_by('pk').values_list(
+        'pk', 'code', 'updated'))
+    titles = list(models.SectionTitle.objects.filter(
+        section__in=[pk for pk, _, _ in sections]).order_by(
+        'section', 'language', 'title').values_list(
+        'section', 'language', 'title'))
+
+    return [issue.pk, issue.updated, sections, titles]
+
+
+def bundle_key(*inputs):
+    """
+    Returns the content address of the bundle produced from `inputs`.
+    """
+    return hashlib.sha1(repr((BUNDLE_FORMAT_VERSION, ) + inputs)).hexdigest()
+
+
+def deploy_cached(key, build):
+    """
+    Returns the URL of the bundle identified by `key`, which is produced by
+    `build` only if it does not exist yet.
+
+    Producing a new bundle also removes the ones that were not requested in
+    the last `BUNDLE_MAX_AGE` seconds, including the timestamped bundles
+    produced before bundles were cached, and the temporary files of deploys
+    interrupted more than `TEMP_MAX_AGE` seconds ago.
+
+    :param build: function that returns a `bundle.Bundle` instance.
+    """
+    pkg_filename = BUNDLE_PREFIX + key + '.zip'
+    pkg_path = MEDIA_ROOT + pkg_filename
+
+    try:
+        # the modification time tells when the bundle was last requested
+        os.utime(pkg_path, None)
+    except OSError:
+        build().deploy(pkg_path)
+        bundle.remove_stale_files(MEDIA_ROOT, BUNDLE_PREFIX, BUNDLE_MAX_AGE)
+        bundle.remove_stale_files(MEDIA_ROOT, bundle.TEMP_PREFIX, TEMP_MAX_AGE)
+
+    return MEDIA_URL + pkg_filename
+
+
+def issue_packmeta(journal, issue, sections=None):
+    """
+    Returns the list of (filename, content) pairs of the markup files of
+    `issue`.
+
+    :param sections: (optional) see `L10nIssue`.
+    """
     export_automata = Automata(journal)
     export_issue = Issue(issue)
-    export_l10n_issue_en = L10nIssue(journal, issue, 'en')
-    export_l10n_issue_pt = L10nIssue(journal, issue, 'pt')
-    export_l10n_issue_es = L10nIssue(journal, issue, 'es')
+    export_l10n_issue_en = L10nIssue(journal, issue, 'en', sections=sections)
+    export_l10n_issue_pt = L10nIssue(journal, issue, 'pt', sections=sections)
+    export_l10n_issue_es = L10nIssue(journal, issue, 'es', sections=sections)
     export_journal_standard = JournalStandard(journal, issue)
 
     try:
-        packmeta = [
+        return [
             ('automata.mds', unicode(export_automata)),
             ('issue.mds', unicode(export_issue)),
             ('en_issue.mds', unicode(export_l10n_issue_en)),
@@ -310,13 +399,15 @@ def generate(journal, issue):
         ]
     except AttributeError as exc:
         raise GenerationError('it was impossible to generate the package for %s. %s' % (journal.pk, exc))
-    else:
-        pkg = bundle.Bundle(*packmeta)
 
-    pkg_filename = bundle.generate_filename('markupfiles', filetype='zip')
 
-    pkg.deploy(MEDIA_ROOT + pkg_filename)
-    return MEDIA_URL + pkg_filename
+def generate(journal, issue):
+
+    def build():
+        return bundle.Bundle(*issue_packmeta(journal, issue))
+
+    key = bundle_key('issue', journal_state(journal), issue_state(issue))
+    return deploy_cached(key, build)
 
 
 class Ahead(object):
@@ -521,28 +612,27 @@ def generate_ahead(journal_id, year):
     from journalmanager import models
     journal = models.Journal.objects.get(id=journal_id)
 
-    export_automata = Automata(journal)
-    export_ahead = Ahead(journal, year)
-    export_l10n_issue_en = L10nAhead(journal, year, 'en')
-    export_l10n_issue_pt = L10nAhead(journal, year, 'pt')
-    export_l10n_issue_es = L10nAhead(journal, year, 'es')
-    export_journal_standard = JournalStandardAhead(journal)
+    def build():
+        export_automata = Automata(journal)
+        export_ahead = Ahead(journal, year)
+        export_l10n_issue_en = L10nAhead(journal, year, 'en')
+        export_l10n_issue_pt = L10nAhead(journal, year, 'pt')
+        export_l10n_issue_es = L10nAhead(journal, year, 'es')
+        export_journal_standard = JournalStandardAhead(journal)
 
-    try:
-        packmeta = [
-            ('automata.mds', unicode(export_automata)),
-            ('issue.mds', unicode(export_ahead)),
-            ('en_issue.mds', unicode(export_l10n_issue_en)),
-            ('es_issue.mds', unicode(export_l10n_issue_es)),
-            ('pt_issue.mds', unicode(export_l10n_issue_pt)),
-            ('journal-standard.txt', unicode(export_journal_standard)),
-        ]
-    except AttributeError as exc:
-        raise GenerationError('it was impossible to generate the package for %s. %s' % (journal.pk, exc))
-    else:
-        pkg = bundle.Bundle(*packmeta)
-
-    pkg_filename = bundle.generate_filename('markupfiles', filetype='zip')
-
-    pkg.deploy(MEDIA_ROOT + pkg_filename)
-    return MEDIA_URL + pkg_filename
+        try:
+            packmeta = [
+                ('automata.mds', unicode(export_automata)),
+                ('issue.mds', unicode(export_ahead)),
+                ('en_issue.mds', unicode(export_l10n_issue_en)),
+                ('es_issue.mds', unicode(export_l10n_issue_es)),
+                ('pt_issue.mds', unicode(export_l10n_issue_pt)),
+                ('journal-standard.txt', unicode(export_journal_standard)),
+            ]
+        except AttributeError as exc:
+            raise GenerationError('it was impossible to generate the package for %s. %s' % (journal.pk, exc))
+
+        return bundle.Bundle(*packmeta)
+
+    key = bundle_key('ahead', journal_state(journal), unicode(year))
+    return deploy_cached(key, build)
@@ -1,3 +1,47 @@
+# coding: utf-8
 from django.db import models
+from django.utils.translation import ugettext_lazy as _
 
-# Create your models here.
+from journalmanager.models import Collection
+
+
+class MarkupFilesExport(models.Model):
+    """
+    Background job that generates the markup files of every issue of a
+    collection, or of the issues changed since a given date, in a single
+    archive. See `export.tasks.export_markup_files`.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (RUNNING, _('Running')),
+        (DONE, _('Done')),
+        (FAILED, _('Failed')),
+    )
+
+    collection = models.ForeignKey(Collection)
+    since = models.DateField(null=True, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES,
+                              default=PENDING)
+    total_issues = models.PositiveIntegerField(default=0)
+    processed_issues = models.PositiveIntegerField(default=0)
+    archive = models.FileField(upload_to='export/jobs', max_length=1024,
+                               blank=True, default=u'')
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __unicode__(self):
+        return u'%s (%s)' % (self.collection, self.get_status_display())
+
+    @property
+    def progress(self):
+        """
+        Percentage of processed issues.
+        """
+        if not self.total_issues:
+            return 100 if self.status == self.DONE else 0
+
+        return self.processed_issues * 100 // self.total_issues
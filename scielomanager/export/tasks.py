@@ -0,0 +1,231 @@
+# coding: utf-8
+""" Tasks do celery para a aplicação `export`.
+"""
+import os
+import shutil
+import zipfile
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import F
+from celery import chord
+from celery.utils.log import get_task_logger
+
+from scielomanager.celery import app
+from journalmanager.models import Journal, Issue, Section, SectionTitle
+from . import bundle, markupfile
+from .models import MarkupFilesExport
+
+
+logger = get_task_logger(__name__)
+
+
+def get_job_dir(export_pk):
+    """Diretório de trabalho da exportação `export_pk`, em `MEDIA_ROOT`.
+    """
+    return os.path.join(settings.MEDIA_ROOT, 'export', 'jobs',
+                        unicode(export_pk))
+
+
+def export_has_failed(export_pk):
+    """Indica se a exportação `export_pk` foi marcada como falha.
+    """
+    return MarkupFilesExport.objects.filter(pk=export_pk,
+            status=MarkupFilesExport.FAILED).exists()
+
+
+class PreloadedSection(object):
+    """Seção cujo título e código foram obtidos previamente, de maneira que
+    `markupfile.L10nIssue` não consulte o banco de dados.
+    """
+    def __init__(self, actual_code, title):
+        self.actual_code = actual_code
+        self.title = title
+
+    def __unicode__(self):
+        return self.title
+
+
+def preload_sections(issue_pks):
+    """Retorna o dicionário {pk do fascículo: lista de `PreloadedSection`}
+    com as seções disponíveis dos fascículos `issue_pks`.
+
+    São realizadas três consultas, independentemente da quantidade de
+    fascículos e seções.
+    """
+    links = list(Issue.section.through.objects.filter(
+            issue__in=issue_pks).values_list('issue', 'section'))
+
+    codes = dict(Section.objects.available(True).filter(
+            pk__in=set(section for _, section in links)).values_list(
+            'pk', 'code'))
+
+    # equivalente a `unicode(section)`
+    titles = defaultdict(list)
+    for section, title in SectionTitle.objects.filter(
+            section__in=codes.keys()).order_by(
+            'section', 'language').values_list('section', 'title'):
+        titles[section].append(title)
+
+    sections = defaultdict(list)
+    for issue, section in sorted(links):
+        if section in codes:
+            sections[issue].append(PreloadedSection(codes[section],
+                    u' | '.join(titles[section])))
+
+    return sections
+
+
+def issue_dirname(issue):
+    """Nome do diretório dos arquivos do fascículo no pacote.
+    """
+    return u'%s_%04d' % (issue.publication_year, issue.order)
+
+
+@app.task
+def export_journal_markup_files(export_pk, journal_pk, issue_pks):
+    """Produz os arquivos de markup dos fascículos `issue_pks` do periódico
+    `journal_pk`, em um pacote parcial no diretório de trabalho da exportação.
+
+    Os dados do periódico e das seções são obtidos uma única vez para todos
+    os fascículos. Caso a tarefa falhe, a exportação é marcada como falha
+    imediatamente, sem aguardar o término das tarefas dos demais periódicos,
+    que deixam de produzir os seus pacotes parciais.
+    """
+    try:
+        return _export_journal_markup_files(export_pk, journal_pk, issue_pks)
+    except Exception:
+        mark_export_as_failed(None, export_pk)
+        raise
+
+
+def _export_journal_markup_files(export_pk, journal_pk, issue_pks):
+    if export_has_failed(export_pk):
+        logger.info('Markup files export %s has failed. Skipping journal %s.',
+                export_pk, journal_pk)
+        return 0
+
+    journal = Journal.objects.prefetch_related('study_areas').get(
+            pk=journal_pk)
+    # `JournalStandard.study_area` acessa `study_areas.all()`, obtido acima
+    issues = Issue.objects.filter(pk__in=issue_pks).order_by(
+            'publication_year', 'order')
+    sections = preload_sections(issue_pks)
+
+    packmeta = []
+    failures = 0
+    for issue in issues:
+        issue.journal = journal
+        prefix = u'/'.join([journal.acronym.lower(), issue_dirname(issue)])
+        try:
+            packmeta.extend((u'/'.join([prefix, filename]), content)
+                    for filename, content in markupfile.issue_packmeta(
+                        journal, issue, sections=sections[issue.pk]))
+        except markupfile.GenerationError as exc:
+            failures += 1
+            logger.error('Cannot generate the markup files of issue %s: %s',
+                    issue.pk, exc)
+
+    job_dir = get_job_dir(export_pk)
+    bundle.Bundle(*packmeta).deploy(
+            os.path.join(job_dir, '%s.zip' % journal_pk))
+
+    # a exportação pode ter falhado, e o diretório de trabalho removido por
+    # `mark_export_as_failed`, durante a produção do pacote parcial.
+    if export_has_failed(export_pk):
+        shutil.rmtree(job_dir, ignore_errors=True)
+        return failures
+
+    MarkupFilesExport.objects.filter(pk=export_pk).update(
+            processed_issues=F('processed_issues') + len(issue_pks))
+
+    return failures
+
+
+@app.task
+def archive_markup_files(failures, export_pk):
+    """Reúne os pacotes parciais produzidos por `export_journal_markup_files`
+    em um único pacote, registrado em `MarkupFilesExport.archive`.
+    """
+    export = MarkupFilesExport.objects.get(pk=export_pk)
+    job_dir = get_job_dir(export_pk)
+
+    archive_name = u'export/jobs/markupfiles-%s-%s.zip' % (
+            export.collection.name_slug or export.collection.pk, export.pk)
+    archive_path = os.path.join(settings.MEDIA_ROOT, archive_name)
+
+    out = zipfile.ZipFile(archive_path, mode='w')
+    try:
+        for part_name in sorted(os.listdir(job_dir)):
+            if not part_name.endswith('.zip'):
+                continue
+
+            part = zipfile.ZipFile(os.path.join(job_dir, part_name))
+            try:
+                for info in part.infolist():
+                    out.writestr(info, part.read(info))
+            finally:
+                part.close()
+    finally:
+        out.close()
+
+    shutil.rmtree(job_dir, ignore_errors=True)
+
+    export.archive.name = archive_name
+    export.status = MarkupFilesExport.DONE
+    export.finished_at = datetime.datetime.now()
+    export.save()
+
+    logger.info('Markup files export %s finished with %s failures.',
+            export_pk, sum(failures or []))
+
+    return export.archive.url
+
+
+@app.task
+def mark_export_as_failed(task_id, export_pk):
+    """Callback de erro das tarefas da exportação `export_pk`.
+    """
+    MarkupFilesExport.objects.filter(pk=export_pk).update(
+            status=MarkupFilesExport.FAILED,
+            finished_at=datetime.datetime.now())
+    shutil.rmtree(get_job_dir(export_pk), ignore_errors=True)
+
+
+@app.task
+def export_markup_files(export_pk):
+    """Inicia a exportação `export_pk`, distribuindo entre os workers uma
+    tarefa por periódico. O progresso é registrado em
+    `MarkupFilesExport.processed_issues`.
+    """
+    export = MarkupFilesExport.objects.get(pk=export_pk)
+
+    issues = Issue.objects.available(True).filter(
+            journal__membership__collection=export.collection)
+    if export.since:
+        issues = issues.filter(updated__gte=export.since)
+
+    issues_by_journal = defaultdict(list)
+    for issue_pk, journal_pk in issues.order_by().distinct().values_list(
+            'pk', 'journal'):
+        issues_by_journal[journal_pk].append(issue_pk)
+
+    export.total_issues = sum(len(pks) for pks in issues_by_journal.values())
+    export.processed_issues = 0
+    export.status = MarkupFilesExport.RUNNING
+    export.save()
+
+    job_dir = get_job_dir(export_pk)
+    if not os.path.exists(job_dir):
+        os.makedirs(job_dir, 0755)
+
+    header = [export_journal_markup_files.si(export_pk, journal_pk, issue_pks)
+              for journal_pk, issue_pks in sorted(issues_by_journal.items())]
+    callback = archive_markup_files.s(export_pk).on_error(
+            mark_export_as_failed.s(export_pk))
+
+    if header:
+        chord(header)(callback)
+    else:
+        callback.delay([])
@@ -0,0 +1,130 @@
+# coding:utf-8
+import os
+import time
+import shutil
+import zipfile
+import tempfile
+
+from django.test import TestCase
+
+from export import bundle, markupfile
+
+
+class BundleDeployTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_zip_is_written_at_target(self):
+        target = os.path.join(self.directory, 'export', 'bundle.zip')
+        bundle.Bundle(('automata.mds', u'foo'), ('issue.mds', u'bar')).deploy(target)
+
+        self.assertEqual(sorted(zipfile.ZipFile(target).namelist()),
+                         ['automata.mds', 'issue.mds'])
+
+    def test_no_temporary_files_are_left_behind(self):
+        target = os.path.join(self.directory, 'bundle.zip')
+        bundle.Bundle(('automata.mds', u'foo')).deploy(target)
+
+        self.assertEqual(os.listdir(self.directory), ['bundle.zip'])
+
+
+class RemoveStaleFilesTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _touch(self, filename, age=0):
+        path = os.path.join(self.directory, filename)
+        open(path, 'w').close()
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+    def test_only_stale_files_with_prefix_are_removed(self):
+        self._touch('markupfiles-old.zip', age=100)
+        self._touch('markupfiles-new.zip')
+        self._touch('other-old.zip', age=100)
+
+        removed = bundle.remove_stale_files(self.directory, 'markupfiles-', 50)
+
+        self.assertEqual(removed, 1)
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['markupfiles-new.zip', 'other-old.zip'])
+
+    def test_missing_directory(self):
+        self.assertEqual(bundle.remove_stale_files(
+            os.path.join(self.directory, 'missing'), 'markupfiles-', 50), 0)
+
+
+class DeployCachedTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.media_root = markupfile.MEDIA_ROOT
+        markupfile.MEDIA_ROOT = self.directory + '/'
+        self.builds = 0
+
+    def tearDown(self):
+        markupfile.MEDIA_ROOT = self.media_root
+        shutil.rmtree(self.directory)
+
+    def _build(self):
+        self.builds += 1
+        return bundle.Bundle(('automata.mds', u'foo'))
+
+    def test_bundles_are_built_once_per_key(self):
+        key = markupfile.bundle_key('issue', [1, None], [2, None, [], []])
+
+        first = markupfile.deploy_cached(key, self._build)
+        second = markupfile.deploy_cached(key, self._build)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.builds, 1)
+
+    def test_different_inputs_produce_different_bundles(self):
+        first = markupfile.deploy_cached(
+            markupfile.bundle_key('ahead', [1, None], u'2014'), self._build)
+        second = markupfile.deploy_cached(
+            markupfile.bundle_key('ahead', [1, None], u'2015'), self._build)
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.builds, 2)
+
+    def test_stale_bundles_are_removed(self):
+        stale = os.path.join(self.directory,
+                             markupfile.BUNDLE_PREFIX + 'stale.zip')
+        open(stale, 'w').close()
+        mtime = time.time() - markupfile.BUNDLE_MAX_AGE - 1
+        os.utime(stale, (mtime, mtime))
+
+        markupfile.deploy_cached(markupfile.bundle_key('x'), self._build)
+
+        self.assertFalse(os.path.exists(stale))
+
+    def test_stale_temporary_files_are_removed(self):
+        stale = os.path.join(self.directory, bundle.TEMP_PREFIX + 'stale')
+        open(stale, 'w').close()
+        mtime = time.time() - markupfile.TEMP_MAX_AGE - 1
+        os.utime(stale, (mtime, mtime))
+
+        markupfile.deploy_cached(markupfile.bundle_key('x'), self._build)
+
+        self.assertFalse(os.path.exists(stale))
+
+    def test_stale_legacy_bundles_are_removed(self):
+        # bundles timestamped before bundles were cached
+        legacy = os.path.join(self.directory,
+                              'markupfiles-20150102-10:20:30:123456.zip')
+        open(legacy, 'w').close()
+        mtime = time.time() - markupfile.BUNDLE_MAX_AGE - 1
+        os.utime(legacy, (mtime, mtime))
+
+        markupfile.deploy_cached(markupfile.bundle_key('x'), self._build)
+
+        self.assertFalse(os.path.exists(legacy))
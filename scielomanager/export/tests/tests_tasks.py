@@ -0,0 +1,152 @@
+# coding:utf-8
+import os
+import shutil
+import zipfile
+import tempfile
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from django_factory_boy import auth
+
+from journalmanager.tests import modelfactories
+from export import tasks, markupfile
+from export.models import MarkupFilesExport
+
+
+class PreloadSectionsTests(TestCase):
+
+    def test_matches_the_sections_of_the_issue(self):
+        issue = modelfactories.IssueFactory.create()
+        section = issue.section.all()[0]
+        modelfactories.SectionTitleFactory.create(section=section,
+                                                  title=u'Artigos')
+
+        preloaded = tasks.preload_sections([issue.pk])[issue.pk]
+
+        self.assertEqual([unicode(s) for s in preloaded],
+                         [unicode(section)])
+        self.assertEqual([s.actual_code for s in preloaded],
+                         [section.actual_code])
+
+    def test_trashed_sections_are_ignored(self):
+        issue = modelfactories.IssueFactory.create()
+        issue.section.update(is_trashed=True)
+
+        self.assertEqual(tasks.preload_sections([issue.pk])[issue.pk], [])
+
+    def test_is_accepted_by_l10nissue(self):
+        issue = modelfactories.IssueFactory.create()
+        sections = tasks.preload_sections([issue.pk])[issue.pk]
+
+        expected = markupfile.L10nIssue(issue.journal, issue, 'en')
+        preloaded = markupfile.L10nIssue(issue.journal, issue, 'en',
+                                         sections=sections)
+
+        self.assertEqual(preloaded.sections_ids, expected.sections_ids)
+        self.assertEqual(preloaded.sections, expected.sections)
+
+
+class MarkupFilesExportTests(TestCase):
+
+    def _makeOne(self, **kwargs):
+        collection = modelfactories.CollectionFactory.create()
+        return MarkupFilesExport.objects.create(collection=collection,
+                                                **kwargs)
+
+    def test_progress(self):
+        export = self._makeOne(total_issues=8, processed_issues=2)
+        self.assertEqual(export.progress, 25)
+
+    def test_progress_without_issues(self):
+        self.assertEqual(self._makeOne().progress, 0)
+        self.assertEqual(self._makeOne(status=MarkupFilesExport.DONE).progress,
+                         100)
+
+
+class ExportMarkupFilesTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root,
+                CELERY_EAGER_PROPAGATES_EXCEPTIONS=True,
+                CELERY_ALWAYS_EAGER=True, BROKER_BACKEND='memory')
+        self.settings_override.enable()
+
+        user = auth.UserF(is_active=True)
+        self.collection = modelfactories.CollectionFactory.create()
+        self.journal = modelfactories.JournalFactory.create(creator=user)
+        self.journal.join(self.collection, user)
+        self.issues = [modelfactories.IssueFactory.create(journal=self.journal,
+                                                          order=order)
+                       for order in (1, 2)]
+        self.export = MarkupFilesExport.objects.create(
+                collection=self.collection)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_archive_contains_the_markup_files_of_every_issue(self):
+        tasks.export_markup_files(self.export.pk)
+
+        export = MarkupFilesExport.objects.get(pk=self.export.pk)
+        self.assertEqual(export.status, MarkupFilesExport.DONE)
+        self.assertEqual(export.total_issues, 2)
+        self.assertEqual(export.processed_issues, 2)
+
+        archive = zipfile.ZipFile(os.path.join(self.media_root,
+                                               export.archive.name))
+        try:
+            names = archive.namelist()
+        finally:
+            archive.close()
+
+        for issue in self.issues:
+            prefix = u'/'.join([self.journal.acronym.lower(),
+                                tasks.issue_dirname(issue)])
+            self.assertIn(prefix + u'/automata.mds', names)
+            self.assertIn(prefix + u'/journal-standard.txt', names)
+
+        self.assertFalse(os.path.exists(tasks.get_job_dir(self.export.pk)))
+
+    def test_failures_of_journal_tasks_mark_the_export_as_failed(self):
+        def issue_packmeta(*args, **kwargs):
+            raise RuntimeError('unexpected failure')
+
+        original_issue_packmeta = markupfile.issue_packmeta
+        markupfile.issue_packmeta = issue_packmeta
+        try:
+            self.assertRaises(RuntimeError,
+                    lambda: tasks.export_markup_files(self.export.pk))
+        finally:
+            markupfile.issue_packmeta = original_issue_packmeta
+
+        export = MarkupFilesExport.objects.get(pk=self.export.pk)
+        self.assertEqual(export.status, MarkupFilesExport.FAILED)
+        self.assertTrue(export.finished_at)
+
+    def test_journal_tasks_of_failed_exports_produce_nothing(self):
+        tasks.mark_export_as_failed(None, self.export.pk)
+
+        tasks.export_journal_markup_files(self.export.pk, self.journal.pk,
+                [issue.pk for issue in self.issues])
+
+        self.assertFalse(os.path.exists(tasks.get_job_dir(self.export.pk)))
+
+    def test_exports_failed_while_journal_tasks_run_leave_nothing_behind(self):
+        original_issue_packmeta = markupfile.issue_packmeta
+
+        def issue_packmeta(*args, **kwargs):
+            # a tarefa de outro periódico falha concorrentemente
+            tasks.mark_export_as_failed(None, self.export.pk)
+            return original_issue_packmeta(*args, **kwargs)
+
+        markupfile.issue_packmeta = issue_packmeta
+        try:
+            tasks.export_journal_markup_files(self.export.pk, self.journal.pk,
+                    [issue.pk for issue in self.issues])
+        finally:
+            markupfile.issue_packmeta = original_issue_packmeta
+
+        self.assertFalse(os.path.exists(tasks.get_job_dir(self.export.pk)))
+        self.assertFalse(os.path.exists(tasks.get_job_dir(self.export.pk)))
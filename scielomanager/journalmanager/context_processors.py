@@ -1,7 +1,8 @@
 # coding: utf-8
 from django.conf import settings
 from journalmanager import models
-from maintenancewindow import models as maintenance_models
+from scielomanager.utils import usercontext
+from maintenancewindow import state as maintenance_state
 
 
 def dynamic_template_inheritance(request):
@@ -23,7 +24,7 @@ def show_system_notes(request):
     Add system notes as maintenance events, notes, etc to the context
     """
     def wrap():
-        return maintenance_models.Event.objects.scheduled_events()
+        return maintenance_state.get_state().scheduled_events
 
     return {'system_notes': wrap}
 
@@ -34,7 +35,7 @@ def show_system_notes_blocking_users(request):
     as maintenance events, notes, etc to the context
     """
     def wrap():
-        return maintenance_models.Event.objects.blocking_users_scheduled_event()
+        return maintenance_state.get_state().blocking_event
 
     return {'blocking_users_system_note': wrap}
 
@@ -45,7 +46,7 @@ def on_maintenance(request):
     maintenance events.
     """
     def wrap():
-        return maintenance_models.Event.on_maintenance()
+        return maintenance_state.get_state().on_maintenance
 
     return {'on_maintenance': wrap}
 
@@ -76,7 +77,8 @@ def add_default_collection(request):
         else:
 
             def wrap_is_managed_by_user():
-                return collection.is_managed_by_user(request.user)
+                finder = usercontext.get_finder()
+                return collection.pk in finder.get_current_user_managed_collections()
 
             return {
                 'default_collection': collection,
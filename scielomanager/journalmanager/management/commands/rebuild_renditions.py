@@ -0,0 +1,93 @@
+# coding: utf-8
+"""Produz novamente os documentos HTML dos artigos.
+"""
+import multiprocessing
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_connection
+
+from journalmanager import models, tasks
+
+
+_HELP = u"""\
+Produz novamente os documentos HTML de todos os artigos, utilizando um pool
+de processos. Os documentos produzidos a partir do mesmo XML e com a mesma
+versão do packtools são mantidos, exceto quando --force é informado. Útil
+após a atualização do packtools.
+"""
+
+# quantidade de artigos enviados por vez para cada processo
+CHUNK_SIZE = 20
+# intervalo, em quantidade de artigos, entre as mensagens de progresso
+PROGRESS_INTERVAL = 500
+
+
+def _to_bytestring(text):
+    return text.encode('utf-8')
+
+
+def _init_worker():
+    # a conexão herdada do processo pai não pode ser compartilhada
+    close_connection()
+
+
+def _rebuild(args):
+    article_pk, force = args
+    try:
+        tasks.create_article_html_renditions(article_pk, force=force)
+    except Exception as exc:
+        return article_pk, unicode(exc)
+    finally:
+        close_connection()
+
+    return article_pk, None
+
+
+class Command(BaseCommand):
+    help = _HELP
+    option_list = BaseCommand.option_list + (
+        make_option('--processes', action='store', type=int,
+            dest='processes', default=multiprocessing.cpu_count()),
+        make_option('--force', action='store_true', dest='force',
+            default=False),
+    )
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        if processes < 1:
+            raise CommandError(
+                    _to_bytestring(u'--processes deve ser positivo'))
+
+        article_pks = list(models.Article.objects.order_by('pk').values_list(
+                'pk', flat=True))
+        close_connection()
+
+        pool = multiprocessing.Pool(processes, initializer=_init_worker)
+        failures = 0
+        try:
+            results = pool.imap_unordered(_rebuild,
+                    ((pk, options['force']) for pk in article_pks),
+                    CHUNK_SIZE)
+
+            for count, (article_pk, error) in enumerate(results, 1):
+                if error is not None:
+                    failures += 1
+                    self.stderr.write(_to_bytestring(
+                        u'Artigo %s: %s\n' % (article_pk, error)))
+
+                if count % PROGRESS_INTERVAL == 0:
+                    self.stdout.write(_to_bytestring(
+                        u'%s de %s artigos processados\n' % (
+                            count, len(article_pks))))
+
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+        self.stdout.write(_to_bytestring(
+            u'%s artigos processados, %s falhas\n' % (
+                len(article_pks), failures)))
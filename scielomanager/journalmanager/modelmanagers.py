@@ -29,12 +29,81 @@ Custom instance of ``models.query.QuerySet``
 * ``unavailable`` returns all objects marked as trash.
 
 """
+import re
+
+from django.db import connections
+from django.db.models import Q
+
 import models
 from scielomanager.utils import usercontext
 from scielomanager.utils.modelmanagers import UserObjectQuerySet, UserObjectManager
 
 user_request_context = usercontext.get_finder()
 
+# PostgreSQL text search configuration used by the ``search_vector``
+# columns. Titles are written in several languages, so no stemming
+# is performed.
+SEARCH_CONFIG = 'simple'
+
+
+def prefix_tsquery(term):
+    """
+    Converts ``term`` into a tsquery where every word is matched as
+    a prefix, e.g. ``u'arq bras'`` -> ``u'arq:* & bras:*'``.
+    """
+    words = re.findall(r'\w+', term, re.UNICODE)
+    return u' & '.join(word + u':*' for word in words)
+
+
+def is_search_enabled(queryset):
+    """
+    The ``search_vector`` columns and the trigram indexes are
+    only available on PostgreSQL.
+    """
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def ranked_search(queryset, table, term, fields):
+    """
+    Performs a full-text search of ``term`` on the ``search_vector``
+    column of ``table``, kept up to date by database triggers, which
+    is combined with substring matching on ``fields``. The first field
+    is also matched by trigram similarity, which tolerates typos.
+    Results are ordered by relevance.
+
+    ``fields`` must be stored in ``table``. On databases other than
+    PostgreSQL, only the substring matching is performed.
+    """
+    term = unicode(term)
+    tsquery = prefix_tsquery(term)
+
+    if not is_search_enabled(queryset) or not tsquery:
+        criteria = Q()
+        for field in fields:
+            criteria |= Q(**{'%s__icontains' % field: term})
+        return queryset.filter(criteria)
+
+    connection = connections[queryset.db]
+    qn = connection.ops.quote_name
+    vector = '%s.search_vector' % qn(table)
+    columns = ['UPPER(%s.%s::text)' % (qn(table), qn(field)) for field in fields]
+    like = u'%%%s%%' % connection.ops.prep_for_like_query(term)
+
+    tsquery_sql = "to_tsquery('%s', %%s)" % SEARCH_CONFIG
+    where = ['%s @@ %s' % (vector, tsquery_sql),
+             '%s %%%% UPPER(%%s)' % columns[0]]
+    where.extend('%s LIKE UPPER(%%s)' % column for column in columns)
+
+    rank = 'ts_rank(%s, %s) + similarity(%s, UPPER(%%s))' % (
+        vector, tsquery_sql, columns[0])
+
+    return queryset.extra(
+        select={'search_rank': rank},
+        select_params=[tsquery, term],
+        where=['(%s)' % ' OR '.join(where)],
+        params=[tsquery, term] + [like] * len(columns),
+    ).order_by('-search_rank', fields[0])
+
 
 class CollectionQuerySet(UserObjectQuerySet):
     def all(self, get_all_collections=user_request_context.get_current_user_collections):
@@ -115,7 +184,8 @@ class JournalQuerySet(UserObjectQuerySet):
         return self.filter(title__istartswith=unicode(char))
 
     def simple_search(self, term):
-        return self.filter(title__icontains=unicode(term))
+        return ranked_search(self, 'journalmanager_journal', term,
+                             ['title', 'short_title', 'acronym'])
 
     def available(self):
         return self.filter(is_trashed=False)
@@ -150,6 +220,27 @@ class SectionQuerySet(UserObjectQuerySet):
         return self.filter(
             journal__collections=get_active_collection())
 
+    def startswith(self, char):
+        return self.filter(
+            titles__title__istartswith=unicode(char)).distinct()
+
+    def simple_search(self, term):
+        titles = ranked_search(models.SectionTitle.objects.all(),
+            'journalmanager_sectiontitle', term, ['title'])
+        sections = self.filter(pk__in=titles.order_by().values('section'))
+
+        tsquery = prefix_tsquery(unicode(term))
+        if not is_search_enabled(self) or not tsquery:
+            return sections
+
+        # a section is as relevant as its most relevant title
+        rank = """(SELECT max(ts_rank(st.search_vector, to_tsquery('%s', %%s)))
+                   FROM journalmanager_sectiontitle st
+                   WHERE st.section_id = journalmanager_section.id)""" % SEARCH_CONFIG
+
+        return sections.extra(select={'search_rank': rank},
+            select_params=[tsquery]).order_by('-search_rank', 'pk')
+
     def available(self):
         return self.filter(is_trashed=False)
 
@@ -224,7 +315,7 @@ class SponsorQuerySet(UserObjectQuerySet):
         return self.filter(name__istartswith=unicode(char))
 
     def simple_search(self, term):
-        return self.filter(name__icontains=unicode(term))
+        return ranked_search(self, 'journalmanager_institution', term, ['name'])
 
     def available(self):
         return self.filter(is_trashed=False)
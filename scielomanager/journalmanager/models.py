@@ -6,7 +6,9 @@ import choices
 from pytz import all_timezones
 from scielomanager import tools
 import datetime
+import threading
 from uuid import uuid4
+from contextlib import contextmanager
 try:
     from collections import OrderedDict
 except ImportError:
@@ -17,23 +19,27 @@ from django.db import (
     IntegrityError,
     DatabaseError,
     )
-from django.db.models import Q
+from django.db.models import Q, Max, Count
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist, ImproperlyConfigured
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes import generic
 from django.contrib.auth.models import User
 from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import ugettext as __
+from django.utils.datastructures import SortedDict
 from django.conf import settings
-from django.db.models.signals import post_save, pre_save
-from django.dispatch import receiver
+from django.db.models.signals import post_save, pre_save, post_delete
+from django.dispatch import receiver, Signal
 from django.template.defaultfilters import slugify
 from scielo_extensions import modelfields
 from tastypie.models import create_api_key
 import celery
 from PIL import Image
+from lxml import etree
 
 from scielomanager.utils import base28
+from scielomanager.utils import usercontext
 from scielomanager.custom_fields import (
         ContentTypeRestrictedFileField,
         XMLSPSField,
@@ -48,6 +54,14 @@ EVENT_TYPES = [(ev_type, ev_type) for ev_type in ['added', 'deleted', 'updated']
 ISSUE_DEFAULT_LICENSE_HELP_TEXT = _(u"If not defined, will be applied the related journal's use license. \
 The SciELO default use license is BY-NC. Please visit: http://ref.scielo.org/jf5ndd (5.2.11. Política de direitos autorais) for more details.")
 
+# chave, por periódico e disponibilidade, do grid de fascículos em cache
+ISSUES_GRID_CACHE_KEY = 'journalmanager:issues_grid:%s:%s'
+ISSUES_GRID_CACHE_TIMEOUT = settings.ISSUES_GRID_CACHE_TIMEOUT
+
+# chave, por usuário e idioma, do menu de coleções em cache
+USER_COLLECTIONS_DASHBOARD_CACHE_KEY = 'journalmanager:user_collections_dashboard:%s:%s'
+USER_COLLECTIONS_DASHBOARD_CACHE_TIMEOUT = getattr(settings, 'USER_COLLECTIONS_DASHBOARD_CACHE_TIMEOUT', 60 * 60 * 24)
+
 
 def get_user_collections(user_id):
     """
@@ -60,6 +74,17 @@ def get_user_collections(user_id):
     return user_collections
 
 
+def get_user_memberships(user_id):
+    """
+    Returns a mapping of the collections of a given user to the corresponding
+    ``UserCollections``, ordered by the collection name, in a single query.
+    """
+    memberships = UserCollections.objects.filter(user=user_id).select_related(
+        'collection').order_by('collection__name')
+
+    return SortedDict((uc.collection, uc) for uc in memberships)
+
+
 def get_journals_default_use_license():
     """
     Returns the default use license for all new Journals.
@@ -74,6 +99,73 @@ def get_journals_default_use_license():
         raise ImproperlyConfigured("There is no UseLicense set as default")
 
 
+# instâncias de etree.XPath são compiladas uma única vez por thread.
+_compiled_xpaths = threading.local()
+
+
+def get_compiled_xpath(expression):
+    """
+    Returns the `etree.XPath` instance for `expression`, compiling it only
+    on the first request made by the current thread.
+    """
+    try:
+        registry = _compiled_xpaths.registry
+    except AttributeError:
+        registry = _compiled_xpaths.registry = {}
+
+    try:
+        return registry[expression]
+    except KeyError:
+        compiled = registry[expression] = etree.XPath(expression)
+        return compiled
+
+
+def as_availability(value):
+    """
+    Normaliza o valor de disponibilidade, que pode ser obtido de parâmetros
+    da querystring (e.g. ``'0'`` ou ``'1'``), para ``bool``.
+    """
+    if isinstance(value, bool):
+        return value
+
+    try:
+        return int(value) != 0
+    except (ValueError, TypeError):
+        return True
+
+
+class DirtyFieldsMixin(object):
+    """
+    Mantém os valores dos campos ``TRACKED_FIELDS`` conforme carregados do
+    banco de dados, de maneira que alterações possam ser detectadas sem que
+    seja necessário consultá-lo novamente (ver ``scielomanager.tools.has_changed``).
+    """
+    TRACKED_FIELDS = ()
+
+    def __init__(self, *args, **kwargs):
+        super(DirtyFieldsMixin, self).__init__(*args, **kwargs)
+        self._reset_tracked_fields()
+
+    def _reset_tracked_fields(self):
+        # campos adiados (``defer`` e ``only``) não estão em ``__dict__``
+        self._original_values = dict((field, self.__dict__[field])
+            for field in self.TRACKED_FIELDS if field in self.__dict__)
+
+    def has_field_changed(self, field):
+        """
+        Retorna ``True`` caso o valor de ``field`` tenha sido alterado desde
+        que a instância foi carregada ou salva.
+        """
+        if field not in self._original_values:
+            return tools.has_changed(self, field)
+
+        return getattr(self, field) != self._original_values[field]
+
+    def save(self, *args, **kwargs):
+        super(DirtyFieldsMixin, self).save(*args, **kwargs)
+        self._reset_tracked_fields()
+
+
 class AppCustomManager(models.Manager):
     """
     Domain specific model managers.
@@ -84,15 +176,7 @@ class AppCustomManager(models.Manager):
         Filter the queryset based on its availability.
         """
         data_queryset = self.get_query_set()
-
-        if not isinstance(is_available, bool):
-            try:
-                if int(is_available) == 0:
-                    is_available = False
-                else:
-                    is_available = True
-            except (ValueError, TypeError):
-                is_available = True
+        is_available = as_availability(is_available)
 
         data_queryset = data_queryset.filter(is_trashed=not is_available)
 
@@ -555,7 +639,7 @@ class Journal(models.Model):
     short_title = models.CharField(_('Short Title'), max_length=256,
             db_index=True, default='')
     created = models.DateTimeField(auto_now_add=True)
-    updated = models.DateTimeField(auto_now=True)
+    updated = models.DateTimeField(auto_now=True, db_index=True)
     acronym = models.CharField(_('Acronym'), max_length=16, blank=False)
     scielo_issn = models.CharField(_('The ISSN used to build the Journal PID.'),
             max_length=16, choices=sorted(
@@ -660,8 +744,30 @@ class Journal(models.Model):
             return None
 
     def issues_as_grid(self, is_available=True):
-        objects_all = self.issue_set.available(is_available).order_by(
-            '-publication_year', '-volume')
+        """
+        Retorna os fascículos do periódico agrupados por ano de publicação e
+        volume, e ordenados pelo atributo ``order`` em cada volume.
+
+        O grid é armazenado em cache por periódico e disponibilidade, e é
+        invalidado sempre que algum fascículo ou artigo do periódico é salvo
+        ou removido. Alterações que não disparam signals, como
+        ``QuerySet.update``, devem ser seguidas por ``invalidate_issues_grid``.
+        Cada fascículo possui o atributo ``articles_count``.
+        """
+        is_available = as_availability(is_available)
+        key = ISSUES_GRID_CACHE_KEY % (self.pk, int(is_available))
+
+        grid = cache.get(key)
+        if grid is None:
+            grid = self._build_issues_grid(is_available)
+            cache.set(key, grid, ISSUES_GRID_CACHE_TIMEOUT)
+
+        return grid
+
+    def _build_issues_grid(self, is_available):
+        objects_all = self.issue_set.available(is_available).annotate(
+            articles_count=Count('articles')).order_by(
+            '-publication_year', '-volume', 'order')
 
         grid = OrderedDict()
 
@@ -670,10 +776,6 @@ class Journal(models.Model):
             volume_node = year_node.setdefault(issue.volume, [])
             volume_node.append(issue)
 
-        for year, volume in grid.items():
-            for vol, issues in volume.items():
-                issues.sort(key=lambda x: x.order)
-
         return grid
 
     @property
@@ -939,7 +1041,9 @@ class Section(models.Model):
             self._create_code(*args, **kwargs)
 
 
-class Issue(models.Model):
+class Issue(DirtyFieldsMixin, models.Model):
+
+    TRACKED_FIELDS = ('publication_year', )
 
     # Custom manager
     objects = IssueCustomManager()
@@ -950,7 +1054,7 @@ class Issue(models.Model):
     volume = models.CharField(_('Volume'), blank=True, max_length=16)
     number = models.CharField(_('Number'), blank=True, max_length=16)
     created = models.DateTimeField(auto_now_add=True)
-    updated = models.DateTimeField(auto_now=True)
+    updated = models.DateTimeField(auto_now=True, db_index=True)
     publication_start_month = models.IntegerField(_('Start Month'), blank=True, null=True, choices=choices.MONTHS)
     publication_end_month = models.IntegerField(_('End Month'), blank=True, null=True, choices=choices.MONTHS)
     publication_year = models.IntegerField(_('Year'))
@@ -1076,18 +1180,25 @@ class Issue(models.Model):
         if self.order and force is False:
             return self.order
 
-        filters = {
-            'publication_year': self.publication_year,
-            'journal': self.journal,
-        }
+        last_order = Issue.objects.filter(
+            publication_year=self.publication_year,
+            journal=self.journal_id).aggregate(last=Max('order'))['last']
 
-        try:
-            last = Issue.objects.filter(**filters).order_by('order').reverse()[0]
-            next_order = last.order + 1
-        except IndexError:
-            next_order = 1
+        return (last_order or 0) + 1
+
+    def _allocate_order(self):
+        """
+        Reserva o próximo ``order`` do ano de publicação do fascículo.
 
-        return next_order
+        A linha do periódico é bloqueada (``SELECT ... FOR UPDATE``) até o
+        término da transação corrente, o que serializa a alocação entre
+        transações concorrentes. O bloqueio é liberado com o ``commit``
+        realizado ao final de ``save``, ou pelo ``TransactionMiddleware``.
+        """
+        list(Journal.objects.select_for_update().filter(
+            pk=self.journal_id).values_list('pk', flat=True))
+
+        return self._suggest_order(force=True)
 
     def _get_default_use_license(self):
         return self.journal.use_license
@@ -1101,12 +1212,13 @@ class Issue(models.Model):
         # auto_order=False é passado na importação de dados para evitar o order automático
         if kwargs.pop('auto_order', True):
             if not self.pk:
-                self.order = self._suggest_order()
+                if not self.order:
+                    self.order = self._allocate_order()
             else:
                 # the ordering control is based on publication year attr.
                 # if an issue is moved between pub years, the order must be reset.
-                if tools.has_changed(self, 'publication_year'):
-                    self.order = self._suggest_order(force=True)
+                if self.has_field_changed('publication_year'):
+                    self.order = self._allocate_order()
 
         super(Issue, self).save(*args, **kwargs)
 
@@ -1262,6 +1374,23 @@ class ArticlesLinkage(models.Model):
                 self.link_type)
 
 
+class PendingArticlesLinkage(models.Model):
+    """ Relação entre entidades do tipo `Article` ainda não estabelecida.
+
+    Funciona como índice de resolução de DOIs: cada registro indica que
+    `referrer` aguarda a chegada do artigo identificado por `doi`. Assim que
+    esse artigo é criado, apenas os seus referentes precisam ser associados.
+    """
+    referrer = models.ForeignKey('Article', related_name='pending_links')
+    doi = models.CharField(max_length=2048, db_index=True)
+    link_type = models.CharField(max_length=32)
+
+    def __repr__(self):
+        return u'<%s referrer="%s" doi="%s" link_type="%s">' % (
+                self.__class__.__name__, repr(self.referrer), self.doi,
+                self.link_type)
+
+
 class ArticleControlAttributes(models.Model):
     """ Atributos de controle de instância tipo `Article`.
     """
@@ -1358,21 +1487,27 @@ class Article(models.Model):
 
         super(Article, self).save(*args, **kwargs)
 
+    @property
+    def xml_checksum(self):
+        """ Retorna o hash SHA-1 da serialização de `self.xml`.
+        """
+        return hashlib.sha1(str(self.xml)).hexdigest()
+
     @classmethod
     def parse(cls, content_as_bytes):
         newarticle = cls(xml=content_as_bytes)
 
         xpaths = cls.XPaths
-        get_value = newarticle.get_value
+        values = newarticle.get_identification_values()
 
-        newarticle.is_aop = newarticle._get_is_aop()
-        newarticle.domain_key = newarticle._get_domain_key()
-        newarticle.journal_title = get_value(xpaths.JOURNAL_TITLE)
-        newarticle.issn_ppub = get_value(xpaths.ISSN_PPUB) or ''
-        newarticle.issn_epub = get_value(xpaths.ISSN_EPUB) or ''
-        newarticle.xml_version = get_value(xpaths.SPS_VERSION) or 'pre-sps'
-        newarticle.article_type = get_value(xpaths.ARTICLE_TYPE)
-        newarticle.doi = get_value(xpaths.DOI) or ''
+        newarticle.is_aop = newarticle._get_is_aop(values)
+        newarticle.domain_key = newarticle._get_domain_key(values)
+        newarticle.journal_title = values[xpaths.JOURNAL_TITLE]
+        newarticle.issn_ppub = values[xpaths.ISSN_PPUB] or ''
+        newarticle.issn_epub = values[xpaths.ISSN_EPUB] or ''
+        newarticle.xml_version = values[xpaths.SPS_VERSION] or 'pre-sps'
+        newarticle.article_type = values[xpaths.ARTICLE_TYPE]
+        newarticle.doi = values[xpaths.DOI] or ''
 
         if not any([newarticle.issn_ppub, newarticle.issn_epub]):
             raise ValueError('Either issn_ppub or issn_epub must be set')
@@ -1391,25 +1526,94 @@ class Article(models.Model):
         Espaços em branco no início ou fim são removidos. Retorna `None` caso
         `expression` não encontre elementos, ou o elemento esteja vazio.
 
+        A expressão é compilada apenas uma vez, por meio de
+        `get_compiled_xpath`.
+
         :param expression: expressão xpath para elemento ou atributo.
         """
         try:
-            first_occ = self.xml.xpath(expression)[0]
+            first_occ = get_compiled_xpath(expression)(self.xml.root_etree)[0]
         except IndexError:
             return None
 
-        try:
-            value = first_occ.text
-        except AttributeError:
-            # valor de atributo
-            value = first_occ
-
-        try:
-            return value.strip()
-        except AttributeError:
-            return value
-
-    def _get_is_aop(self):
+        return _strip_xml_value(first_occ)
+
+    def get_identification_values(self):
+        """ Extrai, em uma única travessia de `front`, os valores dos
+        elementos de identificação do artigo.
+
+        Retorna um dicionário cujas chaves são as expressões de
+        `Article.XPaths` referentes a esses elementos, e os valores são
+        equivalentes aos obtidos por meio de `get_value`.
+        """
+        xpaths = self.XPaths
+        values = dict.fromkeys(IDENTIFICATION_XPATHS)
+
+        root = self.xml.getroot()
+        if root.tag != 'article':
+            return values
+
+        found = set()
+
+        def _set_first(expression, node):
+            # assim como em `get_value`, apenas a primeira ocorrência conta.
+            if expression not in found:
+                found.add(expression)
+                values[expression] = _strip_xml_value(node)
+
+        for attr, expression in [('specific-use', xpaths.SPS_VERSION),
+                                 ('article-type', xpaths.ARTICLE_TYPE)]:
+            if attr in root.attrib:
+                _set_first(expression, root.attrib[attr])
+
+        issn_types = {'ppub': xpaths.ISSN_PPUB, 'epub': xpaths.ISSN_EPUB}
+        article_id_types = {'doi': xpaths.DOI, 'publisher-id': xpaths.PID,
+                            'other': xpaths.AOP_ID}
+        article_meta_tags = {'volume': xpaths.VOLUME, 'issue': xpaths.ISSUE,
+                             'lpage': xpaths.LPAGE,
+                             'elocation-id': xpaths.ELOCATION_ID}
+
+        for front in root.iterchildren('front'):
+            for journal_meta in front.iterchildren('journal-meta'):
+                for child in journal_meta.iterchildren('journal-title-group', 'issn'):
+                    if child.tag == 'issn':
+                        expression = issn_types.get(child.get('pub-type'))
+                        if expression:
+                            _set_first(expression, child)
+                        continue
+
+                    for title in child.iterchildren('journal-title',
+                            'abbrev-journal-title'):
+                        if title.tag == 'journal-title':
+                            _set_first(xpaths.JOURNAL_TITLE, title)
+                        elif title.get('abbrev-type') == 'publisher':
+                            _set_first(xpaths.ABBREV_JOURNAL_TITLE, title)
+
+            for article_meta in front.iterchildren('article-meta'):
+                for child in article_meta.iterchildren():
+                    tag = child.tag
+                    if tag in article_meta_tags:
+                        _set_first(article_meta_tags[tag], child)
+                    elif tag == 'fpage':
+                        _set_first(xpaths.FPAGE, child)
+                        if 'seq' in child.attrib:
+                            _set_first(xpaths.FPAGE_SEQ, child.attrib['seq'])
+                    elif tag == 'article-id':
+                        expression = article_id_types.get(child.get('pub-id-type'))
+                        if expression:
+                            _set_first(expression, child)
+                    elif tag == 'pub-date':
+                        for year in child.iterchildren('year'):
+                            _set_first(xpaths.YEAR, year)
+                    elif tag == 'article-categories':
+                        for subj_group in child.iterchildren('subj-group'):
+                            if subj_group.get('subj-group-type') == 'heading':
+                                for subject in subj_group.iterchildren('subject'):
+                                    _set_first(xpaths.HEAD_SUBJECT, subject)
+
+        return values
+
+    def _get_is_aop(self, values=None):
         """ Infere se trata-se de um artigo AOP.
 
         Diferentemente das regras publicadas no SciELO PS, o SciELO Manager
@@ -1419,11 +1623,17 @@ class Article(models.Model):
         adota uma abordagem não-opinionada acerca da estrutura de publicação
         do periódico, portanto não utiliza metadados do número na lógica de
         inferência.
+
+        :param values: (opcional) valores obtidos por meio de
+                       `get_identification_values`.
         """
-        aop_id = self.get_value(self.XPaths.AOP_ID)
+        if values is None:
+            values = self.get_identification_values()
+
+        aop_id = values[self.XPaths.AOP_ID]
         return bool(aop_id)
 
-    def _get_domain_key(self):
+    def _get_domain_key(self, values=None):
         """ Produz uma chave de domínio (Domain key ou Natural key)
 
         A chave é utilizada na detecção de duplicidades. Os metadados
@@ -1448,7 +1658,13 @@ class Article(models.Model):
         Formato:
 
           <journal-title>_<volume>_<issue>_<year>_<fpage>_<seq>_<lpage>_<elocation-id>_<article-id>
+
+        :param values: (opcional) valores obtidos por meio de
+                       `get_identification_values`.
         """
+        if values is None:
+            values = self.get_identification_values()
+
         id_fields = [
                 self.XPaths.JOURNAL_TITLE,
                 self.XPaths.VOLUME,
@@ -1461,8 +1677,7 @@ class Article(models.Model):
                 self.XPaths.AOP_ID,
         ]
 
-        values = (self.get_value(path) for path in id_fields)
-        text_values = (value if value else 'none' for value in values)
+        text_values = (values[path] or 'none' for path in id_fields)
         joined_values = '_'.join(text_values)
         return slugify(joined_values)
 
@@ -1477,6 +1692,45 @@ class Article(models.Model):
                 self.aid, domain_key)
 
 
+def _strip_xml_value(node):
+    """ Retorna o texto do elemento, ou o valor do atributo, `node` sem
+    espaços em branco no início ou fim.
+    """
+    try:
+        value = node.text
+    except AttributeError:
+        # valor de atributo
+        value = node
+
+    try:
+        return value.strip()
+    except AttributeError:
+        return value
+
+
+# expressões de `Article.XPaths` extraídas por
+# `Article.get_identification_values`.
+IDENTIFICATION_XPATHS = [
+        Article.XPaths.SPS_VERSION,
+        Article.XPaths.ARTICLE_TYPE,
+        Article.XPaths.ABBREV_JOURNAL_TITLE,
+        Article.XPaths.JOURNAL_TITLE,
+        Article.XPaths.ISSN_PPUB,
+        Article.XPaths.ISSN_EPUB,
+        Article.XPaths.YEAR,
+        Article.XPaths.VOLUME,
+        Article.XPaths.ISSUE,
+        Article.XPaths.FPAGE,
+        Article.XPaths.FPAGE_SEQ,
+        Article.XPaths.LPAGE,
+        Article.XPaths.ELOCATION_ID,
+        Article.XPaths.HEAD_SUBJECT,
+        Article.XPaths.DOI,
+        Article.XPaths.PID,
+        Article.XPaths.AOP_ID,
+]
+
+
 def make_article_directory_path(content_type):
     """ Produz funções que definem o diretório de armazenamento dos arquivos
     relacionados a um artigo.
@@ -1534,10 +1788,39 @@ class ArticleAsset(models.Model):
             return self.file
 
 
+class ArticleAssetDerivative(models.Model):
+    """Versão reduzida, em JPEG, de uma imagem de ArticleAsset.
+
+    As versões e as suas dimensões máximas são definidas em
+    `settings.ARTICLE_ASSET_DERIVATIVES`.
+    """
+    asset = models.ForeignKey('ArticleAsset', on_delete=models.CASCADE,
+            related_name='derivatives')
+    name = models.CharField(max_length=32)
+    file = models.FileField(
+            upload_to=make_article_directory_path('derivatives'),
+            max_length=1024)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __repr__(self):
+        return u'<%s id="%s" name="%s" url="%s">' % (self.__class__.__name__,
+                self.pk, self.name, self.file.url)
+
+    @property
+    def article(self):
+        return self.asset.article
+
+    class Meta:
+        unique_together = (('asset', 'name'),)
+
+
 class ArticleHTMLRendition(models.Model):
     """Documento HTML de uma tradução de uma instância de Article.
 
-    Armazena apenas o *build* mais recente para cada idioma.
+    Armazena apenas o *build* mais recente para cada idioma, identificado
+    pelo par (`source_hash`, `build_version`).
     """
     article = models.ForeignKey('Article', on_delete=models.CASCADE,
             related_name='htmls')
@@ -1545,6 +1828,8 @@ class ArticleHTMLRendition(models.Model):
             max_length=1024)
     lang = models.CharField(_('ISO 639-1 Language Code'), max_length=2)
     build_version = models.CharField(max_length=8)
+    # `Article.xml_checksum` do XML a partir do qual o documento foi produzido
+    source_hash = models.CharField(max_length=40, default=u'')
     updated_at = models.DateTimeField(auto_now=True)
 
     def __repr__(self):
@@ -1555,6 +1840,45 @@ class ArticleHTMLRendition(models.Model):
         unique_together = (('article', 'lang'),)
 
 
+# tasks disparadas pelos signals enquanto o seu envio está adiado, por thread.
+_deferred_tasks = threading.local()
+
+
+def _send_task(name, args):
+    """ Envia a task `name` para os workers, ou a enfileira caso o envio
+    esteja adiado por `deferred_tasks`.
+    """
+    pending = getattr(_deferred_tasks, 'pending', None)
+    if pending is None:
+        celery.current_app.send_task(name, args=args)
+    else:
+        pending.append((name, args))
+
+
+@contextmanager
+def deferred_tasks():
+    """ Adia o envio das tasks disparadas pelos signals até o final do bloco.
+
+    Deve envolver o bloco de gerenciamento da transação, para que os workers
+    recebam as tasks apenas após o commit, quando os registros já estão
+    visíveis. As tasks são descartadas caso o bloco levante exceção.
+    """
+    if getattr(_deferred_tasks, 'pending', None) is not None:
+        # o envio já está adiado por um bloco mais externo
+        yield
+        return
+
+    _deferred_tasks.pending = []
+    try:
+        yield
+        pending = _deferred_tasks.pending
+    finally:
+        _deferred_tasks.pending = None
+
+    for name, args in pending:
+        celery.current_app.send_task(name, args=args)
+
+
 # --------------------
 # Callbacks de signals
 # --------------------
@@ -1567,6 +1891,84 @@ def journal_update_date(sender, instance, created, **kwargs):
     instance.journal.save()
 
 
+# Enviado após alterações em lote, realizadas por meio de `QuerySet.update`,
+# que não disparam os signals `post_save`. O argumento `journal_pks` contém os
+# periódicos afetados.
+bulk_updated = Signal(providing_args=['journal_pks'])
+
+
+def invalidate_issues_grid(journal_id):
+    """ Remove do cache os grids de fascículos do periódico `journal_id`.
+    """
+    if journal_id is None:
+        return
+
+    cache.delete_many([ISSUES_GRID_CACHE_KEY % (journal_id, int(available))
+                       for available in (True, False)])
+
+
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+def invalidate_issues_grid_on_issue_change(sender, instance, **kwargs):
+    """ Invalida o grid de fascículos do periódico quando um fascículo é
+    salvo, movido para a lixeira ou removido.
+    """
+    invalidate_issues_grid(instance.journal_id)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_issues_grid_on_article_change(sender, instance, **kwargs):
+    """ Invalida o grid de fascículos do periódico, que contém a quantidade
+    de artigos de cada fascículo.
+    """
+    invalidate_issues_grid(instance.journal_id)
+
+
+@receiver(bulk_updated)
+def invalidate_issues_grid_on_bulk_update(sender, journal_pks, **kwargs):
+    """ Invalida os grids de fascículos dos periódicos alterados em lote.
+    """
+    for journal_pk in journal_pks:
+        invalidate_issues_grid(journal_pk)
+
+
+@receiver(post_save, sender=UserCollections)
+@receiver(post_delete, sender=UserCollections)
+def clear_user_context_on_membership_change(sender, instance, **kwargs):
+    """ Descarta o contexto do usuário memorizado durante a requisição
+    corrente, quando o relacionamento entre usuários e coleções é alterado.
+    """
+    usercontext.clear_user_context()
+
+
+def invalidate_user_collections_dashboard(user_ids):
+    """ Remove do cache os menus de coleções dos usuários `user_ids`, em
+    todos os idiomas.
+    """
+    cache.delete_many([USER_COLLECTIONS_DASHBOARD_CACHE_KEY % (user_id, language)
+                       for user_id in user_ids
+                       for language, _name in settings.LANGUAGES])
+
+
+@receiver(post_save, sender=UserCollections)
+@receiver(post_delete, sender=UserCollections)
+def invalidate_user_collections_dashboard_on_membership_change(sender, instance, **kwargs):
+    """ Invalida o menu de coleções do usuário quando o seu relacionamento
+    com as coleções é alterado.
+    """
+    invalidate_user_collections_dashboard([instance.user_id])
+
+
+@receiver(post_save, sender=Collection)
+def invalidate_user_collections_dashboard_on_collection_change(sender, instance, **kwargs):
+    """ Invalida o menu de coleções dos usuários da coleção, que exibe o
+    seu nome.
+    """
+    invalidate_user_collections_dashboard(UserCollections.objects.filter(
+        collection=instance).values_list('user', flat=True))
+
+
 @receiver(post_save, sender=User)
 def create_profile(sender, instance, created, **kwargs):
     """ Create a matching profile whenever a user object is created.
@@ -1581,8 +1983,7 @@ def submit_to_elasticsearch(sender, instance, **kwargs):
     for igual a `True`.
     """
     if instance.es_is_dirty:
-        celery.current_app.send_task(
-                'journalmanager.tasks.submit_to_elasticsearch',
+        _send_task('journalmanager.tasks.submit_to_elasticsearch',
                 args=[instance.article.pk])
 
 
@@ -1594,8 +1995,7 @@ def link_article_to_journal(sender, instance, created, **kwargs):
     bem-sucedida com o periódico.
     """
     if created:
-        celery.current_app.send_task(
-                'journalmanager.tasks.link_article_to_journal',
+        _send_task('journalmanager.tasks.link_article_to_journal',
                 args=[instance.pk])
 
 
@@ -1612,13 +2012,27 @@ def create_article_control_attributes(sender, instance, created, **kwargs):
         ctrl_attrs.save()
 
 
+@receiver(post_save, sender=Article)
+def link_related_articles(sender, instance, created, **kwargs):
+    """ Tenta associar o artigo recém criado aos artigos que ele referencia e
+    aos que aguardam por ele, identificados por meio do seu DOI.
+    """
+    if created:
+        if instance.article_type in LINKABLE_ARTICLE_TYPES:
+            _send_task('journalmanager.tasks.link_article_with_their_related',
+                    args=[instance.pk])
+
+        if instance.doi:
+            _send_task('journalmanager.tasks.link_pending_referrers',
+                    args=[instance.pk])
+
+
 @receiver(post_save, sender=Article)
 def create_article_html_renditions(sender, instance, created, **kwargs):
     """ Cria os documentos HTML para cada idioma do artigo.
     """
     if created:
-        celery.current_app.send_task(
-                'journalmanager.tasks.create_article_html_renditions',
+        _send_task('journalmanager.tasks.create_article_html_renditions',
                 args=[instance.pk])
 
 
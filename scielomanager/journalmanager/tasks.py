@@ -3,15 +3,21 @@
 """
 import os
 import io
+import time
 import datetime
 import operator
-from copy import deepcopy
+import tempfile
+import threading
+from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 
-from lxml import isoschematron, etree
+from lxml import etree
+from django.conf import settings
 from django.db.models import Q
 from django.db import IntegrityError, transaction, DatabaseError
 from django.core.exceptions import ObjectDoesNotExist
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
+from django.utils.encoding import force_unicode
 from celery.utils.log import get_task_logger
 from django.templatetags.static import static
 import packtools
@@ -19,6 +25,7 @@ from PIL import Image
 
 from scielomanager.celery import app
 from scielomanager import connectors
+from scielomanager.utils.schematron import get_schematron
 from . import models
 
 
@@ -29,11 +36,23 @@ BASIC_ARTICLE_META_PATH = os.path.join(
         os.path.dirname(os.path.abspath(__file__)), 'basic_article_meta.sch')
 
 
-# instâncias de isoschematron.Schematron não são thread-safe
-ARTICLE_META_SCHEMATRON = isoschematron.Schematron(file=BASIC_ARTICLE_META_PATH)
+elasticsearch_client = connectors.ArticleElasticsearch()
 
 
-elasticsearch_client = connectors.ArticleElasticsearch()
+# quantidade de artigos indexados por lote em `process_dirty_articles_in_bulk`
+ES_BULK_CHUNK_SIZE = getattr(settings, 'ES_BULK_CHUNK_SIZE', 500)
+
+# quantidade máxima de idiomas de um artigo produzidos simultaneamente por
+# `create_article_html_renditions`
+HTML_RENDITIONS_THREADS = settings.HTML_RENDITIONS_THREADS
+
+# tempo, em segundos, após o qual os arquivos do diretório de staging dos
+# ativos digitais são removidos por `remove_stale_staged_assets`
+ASSETS_STAGING_MAX_AGE = settings.ASSETS_STAGING_MAX_AGE
+
+# versões reduzidas das imagens dos artigos, na forma
+# {nome: (largura máxima, altura máxima)}
+ARTICLE_ASSET_DERIVATIVES = settings.ARTICLE_ASSET_DERIVATIVES
 
 
 def _gen_es_struct_from_article(article):
@@ -50,7 +69,8 @@ def _gen_es_struct_from_article(article):
         ['article_type', paths.ARTICLE_TYPE],
     ]
 
-    es_struct = {attr: article.get_value(expr)
+    values = article.get_identification_values()
+    es_struct = {attr: values[expr]
                  for attr, expr in values_to_struct_mapping}
 
     article_as_octets = str(article.xml)
@@ -183,9 +203,10 @@ def link_article_to_issue(article_pk):
         logger.info('Cannot link Article to issue without having a journal. '
                     'Article pk "%s". Skipping the linking task.', article_pk)
     else:
-        volume = article.get_value(article.XPaths.VOLUME)
-        issue = article.get_value(article.XPaths.ISSUE)
-        year = article.get_value(article.XPaths.YEAR)
+        values = article.get_identification_values()
+        volume = values[article.XPaths.VOLUME]
+        issue = values[article.XPaths.ISSUE]
+        year = values[article.XPaths.YEAR]
 
         try:
             issue = article.journal.issue_set.get(
@@ -203,17 +224,175 @@ def link_article_to_issue(article_pk):
     return None
 
 
+# quantidade de artigos carregados por consulta em `process_orphan_articles`
+ORPHANS_CHUNK_SIZE = 500
+
+
+def _chunks(items, size):
+    """ Produz fatias de até `size` elementos da sequência `items`.
+    """
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _build_issn_index():
+    """ Produz os mapeamentos ISSN impresso -> pks de periódicos e
+    ISSN eletrônico -> pks de periódicos, com base em todo o catálogo.
+    """
+    print_issns = defaultdict(set)
+    electronic_issns = defaultdict(set)
+
+    for pk, print_issn, eletronic_issn in models.Journal.objects.values_list(
+            'pk', 'print_issn', 'eletronic_issn'):
+        if print_issn:
+            print_issns[print_issn].add(pk)
+
+        if eletronic_issn:
+            electronic_issns[eletronic_issn].add(pk)
+
+    return print_issns, electronic_issns
+
+
+def _resolve_journal(issn_ppub, issn_epub, print_issns, electronic_issns):
+    """ Retorna o pk do periódico identificado pelos ISSNs do artigo, ou
+    `None` caso não exista ou haja mais de um candidato.
+
+    Segue as mesmas regras de `link_article_to_journal`, inclusive a
+    tentativa com os ISSNs invertidos.
+    """
+    for ppub_index, epub_index in [(print_issns, electronic_issns),
+                                   (electronic_issns, print_issns)]:
+        candidates = set()
+        if issn_ppub:
+            candidates |= ppub_index.get(issn_ppub, set())
+
+        if issn_epub:
+            candidates |= epub_index.get(issn_epub, set())
+
+        if len(candidates) == 1:
+            return candidates.pop()
+        elif candidates:
+            return None
+
+    return None
+
+
+def _build_issue_index(journal_pks):
+    """ Produz o mapeamento (journal_pk, volume, number, publication_year)
+    -> pks de fascículos, dos periódicos em `journal_pks`.
+    """
+    index = defaultdict(list)
+    issues = models.Issue.objects.filter(journal__in=journal_pks).values_list(
+            'pk', 'journal', 'volume', 'number', 'publication_year')
+
+    for pk, journal_pk, volume, number, year in issues:
+        index[(journal_pk, volume, number, year)].append(pk)
+
+    return index
+
+
+def _resolve_issues(candidates, issue_index):
+    """ Produz o mapeamento pk de fascículo -> pks de artigos, para os
+    artigos de `candidates` cujo fascículo foi identificado.
+
+    :param candidates: mapeamento pk de artigo -> pk de periódico.
+    """
+    xpaths = models.Article.XPaths
+    articles_by_issue = defaultdict(list)
+
+    for chunk in _chunks(candidates.keys(), ORPHANS_CHUNK_SIZE):
+        for article in models.Article.objects.filter(pk__in=chunk).only('pk', 'xml'):
+            values = article.get_identification_values()
+            try:
+                year = int(values[xpaths.YEAR])
+            except (TypeError, ValueError):
+                continue
+
+            issue_pks = issue_index.get((candidates[article.pk],
+                    values[xpaths.VOLUME], values[xpaths.ISSUE], year), [])
+
+            # assim como em `link_article_to_issue`, casos ambíguos são ignorados.
+            if len(issue_pks) == 1:
+                articles_by_issue[issue_pks[0]].append(article.pk)
+
+    return articles_by_issue
+
+
 @app.task(ignore_result=True)
 def process_orphan_articles():
     """ Tenta associar os artigos órfãos com periódicos e fascículos.
+
+    Diferentemente de `link_article_to_journal` e `link_article_to_issue`,
+    todos os órfãos são resolvidos em uma única passada, com base em índices
+    de ISSNs e de fascículos carregados previamente, e as associações são
+    persistidas por meio de UPDATEs agrupados por periódico e por fascículo.
+
+    Por hora não são suportados artigos de suplementos e fascículos especiais.
+    https://github.com/scieloorg/scielo-manager/issues/1248
+
+    :return: dicionário com os totais de artigos associados e não resolvidos.
     """
-    orphans = models.Article.objects.only('pk', 'journal').filter(issue=None)
+    print_issns, electronic_issns = _build_issn_index()
 
-    for orphan in orphans:
-        if orphan.journal is None:
-            link_article_to_journal.delay(orphan.pk)
-        else:
-            link_article_to_issue.delay(orphan.pk)
+    articles_by_journal = defaultdict(list)
+    issue_candidates = {}
+    without_journal = 0
+
+    orphans = models.Article.objects.filter(issue=None).values_list(
+            'pk', 'journal', 'issn_ppub', 'issn_epub', 'is_aop')
+
+    for pk, journal_pk, issn_ppub, issn_epub, is_aop in orphans.iterator():
+        if journal_pk is None:
+            journal_pk = _resolve_journal(issn_ppub, issn_epub, print_issns,
+                    electronic_issns)
+
+            if journal_pk is None:
+                without_journal += 1
+                continue
+
+            articles_by_journal[journal_pk].append(pk)
+
+        if not is_aop:
+            issue_candidates[pk] = journal_pk
+
+    articles_by_issue = _resolve_issues(issue_candidates,
+            _build_issue_index(set(issue_candidates.values())))
+
+    now = datetime.datetime.now()
+    with transaction.commit_on_success():
+        for journal_pk, article_pks in articles_by_journal.items():
+            for chunk in _chunks(article_pks, ORPHANS_CHUNK_SIZE):
+                models.Article.objects.filter(pk__in=chunk).update(
+                        journal=journal_pk, updated_at=now)
+
+        for issue_pk, article_pks in articles_by_issue.items():
+            for chunk in _chunks(article_pks, ORPHANS_CHUNK_SIZE):
+                models.Article.objects.filter(pk__in=chunk).update(
+                        issue=issue_pk, updated_at=now)
+
+    # os UPDATEs não disparam os signals que invalidam os caches, e o signal
+    # é enviado após o commit para que os caches não sejam repopulados com
+    # os dados anteriores.
+    affected_journals = set(articles_by_journal.keys())
+    affected_journals.update(issue_candidates[pk]
+            for article_pks in articles_by_issue.values()
+            for pk in article_pks)
+    if affected_journals:
+        models.bulk_updated.send(sender=models.Article,
+                journal_pks=affected_journals)
+
+    stats = {
+        'linked_to_journal': sum(len(pks) for pks in articles_by_journal.values()),
+        'linked_to_issue': sum(len(pks) for pks in articles_by_issue.values()),
+        'without_journal': without_journal,
+    }
+    stats['without_issue'] = len(issue_candidates) - stats['linked_to_issue']
+
+    logger.info('Orphan Articles linked to journals: %(linked_to_journal)s; '
+                'linked to issues: %(linked_to_issue)s. Still without journal: '
+                '%(without_journal)s; without issue: %(without_issue)s.', stats)
+
+    return stats
 
 
 @app.task(ignore_result=True)
@@ -227,19 +406,101 @@ def process_dirty_articles():
         submit_to_elasticsearch.delay(dirty.pk)
 
 
-@app.task(throws=(IntegrityError, ValueError))
-def create_article_from_string(xml_string, overwrite_if_exists=False):
-    """ Cria uma instância de `journalmanager.models.Article`.
+def _iter_dirty_articles_chunks(chunk_size):
+    """ Produz listas com até `chunk_size` pares `(ctrl_attrs_pk, article_pk)`
+    de artigos sujos.
 
-    Pode levantar `django.db.IntegrityError` no caso de artigos duplicados,
-    TypeError no caso de argumento com tipo diferente de unicode ou
-    ValueError no caso de artigos cujos elementos identificadores não estão
-    presentes.
+    A paginação é feita pela chave primária de `ArticleControlAttributes`, e
+    não por deslocamento, pois os registros deixam de ser sujos à medida que
+    são indexados.
+    """
+    last_pk = 0
+    while True:
+        chunk = list(models.ArticleControlAttributes.objects.filter(
+                es_is_dirty=True, pk__gt=last_pk).order_by('pk').values_list(
+                'pk', 'article')[:chunk_size])
+
+        if not chunk:
+            break
+
+        last_pk = chunk[-1][0]
+        yield chunk
+
+
+def _submit_chunk_to_elasticsearch(chunk):
+    """ Indexa, em uma única requisição *bulk*, os artigos de `chunk`.
+
+    Apenas os artigos indexados com sucesso deixam de ser sujos, por meio
+    de um único UPDATE. Retorna a quantidade de artigos indexados.
+
+    :param chunk: lista de pares `(ctrl_attrs_pk, article_pk)`.
+    """
+    ctrl_attrs_pks = {article_pk: ctrl_pk for ctrl_pk, article_pk in chunk}
+
+    articles = models.Article.objects.filter(
+            pk__in=ctrl_attrs_pks.keys()).prefetch_related(
+            'links_to__link_to', 'referrers__referrer')
+
+    aid_to_pk = {}
+
+    def _gen_structs():
+        for article in articles:
+            aid_to_pk[article.aid] = article.pk
+            yield article.aid, _gen_es_struct_from_article(article)
+
+    indexed_aids = elasticsearch_client.bulk_add(_gen_structs(),
+            chunk_size=len(chunk))
+
+    indexed_ctrl_pks = [ctrl_attrs_pks[aid_to_pk[aid]] for aid in indexed_aids]
+    if indexed_ctrl_pks:
+        with transaction.commit_on_success():
+            models.ArticleControlAttributes.objects.filter(
+                    pk__in=indexed_ctrl_pks).update(es_is_dirty=False,
+                    es_updated_at=datetime.datetime.now())
+
+    return len(indexed_ctrl_pks)
+
+
+@app.task(ignore_result=True)
+def process_dirty_articles_in_bulk(chunk_size=None):
+    """ Task (periódica) que indexa os artigos sujos por meio de lotes.
+
+    Diferentemente de `process_dirty_articles`, não é disparada uma task por
+    artigo: os artigos são carregados, submetidos ao Elasticsearch e
+    marcados como limpos em lotes de `chunk_size`.
+
+    :param chunk_size: (opcional) quantidade de artigos por lote. O valor
+                       padrão é definido pela diretiva `ES_BULK_CHUNK_SIZE`.
+    :return: total de artigos indexados.
+    """
+    chunk_size = chunk_size or ES_BULK_CHUNK_SIZE
+    total_indexed = 0
+
+    for chunk_number, chunk in enumerate(
+            _iter_dirty_articles_chunks(chunk_size), start=1):
+        started_at = time.time()
+        indexed = _submit_chunk_to_elasticsearch(chunk)
+        elapsed = time.time() - started_at
+
+        total_indexed += indexed
+        logger.info('Chunk %s: %s of %s articles indexed in %.2fs '
+                    '(%.1f articles/s).', chunk_number, indexed, len(chunk),
+                    elapsed, indexed / elapsed if elapsed else 0.0)
+
+    logger.info('%s Articles were indexed in bulk.', total_indexed)
+
+    return total_indexed
+
+
+def _parse_article(xml_string, metadata_sch):
+    """ Valida e produz uma instância não salva de `journalmanager.models.Article`.
+
+    Pode levantar TypeError no caso de argumento com tipo diferente de
+    unicode ou ValueError no caso de artigos cujos elementos identificadores
+    não estão presentes.
 
     :param xml_string: String de texto unicode.
-    :param overwrite_if_exists: (opcional) valor booleano indicando se o artigo
-                                deve ser substituído caso já exista.
-    :return: aid (article-id) formado por uma string de 32 bytes.
+    :param metadata_sch: instância de `isoschematron.Schematron`.
     """
     if not isinstance(xml_string, unicode):
         raise TypeError('Only unicode strings are accepted')
@@ -250,54 +511,153 @@ def create_article_from_string(xml_string, overwrite_if_exists=False):
         parsed_xml = etree.parse(io.BytesIO(xml_bstring))
 
     except etree.XMLSyntaxError as exc:
-        raise ValueError(u"Syntax error: %s.", exc.message)
+        raise ValueError(u"Syntax error: %s." % exc)
 
-    metadata_sch = deepcopy(ARTICLE_META_SCHEMATRON)
     if not metadata_sch.validate(parsed_xml):
         logger.debug('Schematron validation error log: %s.', metadata_sch.error_log)
         raise ValueError('Missing identification elements')
 
-    new_article = models.Article.parse(xml_bstring)
+    return models.Article.parse(xml_bstring)
 
-    with transaction.commit_manually():
-        sid = transaction.savepoint()
-        try:
-            new_article.save()
 
-        except IntegrityError:
-            transaction.savepoint_rollback(sid)
+def _save_article(new_article, overwrite_if_exists):
+    """ Salva `new_article` dentro de um savepoint.
 
-            if overwrite_if_exists:
-                try:
-                    old_article = models.Article.objects.only('pk', 'aid').get(
-                            domain_key=new_article.domain_key)
+    Deve ser executada no contexto de uma transação gerenciada manualmente.
+    Levanta `django.db.IntegrityError` no caso de artigos duplicados, a menos
+    que `overwrite_if_exists` seja verdadeiro.
+    """
+    sid = transaction.savepoint()
+    try:
+        new_article.save()
 
-                    old_article.control_attributes.delete()
-                    old_article.related_articles.clear()
+    except IntegrityError:
+        transaction.savepoint_rollback(sid)
 
-                    new_article.pk = old_article.pk
-                    new_article.aid = old_article.aid
-                    new_article.save()
+        if overwrite_if_exists:
+            try:
+                old_article = models.Article.objects.only('pk', 'aid').get(
+                        domain_key=new_article.domain_key)
 
-                except DatabaseError:
-                    transaction.savepoint_rollback(sid)
+                old_article.control_attributes.delete()
+                old_article.related_articles.clear()
+                old_article.pending_links.all().delete()
 
-                else:
-                    transaction.savepoint_commit(sid)
+                new_article.pk = old_article.pk
+                new_article.aid = old_article.aid
+                new_article.save()
+
+            except DatabaseError:
+                transaction.savepoint_rollback(sid)
 
             else:
-                raise
+                transaction.savepoint_commit(sid)
 
         else:
-            transaction.savepoint_commit(sid)
+            raise
+
+    else:
+        transaction.savepoint_commit(sid)
+
+
+@app.task(throws=(IntegrityError, ValueError))
+def create_article_from_string(xml_string, overwrite_if_exists=False):
+    """ Cria uma instância de `journalmanager.models.Article`.
+
+    Pode levantar `django.db.IntegrityError` no caso de artigos duplicados,
+    TypeError no caso de argumento com tipo diferente de unicode ou
+    ValueError no caso de artigos cujos elementos identificadores não estão
+    presentes.
 
-        transaction.commit()
+    :param xml_string: String de texto unicode.
+    :param overwrite_if_exists: (opcional) valor booleano indicando se o artigo
+                                deve ser substituído caso já exista.
+    :return: aid (article-id) formado por uma string de 32 bytes.
+    """
+    new_article = _parse_article(xml_string,
+            get_schematron(BASIC_ARTICLE_META_PATH))
+
+    with models.deferred_tasks():
+        with transaction.commit_manually():
+            _save_article(new_article, overwrite_if_exists)
+            transaction.commit()
 
     logger.info('New Article added with aid: %s.', new_article.aid)
 
     return new_article.aid
 
 
+# Códigos de resultado de cada item processado por
+# `create_articles_from_strings`. Os códigos de erro são os mesmos
+# utilizados pela interface Thrift (`thrift.server.ERRNO_NS`).
+ARTICLE_RESULT_CODES = {
+        'Success': 0,
+        'IntegrityError': 1,
+        'ValueError': 2,
+        'TypeError': 3,
+}
+
+
+def _article_result_code(exc):
+    """ Código de `ARTICLE_RESULT_CODES` correspondente a `exc`, que pode ser
+    instância de subclasse das exceções previstas, e.g. `UnicodeDecodeError`.
+    """
+    for exc_class in (IntegrityError, ValueError, TypeError):
+        if isinstance(exc, exc_class):
+            return ARTICLE_RESULT_CODES[exc_class.__name__]
+
+    raise TypeError('Unexpected exception: %r' % exc)
+
+
+@app.task
+def create_articles_from_strings(xml_strings, overwrite_if_exists=False):
+    """ Cria, em uma única transação, instâncias de
+    `journalmanager.models.Article` para cada item de `xml_strings`.
+
+    Cada item é salvo em seu próprio savepoint, de maneira que a falha de um
+    não impede a criação dos demais. Retorna uma lista com o resultado de
+    cada item, na mesma ordem de `xml_strings`, no formato `[code, value]`
+    onde `code` é um dos valores de `ARTICLE_RESULT_CODES` e `value` é o aid
+    do artigo criado ou a mensagem de erro.
+
+    :param xml_strings: lista de strings de texto unicode.
+    :param overwrite_if_exists: (opcional) valor booleano indicando se os
+                                artigos devem ser substituídos caso já existam.
+    """
+    metadata_sch = get_schematron(BASIC_ARTICLE_META_PATH)
+    results = []
+
+    # as tasks disparadas pelos signals de cada artigo são enviadas apenas
+    # após o commit, quando os artigos já estão visíveis para os workers.
+    with models.deferred_tasks():
+        with transaction.commit_manually():
+            try:
+                for xml_string in xml_strings:
+                    try:
+                        new_article = _parse_article(xml_string, metadata_sch)
+                        _save_article(new_article, overwrite_if_exists)
+
+                    except (IntegrityError, ValueError, TypeError) as exc:
+                        results.append([_article_result_code(exc),
+                                        force_unicode(exc)])
+
+                    else:
+                        results.append([ARTICLE_RESULT_CODES['Success'],
+                                        new_article.aid])
+
+            except:
+                transaction.rollback()
+                raise
+
+            else:
+                transaction.commit()
+
+    logger.info('%s of %s Articles were added in batch.',
+            len([code for code, _ in results if code == 0]), len(results))
+
+    return results
+
+
 @app.task(ignore_result=True)
 def mark_articles_as_dirty():
     """ Marca todos os artigos para serem reindexados.
@@ -327,8 +687,8 @@ def link_article_with_their_related(article_pk):
                 article_pk)
         return None
 
-    related_article_elements = referrer.xml.xpath(
-            models.Article.XPaths.RELATED_CORRECTED_ARTICLES)
+    related_article_elements = models.get_compiled_xpath(
+            models.Article.XPaths.RELATED_CORRECTED_ARTICLES)(referrer.xml.root_etree)
 
     doi_type_pairs = ([elem.attrib['{http://www.w3.org/1999/xlink}href'],
                       elem.attrib['related-article-type']]
@@ -340,34 +700,107 @@ def link_article_with_their_related(article_pk):
         except (models.Article.DoesNotExist, models.Article.MultipleObjectsReturned) as exc:
             logger.error('Cannot get article with DOI "%s". The error message is: "%s"',
                     doi, exc.message)
+
+            # a associação será estabelecida por `link_pending_referrers`
+            # assim que o artigo com o DOI for criado.
+            models.PendingArticlesLinkage.objects.get_or_create(
+                    referrer=referrer, doi=doi, link_type=rel_type)
             return False
 
         _, created = models.ArticlesLinkage.objects.get_or_create(
                 referrer=referrer, link_to=target, link_type=rel_type)
 
+        referrer.pending_links.filter(doi=doi, link_type=rel_type).delete()
+
         logger.info('Article with pk %s is %s linked to %s',
                 'now' if created else 'already', target.pk, referrer.pk)
 
         return True
 
     with transaction.commit_on_success():
-        link_statuses = (_ensure_articles_are_linked(doi, rel_type)
-                         for doi, rel_type in doi_type_pairs)
+        # todas as relações devem ser processadas, para que as pendentes
+        # sejam registradas.
+        link_statuses = [_ensure_articles_are_linked(doi, rel_type)
+                         for doi, rel_type in doi_type_pairs]
 
         if all(link_statuses):
             referrer.control_attributes.articles_linkage_is_pending = False
             referrer.control_attributes.save()
 
 
+@app.task(ignore_result=True)
+def link_pending_referrers(article_pk):
+    """ Associa o artigo aos artigos que aguardam por ele.
+
+    Os artigos que aguardam são obtidos por meio do DOI, no índice de
+    relações pendentes `PendingArticlesLinkage`. Os artigos que deixam de ter
+    relações pendentes têm o atributo `articles_linkage_is_pending` alterado
+    para `False`.
+    """
+    try:
+        target = models.Article.objects.only('pk', 'doi').get(pk=article_pk)
+    except models.Article.DoesNotExist:
+        logger.info('Cannot find Article with with pk: %s. Skipping the task.',
+                article_pk)
+        return None
+
+    if not target.doi:
+        return None
+
+    if models.Article.objects.filter(doi=target.doi).count() > 1:
+        logger.error('Cannot link the referrers of DOI "%s" because it '
+                     'identifies more than one Article.', target.doi)
+        return None
+
+    with transaction.commit_on_success():
+        pendings = list(models.PendingArticlesLinkage.objects.select_related(
+                'referrer').filter(doi=target.doi))
+
+        for pending in pendings:
+            models.ArticlesLinkage.objects.get_or_create(
+                    referrer=pending.referrer, link_to=target,
+                    link_type=pending.link_type)
+
+        models.PendingArticlesLinkage.objects.filter(
+                pk__in=[pending.pk for pending in pendings]).delete()
+
+        referrer_pks = set(pending.referrer.pk for pending in pendings)
+        still_pending = set(models.PendingArticlesLinkage.objects.filter(
+                referrer__in=referrer_pks).values_list('referrer', flat=True))
+
+        resolved_pks = referrer_pks - still_pending
+        if resolved_pks:
+            models.ArticleControlAttributes.objects.filter(
+                    article__in=resolved_pks).update(
+                    articles_linkage_is_pending=False)
+
+    logger.info('%s Articles are now linked to %s. %s of them have no '
+                'pending links.', len(referrer_pks), target.pk,
+                len(resolved_pks))
+
+
 @app.task(ignore_result=True)
 def process_related_articles():
     """ Tenta associar artigos relacionados.
+
+    São considerados os artigos que ainda não foram processados, i.e.,
+    aqueles sem relações registradas no índice `PendingArticlesLinkage`, e
+    aqueles cujas relações pendentes referem-se a DOIs de artigos existentes.
+    Estes últimos não foram associados por `link_pending_referrers`, seja por
+    concorrência com `link_article_with_their_related` ou por DOIs que
+    identificavam mais de um artigo.
     """
-    articles = models.Article.objects.only('pk').filter(
-            control_attributes__articles_linkage_is_pending=True)
+    unprocessed = models.Article.objects.filter(
+            control_attributes__articles_linkage_is_pending=True,
+            pending_links__isnull=True).values_list('pk', flat=True)
+
+    resolvable = models.PendingArticlesLinkage.objects.filter(
+            doi__in=models.Article.objects.exclude(doi=u'').values('doi'),
+            referrer__control_attributes__articles_linkage_is_pending=True,
+            ).values_list('referrer', flat=True).distinct()
 
-    for article in articles:
-        link_article_with_their_related.delay(article.pk)
+    for article_pk in set(unprocessed) | set(resolvable):
+        link_article_with_their_related.delay(article_pk)
 
 
 @app.task(throws=(ValueError,))
@@ -404,12 +837,210 @@ def create_articleasset_from_bytes(aid, filename, content, owner=None,
     return asset.file.url
 
 
+def get_assets_staging_dir():
+    """Retorna o diretório, em `MEDIA_ROOT`, onde o conteúdo dos ativos
+    digitais aguarda o processamento por `create_articleassets_from_staging`.
+    """
+    return getattr(settings, 'ASSETS_STAGING_DIR', None) or os.path.join(
+            settings.MEDIA_ROOT, 'staging')
+
+
+def stage_asset_content(content):
+    """Grava `content` no diretório de *staging* e retorna o nome do arquivo
+    criado, a ser repassado para `create_articleassets_from_staging`.
+
+    O diretório deve ser compartilhado entre os processos que recebem os
+    ativos e os workers do celery, assim como `MEDIA_ROOT`.
+
+    :param content: string de bytes com o conteúdo do ativo digital.
+    """
+    staging_dir = get_assets_staging_dir()
+    if not os.path.isdir(staging_dir):
+        try:
+            os.makedirs(staging_dir)
+        except OSError:
+            # criado concorrentemente por outro processo
+            if not os.path.isdir(staging_dir):
+                raise
+
+    fd, path = tempfile.mkstemp(prefix='asset-', dir=staging_dir)
+    with os.fdopen(fd, 'wb') as staged:
+        staged.write(content)
+
+    return os.path.basename(path)
+
+
+def _discard_staged_files(staged_assets):
+    for staged_asset in staged_assets:
+        path = os.path.join(get_assets_staging_dir(),
+                            os.path.basename(staged_asset['staged_name']))
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _create_articleassets_from_staging(aid, staged_assets):
+    """Cria instâncias de `journalmanager.models.ArticleAsset` a partir de
+    arquivos gravados por `stage_asset_content`.
+
+    O conteúdo de cada arquivo é copiado em partes para o storage, e os
+    arquivos são removidos do diretório de *staging* após o commit da
+    transação. Caso contrário, os arquivos copiados para o storage são
+    removidos e os do diretório de *staging* são mantidos, para que a
+    operação possa ser repetida, até a execução de
+    `remove_stale_staged_assets`. Retorna a lista das URLs dos ativos, na
+    mesma ordem de `staged_assets`.
+
+    :param aid: ``article-id`` formado por uma string de 32 bytes.
+    :param staged_assets: lista de dicionários com as chaves `staged_name`,
+    `filename` e, opcionalmente, `owner` e `use_license`.
+    """
+    try:
+        article = models.Article.objects.get(aid=aid)
+
+    except models.Article.DoesNotExist:
+        _discard_staged_files(staged_assets)
+        raise ValueError('Cannot find Article with aid: %s' % aid)
+
+    staging_dir = get_assets_staging_dir()
+    assets = []
+    try:
+        with transaction.commit_on_success():
+            for staged_asset in staged_assets:
+                asset = models.ArticleAsset(article=article,
+                        owner=staged_asset.get('owner') or u'',
+                        use_license=staged_asset.get('use_license') or u'')
+                assets.append(asset)
+
+                path = os.path.join(staging_dir,
+                        os.path.basename(staged_asset['staged_name']))
+                with open(path, 'rb') as staged:
+                    asset.file.save(staged_asset['filename'], File(staged))
+
+                logger.info('New ArticleAsset %s added to Article with aid: '
+                            '%s.', repr(asset), aid)
+
+    except:
+        for asset in assets:
+            if asset.file:
+                asset.file.delete(save=False)
+        raise
+
+    _discard_staged_files(staged_assets)
+
+    # create a preferred alternative for the assets
+    for asset in assets:
+        create_preferred_image_file.delay(asset.pk)
+
+    return [asset.file.url for asset in assets]
+
+
+@app.task(throws=(ValueError,))
+def create_articleasset_from_staging(aid, staged_asset):
+    """Cria uma instância de `journalmanager.models.ArticleAsset` a partir de
+    arquivo gravado por `stage_asset_content`, e retorna a sua URL.
+
+    Equivalente a `create_articleasset_from_bytes`, porém apenas a referência
+    ao conteúdo trafega pelo broker.
+
+    :param staged_asset: dicionário com as chaves `staged_name`, `filename`
+    e, opcionalmente, `owner` e `use_license`.
+    """
+    return _create_articleassets_from_staging(aid, [staged_asset])[0]
+
+
+@app.task(throws=(ValueError,))
+def create_articleassets_from_staging(aid, staged_assets):
+    """Cria, em lote, instâncias de `journalmanager.models.ArticleAsset` a
+    partir de arquivos gravados por `stage_asset_content`.
+
+    Todos os ativos são criados em uma única transação. Retorna a lista das
+    URLs dos ativos, na mesma ordem de `staged_assets`.
+    """
+    return _create_articleassets_from_staging(aid, staged_assets)
+
+
+@app.task(ignore_result=True)
+def remove_stale_staged_assets():
+    """Remove os arquivos do diretório de *staging* dos ativos digitais que
+    não foram modificados nos últimos `ASSETS_STAGING_MAX_AGE` segundos, i.e.,
+    cujo processamento por `create_articleassets_from_staging` falhou ou
+    nunca foi solicitado.
+    """
+    staging_dir = get_assets_staging_dir()
+    try:
+        filenames = os.listdir(staging_dir)
+    except OSError:
+        return None
+
+    threshold = time.time() - ASSETS_STAGING_MAX_AGE
+    removed = 0
+    for filename in filenames:
+        path = os.path.join(staging_dir, filename)
+        try:
+            if os.path.getmtime(path) < threshold:
+                os.unlink(path)
+                removed += 1
+        except OSError:
+            # removido concorrentemente por outro processo
+            continue
+
+    logger.info('%s stale files were removed from %s.', removed, staging_dir)
+
+
+def _render_html_renditions(generator, xml_string, **generator_kwargs):
+    """Produz, em paralelo, os documentos HTML de cada idioma de `generator`.
+
+    A transformação XSLT é realizada pela libxslt sem o GIL, de maneira que
+    os idiomas são produzidos simultaneamente por threads. Como o documento
+    lxml e o XSLT de `generator` não podem ser compartilhados entre threads,
+    cada thread produz o seu próprio gerador a partir de `xml_string`.
+    Retorna a lista de pares (idioma, conteúdo).
+
+    :param generator: instância de `packtools.HTMLGenerator`.
+    :param xml_string: XML a partir do qual `generator` foi produzido.
+    :param generator_kwargs: argumentos utilizados na produção de `generator`.
+    """
+    languages = list(generator.languages)
+
+    def render(generator, lang):
+        html = generator.generate(lang)
+        return lang, etree.tostring(html, encoding='utf-8', method='html',
+                doctype=u'<!DOCTYPE html>')
+
+    if len(languages) < 2 or HTML_RENDITIONS_THREADS < 2:
+        return [render(generator, lang) for lang in languages]
+
+    local = threading.local()
+
+    def render_in_thread(lang):
+        if not hasattr(local, 'generator'):
+            local.generator = packtools.HTMLGenerator.parse(
+                    io.BytesIO(xml_string), **generator_kwargs)
+
+        return render(local.generator, lang)
+
+    pool = ThreadPool(min(len(languages), HTML_RENDITIONS_THREADS))
+    try:
+        return pool.map(render_in_thread, languages)
+    finally:
+        pool.close()
+        pool.join()
+
+
 @app.task(throws=(ValueError,))
-def create_article_html_renditions(article_pk, css_url=None, valid_only=False):
+def create_article_html_renditions(article_pk, css_url=None, valid_only=False,
+        force=False):
     """Cria os documentos HTML para cada idioma do artigo.
 
+    Os documentos são produzidos apenas se o XML do artigo ou a versão do
+    packtools forem diferentes dos utilizados na produção dos documentos
+    existentes.
+
     :param css_url: (opcional) URL da CSS a ser relacionada no documento HTML.
     :param valid_only: (opcional) produz o HTML apenas para XMLs válidos.
+    :param force: (opcional) produz os documentos incondicionalmente.
     """
     try:
         article = models.Article.objects.get(pk=article_pk)
@@ -417,17 +1048,39 @@ def create_article_html_renditions(article_pk, css_url=None, valid_only=False):
     except models.Article.DoesNotExist:
         raise ValueError('Cannot find Article with pk: %s' % article_pk)
 
+    source_hash = article.xml_checksum
+    renditions = dict((rendition.lang, rendition)
+                      for rendition in article.htmls.all())
+
+    is_up_to_date = renditions and all(
+            rendition.source_hash == source_hash and
+            rendition.build_version == packtools.__version__
+            for rendition in renditions.values())
+
+    if is_up_to_date and not force:
+        logger.info('ArticleHTMLRenditions of Article with aid: %s are up to '
+                    'date. Skipping.', article.aid)
+        return [rendition.file.url for rendition in renditions.values()]
+
     css_url = css_url or static('css/htmlgenerator/styles.css')
 
+    xml_string = str(article.xml)
+    generator_kwargs = dict(valid_only=valid_only, css=css_url)
+    generator = packtools.HTMLGenerator.parse(io.BytesIO(xml_string),
+            **generator_kwargs)
+
     files_urls = []
-    for lang, html in packtools.HTMLGenerator.parse(article.xml.root_etree,
-            valid_only=valid_only, css=css_url):
-        rendition, _ = models.ArticleHTMLRendition.objects.get_or_create(
-                article=article, lang=lang)
-        rendition.build_version = packtools.__version__
+    for lang, content in _render_html_renditions(generator, xml_string,
+                                                 **generator_kwargs):
+        rendition = renditions.pop(lang, None)
+        if rendition is None:
+            rendition = models.ArticleHTMLRendition(article=article, lang=lang)
+        elif rendition.file:
+            # mantém o nome do arquivo, que seria sufixado pelo storage
+            rendition.file.delete(save=False)
 
-        content = etree.tostring(html, encoding='utf-8', method='html',
-                doctype=u'<!DOCTYPE html>')
+        rendition.build_version = packtools.__version__
+        rendition.source_hash = source_hash
 
         filename = ''.join([article.aid, u'-', lang, u'.html'])
         rendition.file.save(filename, ContentFile(content))
@@ -437,9 +1090,34 @@ def create_article_html_renditions(article_pk, css_url=None, valid_only=False):
         logger.info('ArticleHTMLRendition in lang "%s" added to Article with '
                     'aid: %s.', lang, article.aid)
 
+    # idiomas que deixaram de existir no XML
+    for rendition in renditions.values():
+        rendition.file.delete(save=False)
+        rendition.delete()
+
     return files_urls
 
 
+# modos de cor suportados pelo codificador JPEG
+JPEG_MODES = ('1', 'L', 'RGB', 'CMYK')
+
+
+def _save_as_jpeg(image, fileobj, mode=None, **kwargs):
+    """Grava `image` em `fileobj` no formato JPEG.
+
+    Imagens em modos de cor não suportados pelo JPEG (e.g. `P`, `RGBA`,
+    `I;16`) são convertidas para `RGB`, caso `mode` não seja informado.
+    """
+    _ = kwargs.pop('format', None)
+
+    if mode:
+        image = image.convert(mode=mode)
+    elif image.mode not in JPEG_MODES:
+        image = image.convert(mode='RGB')
+
+    image.save(fileobj, format='jpeg', **kwargs)
+
+
 def convert_image_to_jpeg(filepath, mode=None, **kwargs):
     """Converte a imagem no caminho `filepath` para o formato JPEG.
 
@@ -450,27 +1128,107 @@ def convert_image_to_jpeg(filepath, mode=None, **kwargs):
     função `Image.save`, com exceção de `format` que foi pré-definido.
     """
     output_buffer = io.BytesIO()
-    _ = kwargs.pop('format', None)
+    _save_as_jpeg(Image.open(filepath), output_buffer, mode=mode, **kwargs)
 
-    original = Image.open(filepath)
-    if mode:
-        _image = original.convert(mode=mode)
-    else:
-        _image = original
+    return output_buffer
 
-    _image.save(output_buffer, format='jpeg', **kwargs)
 
-    return output_buffer
+def _to_resizable_mode(image):
+    """Converte `image` para `L` ou `RGB`, modos de cor suportados tanto pelo
+    filtro `ANTIALIAS` quanto pelo codificador JPEG.
+
+    As imagens em tons de cinza de 16 bits (`I;16`) têm a sua profundidade
+    reduzida para 8 bits, ao invés de terem os valores truncados.
+    """
+    if image.mode in ('L', 'RGB'):
+        return image
+
+    if image.mode.startswith('I;16'):
+        image = image.convert('I').point(lambda i: i * (1.0 / 256))
+
+    if image.mode in ('1', 'I', 'F'):
+        return image.convert('L')
+
+    return image.convert('RGB')
+
+
+def _fit_size(size, box):
+    """Retorna as dimensões de `size` reduzidas proporcionalmente para caber
+    em `box`. Imagens menores que `box` não são ampliadas.
+    """
+    width, height = size
+    max_width, max_height = box
+    ratio = min(1.0, float(max_width) / width, float(max_height) / height)
+
+    return max(1, int(width * ratio)), max(1, int(height * ratio))
+
+
+def _save_image_file(fieldfile, filename, image, **kwargs):
+    """Grava `image` em JPEG no storage de `fieldfile`.
+
+    O conteúdo é gravado em um arquivo temporário e copiado em partes para o
+    storage, de maneira que não seja mantido integralmente em memória.
+    """
+    if fieldfile:
+        # mantém o nome do arquivo, que seria sufixado pelo storage
+        fieldfile.delete(save=False)
+
+    with tempfile.TemporaryFile() as tmp:
+        _save_as_jpeg(image, tmp, **kwargs)
+
+        content = File(tmp)
+        # arquivos temporários anônimos não têm caminho a partir do qual o
+        # tamanho possa ser obtido.
+        content.size = tmp.tell()
+        tmp.seek(0)
+
+        fieldfile.save(filename, content, save=False)
+
+
+def _create_image_derivatives(asset, image, filename_head):
+    """Produz as versões reduzidas de `image` definidas em
+    `ARTICLE_ASSET_DERIVATIVES`.
+
+    As versões são produzidas da maior para a menor, cada uma a partir da
+    anterior, de maneira que a imagem original é reduzida apenas uma vez.
+    """
+    derivatives = dict((derivative.name, derivative)
+                       for derivative in asset.derivatives.all())
+
+    sizes = sorted(ARTICLE_ASSET_DERIVATIVES.items(),
+                   key=lambda item: item[1][0] * item[1][1], reverse=True)
+
+    for name, box in sizes:
+        size = _fit_size(image.size, box)
+        if size != image.size:
+            image = image.resize(size, Image.ANTIALIAS)
+
+        derivative = derivatives.pop(name, None)
+        if derivative is None:
+            derivative = models.ArticleAssetDerivative(asset=asset, name=name)
+
+        derivative.width, derivative.height = image.size
+        _save_image_file(derivative.file,
+                         u'%s-%s.jpeg' % (filename_head, name), image)
+        derivative.save()
+
+    # versões que deixaram de ser configuradas
+    for derivative in derivatives.values():
+        derivative.file.delete(save=False)
+        derivative.delete()
 
 
 @app.task(throws=(ValueError, TypeError,))
 def create_preferred_image_file(asset_pk):
     """Cria uma versão alternativa de `ArticleAsset.file`, preferida para o
-    manuseio.
+    manuseio, e as suas versões reduzidas (ver `ARTICLE_ASSET_DERIVATIVES`).
 
     Por hora a versão preferida é o JPEG ao invés de TIFF. Para os demais
     formatos não serão geradas outras versões.
 
+    A imagem é aberta e decodificada apenas uma vez. O formato é obtido do
+    cabeçalho do arquivo, e o JPEG é produzido diretamente em disco.
+
     :param asset_pk: chave primária da instância de `ArticleAsset`.
     """
     try:
@@ -484,22 +1242,24 @@ def create_preferred_image_file(asset_pk):
     except ValueError as exc:
         logger.exception(exc)
         logger.error('Cannot create a preferred alt file for %s. Skipping.',
-                     filepath)
+                     repr(asset))
         raise
 
-    if not asset.is_image():
+    try:
+        # apenas o cabeçalho é lido; os pixels são decodificados em `load`.
+        image = Image.open(filepath)
+    except IOError:
         logger.error('Cannot create a preferred alt file for %s. Skipping.',
                      filepath)
         raise ValueError('Cannot create preferred alternatives for files '
                         'other than images.')
 
-    _file = Image.open(asset.file.path)
-    if _file.format.lower() != 'tiff':
+    if image.format.lower() != 'tiff':
         raise ValueError('Image is already in a preferred format.')
 
     try:
-        # Levanta IOError caso `filepath` não seja um arquivo de imagem.
-        jpeg_buffer = convert_image_to_jpeg(filepath)
+        # Levanta IOError caso o conteúdo da imagem seja inválido.
+        image.load()
     except IOError as exc:
         logger.exception(exc)
         logger.error('Cannot create a preferred alt file for %s. Skipping.',
@@ -509,10 +1269,13 @@ def create_preferred_image_file(asset_pk):
     _, filename = os.path.split(filepath)
     filename_head, _ = os.path.splitext(filename)
 
-    jpeg_filename = filename_head + '.jpeg'
+    # a conversão é realizada uma única vez, antes das reduções.
+    image = _to_resizable_mode(image)
+
+    _save_image_file(asset.preferred_alt_file, filename_head + '.jpeg', image)
+    asset.save()
 
-    asset.preferred_alt_file.save(jpeg_filename,
-                                  ContentFile(jpeg_buffer.getvalue()))
+    _create_image_derivatives(asset, image, filename_head)
 
     logger.info('Finished creating an alternative file for %s.',
             repr(asset))
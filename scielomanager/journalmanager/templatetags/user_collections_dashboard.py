@@ -1,16 +1,49 @@
 from django import template
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.utils.translation import ugettext as _
+from django.utils.translation import get_language
+
+from journalmanager import models
 
 
 register = template.Library()
 
 
-def user_collections_dashboard(collections, user):
-    html = ''
+def user_collections_dashboard(user, memberships=None):
+    """
+    Renders the collections menu of ``user``.
+
+    ``memberships`` is a mapping of the collections of the user to the
+    corresponding ``UserCollections``, as returned by
+    ``models.get_user_memberships``, which is called if it is not given.
+    The fragment is cached per user and language until the memberships of
+    the user change.
+    """
+    key = models.USER_COLLECTIONS_DASHBOARD_CACHE_KEY % (user.pk, get_language())
+    timeout = models.USER_COLLECTIONS_DASHBOARD_CACHE_TIMEOUT
+
+    if timeout:
+        html = cache.get(key)
+        if html is not None:
+            return html
+
+    if memberships is None:
+        memberships = models.get_user_memberships(user.pk)
+
+    html = _render_dashboard(user, memberships)
+
+    if timeout:
+        cache.set(key, html, timeout)
+
+    return html
+
+
+def _render_dashboard(user, memberships):
+    html = u''
 
-    for collection in collections:
-        is_default = collection.is_default_to_user(user)
+    for collection, membership in memberships.items():
+        is_default = membership.is_default
 
         classname = u'dropdown active' if is_default else u'dropdown'
         name = collection.name
@@ -40,7 +73,7 @@ def user_collections_dashboard(collections, user):
                        activation_label=activation_label,
                        lowercase_name=name.lower()).strip()
 
-        if collection.is_managed_by_user(user):
+        if membership.is_manager:
             html_edit = u"""<li id="edit-{lowercase_name}">
                               <a href="{edit_url}">
                                 <i class="icon-edit"></i> {edit_label}
@@ -240,7 +240,8 @@ class JournalManagerTests(TestCase):
 
         journal1 = modelfactories.JournalFactory.create(title=u'ABC 123')
         journal1.join(collection, user)
-        journal2 = modelfactories.JournalFactory.create(title=u'XYZ')
+        journal2 = modelfactories.JournalFactory.create(title=u'XYZ',
+                                                        acronym=u'xyz')
         journal2.join(collection, user)
 
         def get_user_collections():
@@ -308,6 +309,72 @@ class JournalManagerTests(TestCase):
 
         self.assertEqual(user_journals.count(), 1)
 
+    def test_simple_search_matches_word_prefixes(self):
+        collection = modelfactories.CollectionFactory.create()
+
+        user = self._make_user(collection)
+
+        journal1 = modelfactories.JournalFactory.create(
+            title=u'Arquivos Brasileiros de Cardiologia')
+        journal1.join(collection, user)
+        journal2 = modelfactories.JournalFactory.create(title=u'XYZ')
+        journal2.join(collection, user)
+
+        def get_user_collections():
+            return user.user_collection.all()
+
+        user_journals = models.Journal.userobjects.all(
+            get_all_collections=get_user_collections).simple_search('arq card')
+
+        self.assertEqual([j.pk for j in user_journals], [journal1.pk])
+
+    def test_simple_search_matches_acronyms_and_short_titles(self):
+        collection = modelfactories.CollectionFactory.create()
+
+        user = self._make_user(collection)
+
+        journal1 = modelfactories.JournalFactory.create(
+            title=u'Brazilian Journal of Medical and Biological Research',
+            short_title=u'Braz J Med Biol Res', acronym=u'bjmbr')
+        journal1.join(collection, user)
+        journal2 = modelfactories.JournalFactory.create(
+            title=u'XYZ', short_title=u'XYZ', acronym=u'xyz')
+        journal2.join(collection, user)
+
+        def get_user_collections():
+            return user.user_collection.all()
+
+        journals = models.Journal.userobjects.all(
+            get_all_collections=get_user_collections)
+
+        self.assertEqual([j.pk for j in journals.simple_search('bjmbr')],
+                         [journal1.pk])
+        self.assertEqual([j.pk for j in journals.simple_search('jmb')],
+                         [journal1.pk])
+        self.assertEqual([j.pk for j in journals.simple_search('Med Biol')],
+                         [journal1.pk])
+
+    def test_simple_search_ranks_title_matches_first(self):
+        collection = modelfactories.CollectionFactory.create()
+
+        user = self._make_user(collection)
+
+        journal1 = modelfactories.JournalFactory.create(
+            title=u'Revista Brasileira', short_title=u'Rev. Saude')
+        journal1.join(collection, user)
+        journal2 = modelfactories.JournalFactory.create(
+            title=u'Saude e Sociedade', short_title=u'Saude Soc.')
+        journal2.join(collection, user)
+
+        def get_user_collections():
+            return user.user_collection.all()
+
+        user_journals = models.Journal.userobjects.all(
+            get_all_collections=get_user_collections).simple_search('saude')
+
+        self.assertEqual([j.pk for j in user_journals],
+                         [journal2.pk, journal1.pk])
+
     def test_available_returns_non_trashed_items(self):
         collection = modelfactories.CollectionFactory.create()
 
@@ -596,6 +663,54 @@ class SectionManagerTests(TestCase):
 
         self.assertEqual(user_sections.count(), 0)
 
+    def test_startswith_is_based_on_titles(self):
+        collection = modelfactories.CollectionFactory.create()
+
+        user = self._make_user(collection)
+
+        journal = modelfactories.JournalFactory.create()
+        journal.join(collection, user)
+
+        section1 = modelfactories.SectionFactory.create(journal=journal)
+        modelfactories.SectionTitleFactory.create(
+            section=section1, title=u'Artigos Originais')
+        section2 = modelfactories.SectionFactory.create(journal=journal)
+        modelfactories.SectionTitleFactory.create(
+            section=section2, title=u'Editorial')
+
+        def get_user_collections():
+            return user.user_collection.all()
+
+        user_sections = models.Section.userobjects.all(
+            get_all_collections=get_user_collections).startswith('a')
+
+        self.assertEqual([s.pk for s in user_sections], [section1.pk])
+
+    def test_simple_search_is_based_on_titles(self):
+        collection = modelfactories.CollectionFactory.create()
+
+        user = self._make_user(collection)
+
+        journal = modelfactories.JournalFactory.create()
+        journal.join(collection, user)
+
+        section1 = modelfactories.SectionFactory.create(journal=journal)
+        modelfactories.SectionTitleFactory.create(
+            section=section1, title=u'Artigos Originais')
+        modelfactories.SectionTitleFactory.create(
+            section=section1, title=u'Original Articles')
+        section2 = modelfactories.SectionFactory.create(journal=journal)
+        modelfactories.SectionTitleFactory.create(
+            section=section2, title=u'Editorial')
+
+        def get_user_collections():
+            return user.user_collection.all()
+
+        user_sections = models.Section.userobjects.all(
+            get_all_collections=get_user_collections).simple_search('original')
+
+        self.assertEqual([s.pk for s in user_sections], [section1.pk])
+
 
 class SponsorManagerTests(TestCase):
 
@@ -17,6 +17,7 @@ from .modelfactories import (
     JournalFactory,
     CollectionFactory,
     RegularPressReleaseFactory,
+    ArticleFactory,
 )
 
 from scielomanager.utils.modelmanagers.helpers import (
@@ -278,6 +279,40 @@ class IssueTests(TestCase):
         self.assertTrue(issue3.order < issue6.order)
         self.assertEqual(issue6.order, 4)
 
+    def test_publication_year_changes_are_tracked(self):
+        issue = IssueFactory.create(publication_year=2012)
+        self.assertFalse(issue.has_field_changed('publication_year'))
+
+        issue.publication_year = 2013
+        self.assertTrue(issue.has_field_changed('publication_year'))
+
+        issue.save()
+        self.assertFalse(issue.has_field_changed('publication_year'))
+
+    def test_publication_year_changes_are_tracked_on_loaded_instances(self):
+        issue = IssueFactory.create(publication_year=2012)
+        issue = models.Issue.objects.get(pk=issue.pk)
+
+        issue.publication_year = 2013
+
+        self.assertNumQueries(0,
+            lambda: self.assertTrue(issue.has_field_changed('publication_year')))
+
+    def test_publication_year_changes_on_deferred_instances(self):
+        issue = IssueFactory.create(publication_year=2012)
+        issue = models.Issue.objects.only('pk').get(pk=issue.pk)
+
+        self.assertFalse(issue.has_field_changed('publication_year'))
+
+    def test_edits_keep_the_order(self):
+        issue = IssueFactory.create(volume='9', publication_year=2012)
+        order = issue.order
+
+        issue.total_documents = 17
+        issue.save()
+
+        self.assertEqual(models.Issue.objects.get(pk=issue.pk).order, order)
+
     def test_scielo_pid(self):
         journal = JournalFactory.create(print_issn='1234-1234',
                                         scielo_issn='print')
@@ -434,6 +469,61 @@ class JournalTests(TestCase):
 
         self.assertEqual(grid.values()[0].keys(), expected)
 
+    def test_issues_grid_must_be_ordered_by_order_in_the_same_volume(self):
+        journal = JournalFactory.create()
+        for order in [3, 1, 2]:
+            issue = IssueFactory.create(journal=journal, volume='9',
+                                        publication_year=2012)
+            issue.order = order
+            issue.save(auto_order=False)
+
+        grid = journal.issues_as_grid()
+
+        self.assertEqual([i.order for i in grid[2012]['9']], [1, 2, 3])
+
+    def test_issues_grid_carries_the_number_of_articles(self):
+        journal = JournalFactory.create()
+        IssueFactory.create(journal=journal, volume='9', publication_year=2012)
+
+        grid = journal.issues_as_grid()
+
+        self.assertEqual(grid[2012]['9'][0].articles_count, 0)
+
+    def test_issues_grid_is_served_from_cache(self):
+        journal = JournalFactory.create()
+        for i in range(3):
+            IssueFactory.create(journal=journal, volume='9',
+                                publication_year=2012)
+        journal.issues_as_grid()
+
+        self.assertNumQueries(0, journal.issues_as_grid)
+
+    def test_issues_grid_is_invalidated_when_issues_are_trashed(self):
+        journal = JournalFactory.create()
+        issue = IssueFactory.create(journal=journal, volume='9',
+                                    publication_year=2012)
+        self.assertEqual(len(journal.issues_as_grid()[2012]['9']), 1)
+
+        issue.is_trashed = True
+        issue.save()
+
+        self.assertFalse(journal.issues_as_grid())
+        self.assertEqual(len(journal.issues_as_grid('0')[2012]['9']), 1)
+
+    def test_issues_grid_is_invalidated_explicitly_after_bulk_updates(self):
+        journal = JournalFactory.create()
+        issue = IssueFactory.create(journal=journal, volume='9',
+                                    publication_year=2012)
+        article = ArticleFactory.create()
+        self.assertEqual(journal.issues_as_grid()[2012]['9'][0].articles_count, 0)
+
+        # `update` não dispara signals
+        models.Article.objects.filter(pk=article.pk).update(
+            journal=journal, issue=issue)
+        models.invalidate_issues_grid(journal.pk)
+
+        self.assertEqual(journal.issues_as_grid()[2012]['9'][0].articles_count, 1)
+
     def test_journal_has_issues_must_be_true(self):
         journal = JournalFactory.create()
         issues = []
@@ -1202,6 +1292,54 @@ class ArticleXpathsTests(TestCase):
                 '10.1590/abd1806-4841.20142999')
 
 
+class ArticleIdentificationValuesTests(TestCase):
+
+    def setUp(self):
+        here = os.path.abspath(os.path.dirname(__file__))
+        self.samples = []
+        for filename in ['0034-8910-rsp-48-2-0216.xml',
+                         '0034-8910-rsp-48-2-0216_related.xml']:
+            with open(os.path.join(here, 'xml_samples', filename)) as fp:
+                self.samples.append(fp.read())
+
+    def test_values_are_equivalent_to_get_value(self):
+        for sample in self.samples:
+            article = models.Article(xml=sample)
+            values = article.get_identification_values()
+
+            for expression in models.IDENTIFICATION_XPATHS:
+                self.assertEqual(values[expression],
+                        article.get_value(expression))
+
+    def test_first_occurence_is_returned(self):
+        article = models.Article(xml=u"""<article>
+                                           <front>
+                                             <article-meta>
+                                               <fpage>10</fpage>
+                                               <fpage seq="b">11</fpage>
+                                               <article-id pub-id-type="other"> 1 </article-id>
+                                               <article-id pub-id-type="other">2</article-id>
+                                             </article-meta>
+                                           </front>
+                                         </article>""")
+        values = article.get_identification_values()
+
+        self.assertEqual(values[models.Article.XPaths.FPAGE], u'10')
+        self.assertEqual(values[models.Article.XPaths.FPAGE_SEQ], u'b')
+        self.assertEqual(values[models.Article.XPaths.AOP_ID], u'1')
+
+    def test_missing_values_are_None(self):
+        article = models.Article(xml=u'<foo><front/></foo>')
+        values = article.get_identification_values()
+
+        self.assertTrue(all(value is None for value in values.values()))
+
+    def test_compiled_xpaths_are_reused(self):
+        expression = models.Article.XPaths.DOI
+        self.assertIs(models.get_compiled_xpath(expression),
+                models.get_compiled_xpath(expression))
+
+
 class ArticleDomainKeyTests(TestCase):
     """ Domain key (chave de domínio) é uma chave candidata formada pelo uso
     de dados do objeto de domínio. É um sinônimo de Natural key.
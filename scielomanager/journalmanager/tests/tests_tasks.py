@@ -2,10 +2,15 @@
 import os
 import io
 import copy
+import time
+import shutil
+import tempfile
 import unittest
 
+import celery
 from lxml import isoschematron, etree
 from django.test import TestCase
+from django.test.utils import override_settings
 
 from journalmanager import tasks, models
 from . import modelfactories
@@ -694,6 +699,136 @@ class FunctionAddFromStringTests(TestCase):
         self.assertEquals(new_correction.links_to.all().count(), 0)
 
 
+class FunctionAddManyFromStringsTests(TestCase):
+    sample = FunctionAddFromStringTests.sample
+
+    def test_results_follow_input_order(self):
+        results = tasks.create_articles_from_strings(
+                [self.sample, u"<article></articlezzzz>"])
+
+        self.assertEquals(len(results), 2)
+        self.assertEquals(results[0][0], tasks.ARTICLE_RESULT_CODES['Success'])
+        self.assertEquals(len(results[0][1]), 32)
+        self.assertEquals(results[1][0], tasks.ARTICLE_RESULT_CODES['ValueError'])
+
+    def test_articles_are_created(self):
+        results = tasks.create_articles_from_strings([self.sample])
+
+        self.assertTrue(models.Article.objects.filter(aid=results[0][1]).exists())
+
+    def test_duplicated_articles_are_reported(self):
+        results = tasks.create_articles_from_strings([self.sample, self.sample])
+
+        self.assertEquals(results[0][0], tasks.ARTICLE_RESULT_CODES['Success'])
+        self.assertEquals(results[1][0],
+                tasks.ARTICLE_RESULT_CODES['IntegrityError'])
+        self.assertEquals(models.Article.objects.count(), 1)
+
+    def test_duplicated_articles_causes_overwrite(self):
+        results = tasks.create_articles_from_strings([self.sample, self.sample],
+                overwrite_if_exists=True)
+
+        self.assertEquals([code for code, _ in results], [0, 0])
+        self.assertEquals(results[0][1], results[1][1])
+
+    def test_byte_strings_are_reported(self):
+        results = tasks.create_articles_from_strings(
+                [self.sample.encode('utf-8')])
+
+        self.assertEquals(results[0][0], tasks.ARTICLE_RESULT_CODES['TypeError'])
+
+    def test_syntax_errors_are_reported_with_their_message(self):
+        results = tasks.create_articles_from_strings([u"<article></articlezzzz>"])
+
+        self.assertTrue(results[0][1].startswith(u'Syntax error:'))
+
+    def test_tasks_are_sent_after_commit(self):
+        events = []
+        original_commit = tasks.transaction.commit
+
+        def commit(*args, **kwargs):
+            events.append('commit')
+            return original_commit(*args, **kwargs)
+
+        def send_task(name, *args, **kwargs):
+            events.append(name)
+
+        tasks.transaction.commit = commit
+        celery.current_app.send_task = send_task
+        try:
+            tasks.create_articles_from_strings([self.sample, self.sample])
+        finally:
+            tasks.transaction.commit = original_commit
+            del celery.current_app.send_task
+
+        self.assertEquals(events[0], 'commit')
+        self.assertIn('journalmanager.tasks.link_article_to_journal', events)
+        self.assertIn('journalmanager.tasks.create_article_html_renditions',
+                events)
+
+    def test_exception_subclasses_are_mapped_to_their_base_code(self):
+        exc = UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid start byte')
+
+        self.assertEquals(tasks._article_result_code(exc),
+                tasks.ARTICLE_RESULT_CODES['ValueError'])
+
+
+class ElasticsearchClientStub(object):
+    """Registra os artigos submetidos por meio de `bulk_add`.
+    """
+    def __init__(self, failing_ids=()):
+        self.failing_ids = failing_ids
+        self.requests = []
+
+    def bulk_add(self, items, chunk_size=500):
+        ids = [id for id, _ in items]
+        self.requests.append(ids)
+        return [id for id in ids if id not in self.failing_ids]
+
+
+class ProcessDirtyArticlesInBulkTests(TestCase):
+    def setUp(self):
+        self._original_client = tasks.elasticsearch_client
+
+    def tearDown(self):
+        tasks.elasticsearch_client = self._original_client
+
+    def test_dirty_articles_are_submitted_in_chunks(self):
+        for _ in range(5):
+            modelfactories.ArticleFactory.create()
+
+        tasks.elasticsearch_client = ElasticsearchClientStub()
+        total = tasks.process_dirty_articles_in_bulk(chunk_size=2)
+
+        self.assertEquals(total, 5)
+        self.assertEquals([len(req) for req in tasks.elasticsearch_client.requests],
+                [2, 2, 1])
+
+    def test_indexed_articles_are_no_longer_dirty(self):
+        article = modelfactories.ArticleFactory.create()
+
+        tasks.elasticsearch_client = ElasticsearchClientStub()
+        tasks.process_dirty_articles_in_bulk()
+
+        ctrl_attrs = models.ArticleControlAttributes.objects.get(article=article)
+        self.assertFalse(ctrl_attrs.es_is_dirty)
+        self.assertTrue(ctrl_attrs.es_updated_at)
+
+    def test_failed_articles_remain_dirty(self):
+        article = modelfactories.ArticleFactory.create()
+        failing = modelfactories.ArticleFactory.create()
+
+        tasks.elasticsearch_client = ElasticsearchClientStub(
+                failing_ids=[failing.aid])
+        total = tasks.process_dirty_articles_in_bulk()
+
+        self.assertEquals(total, 1)
+        self.assertFalse(models.ArticleControlAttributes.objects.get(
+            article=article).es_is_dirty)
+        self.assertTrue(models.ArticleControlAttributes.objects.get(
+            article=failing).es_is_dirty)
+
+
 class LinkArticleToJournalTests(TestCase):
     def test_many_journals_without_print_issn(self):
         article = modelfactories.ArticleFactory.create()
@@ -788,6 +923,83 @@ class LinkArticleToJournalTests(TestCase):
         self.assertEquals(fresh_article.journal.pk, journal.pk)
 
 
+class ProcessOrphanArticlesTests(TestCase):
+    def _make_orphan(self, issn_ppub='', issn_epub=''):
+        article = modelfactories.ArticleFactory.create()
+        article.issn_ppub = issn_ppub
+        article.issn_epub = issn_epub
+        article.save()
+        return article
+
+    def test_match_based_on_print_issn(self):
+        article = self._make_orphan(issn_ppub='1518-8787')
+        journal = modelfactories.JournalFactory.create(print_issn='1518-8787')
+
+        tasks.process_orphan_articles()
+
+        fresh_article = models.Article.objects.get(pk=article.pk)
+        self.assertEquals(fresh_article.journal.pk, journal.pk)
+
+    def test_match_based_on_crossed_electronic_issn(self):
+        article = self._make_orphan(issn_ppub='1518-8787')
+        journal = modelfactories.JournalFactory.create(eletronic_issn='1518-8787')
+
+        tasks.process_orphan_articles()
+
+        fresh_article = models.Article.objects.get(pk=article.pk)
+        self.assertEquals(fresh_article.journal.pk, journal.pk)
+
+    def test_ambiguous_matches_are_not_linked(self):
+        article = self._make_orphan(issn_ppub='0034-8910', issn_epub='1518-8787')
+        modelfactories.JournalFactory.create(print_issn='0034-8910')
+        modelfactories.JournalFactory.create(eletronic_issn='1518-8787')
+
+        stats = tasks.process_orphan_articles()
+
+        fresh_article = models.Article.objects.get(pk=article.pk)
+        self.assertEquals(fresh_article.journal, None)
+        self.assertEquals(stats['without_journal'], 1)
+
+    def test_articles_are_linked_to_issue(self):
+        article = self._make_orphan(issn_ppub='0034-8910')
+        journal = modelfactories.JournalFactory.create(print_issn='0034-8910')
+        issue = modelfactories.IssueFactory.create(journal=journal,
+                volume='48', number='2', publication_year=2014)
+
+        stats = tasks.process_orphan_articles()
+
+        fresh_article = models.Article.objects.get(pk=article.pk)
+        self.assertEquals(fresh_article.journal.pk, journal.pk)
+        self.assertEquals(fresh_article.issue.pk, issue.pk)
+        self.assertEquals(stats['linked_to_issue'], 1)
+
+    def test_unresolved_issues_are_reported(self):
+        article = self._make_orphan(issn_ppub='0034-8910')
+        modelfactories.JournalFactory.create(print_issn='0034-8910')
+
+        stats = tasks.process_orphan_articles()
+
+        fresh_article = models.Article.objects.get(pk=article.pk)
+        self.assertEquals(fresh_article.issue, None)
+        self.assertEquals(stats['linked_to_journal'], 1)
+        self.assertEquals(stats['without_issue'], 1)
+
+    def test_caches_are_invalidated(self):
+        from django.core.cache import cache
+        from thrift.resultcache import RESULT_CACHE
+
+        self._make_orphan(issn_ppub='0034-8910')
+        journal = modelfactories.JournalFactory.create(print_issn='0034-8910')
+        grid_key = models.ISSUES_GRID_CACHE_KEY % (journal.pk, 1)
+        cache.set(grid_key, 'stale grid')
+        generation = RESULT_CACHE.generation()
+
+        tasks.process_orphan_articles()
+
+        self.assertEquals(cache.get(grid_key), None)
+        self.assertNotEquals(RESULT_CACHE.generation(), generation)
+
+
 class LinkArticleWithTheirRelated(TestCase):
 
     def test_correction_linkage(self):
@@ -824,6 +1036,80 @@ class LinkArticleWithTheirRelated(TestCase):
             pk=correction.pk).links_to.filter(link_to=article).count())
 
 
+class LinkPendingReferrersTests(TestCase):
+
+    def _make_pending_correction(self):
+        correction = models.Article.parse(modelfactories.SAMPLE_XML_RELATED)
+        correction.save()
+        tasks.link_article_with_their_related(correction.pk)
+        return correction
+
+    def test_missing_targets_are_registered_as_pending(self):
+        correction = self._make_pending_correction()
+
+        pending = correction.pending_links.get()
+        self.assertEquals(pending.doi, u'10.1590/S0034-8910.2014048004965')
+        self.assertEquals(pending.link_type, u'corrected-article')
+
+    def test_new_articles_are_linked_to_their_referrers(self):
+        correction = self._make_pending_correction()
+        article = modelfactories.ArticleFactory.create(
+                doi=u'10.1590/S0034-8910.2014048004965')
+
+        tasks.link_pending_referrers(article.pk)
+
+        fresh_correction = models.Article.objects.get(pk=correction.pk)
+        self.assertTrue(fresh_correction.links_to.get(link_to=article))
+        self.assertEquals(fresh_correction.pending_links.count(), 0)
+        self.assertFalse(
+                fresh_correction.control_attributes.articles_linkage_is_pending)
+
+    def test_unrelated_articles_do_not_resolve_pending_links(self):
+        correction = self._make_pending_correction()
+        article = modelfactories.ArticleFactory.create(doi=u'10.1590/foo')
+
+        tasks.link_pending_referrers(article.pk)
+
+        fresh_correction = models.Article.objects.get(pk=correction.pk)
+        self.assertEquals(fresh_correction.pending_links.count(), 1)
+        self.assertTrue(
+                fresh_correction.control_attributes.articles_linkage_is_pending)
+
+
+class ProcessRelatedArticlesTests(TestCase):
+
+    @override_settings(CELERY_EAGER_PROPAGATES_EXCEPTIONS=True, CELERY_ALWAYS_EAGER=True, BROKER_BACKEND='memory')
+    def test_pending_links_to_existing_articles_are_resolved(self):
+        correction = models.Article.parse(modelfactories.SAMPLE_XML_RELATED)
+        correction.save()
+        tasks.link_article_with_their_related(correction.pk)
+
+        # o artigo é criado sem que `link_pending_referrers` seja executado.
+        article = modelfactories.ArticleFactory.create(
+                doi=u'10.1590/S0034-8910.2014048004965')
+
+        tasks.process_related_articles()
+
+        fresh_correction = models.Article.objects.get(pk=correction.pk)
+        self.assertTrue(fresh_correction.links_to.get(link_to=article))
+        self.assertEquals(fresh_correction.pending_links.count(), 0)
+        self.assertFalse(
+                fresh_correction.control_attributes.articles_linkage_is_pending)
+
+    @override_settings(CELERY_EAGER_PROPAGATES_EXCEPTIONS=True, CELERY_ALWAYS_EAGER=True, BROKER_BACKEND='memory')
+    def test_pending_links_to_missing_articles_are_kept(self):
+        correction = models.Article.parse(modelfactories.SAMPLE_XML_RELATED)
+        correction.save()
+        tasks.link_article_with_their_related(correction.pk)
+
+        tasks.process_related_articles()
+
+        fresh_correction = models.Article.objects.get(pk=correction.pk)
+        self.assertEquals(fresh_correction.pending_links.count(), 1)
+        self.assertTrue(
+                fresh_correction.control_attributes.articles_linkage_is_pending)
+
+
 class CreateArticleAssetsFromBytes(TestCase):
 
     def test_asset_is_created(self):
@@ -877,6 +1163,97 @@ class CreateArticleAssetsFromBytes(TestCase):
                     use_license='License text'))
 
 
+class CreateArticleAssetsFromStagingTests(TestCase):
+
+    def setUp(self):
+        self.staging_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+                ASSETS_STAGING_DIR=self.staging_dir)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.staging_dir)
+
+    def _stage(self, filename, content, **meta):
+        staged_asset = {'staged_name': tasks.stage_asset_content(content),
+                        'filename': filename}
+        staged_asset.update(meta)
+        return staged_asset
+
+    def test_content_is_staged(self):
+        staged_name = tasks.stage_asset_content(b'\x04\x00')
+
+        with open(os.path.join(self.staging_dir, staged_name), 'rb') as f:
+            self.assertEquals(f.read(), b'\x04\x00')
+
+    def test_assets_are_created_in_order(self):
+        article = modelfactories.ArticleFactory.create()
+
+        urls = tasks.create_articleassets_from_staging(article.aid, [
+            self._stage('fig1.txt', b'\x01', owner=u'Joe Doe'),
+            self._stage('fig2.txt', b'\x02', use_license=u'License text'),
+        ])
+
+        assets = article.assets.order_by('pk')
+        self.assertEquals(urls, [asset.file.url for asset in assets])
+        self.assertEquals([asset.file.read() for asset in assets],
+                          [b'\x01', b'\x02'])
+        self.assertEquals(assets[0].owner, u'Joe Doe')
+        self.assertEquals(assets[1].use_license, u'License text')
+
+    def test_single_asset_returns_its_url(self):
+        article = modelfactories.ArticleFactory.create()
+
+        url = tasks.create_articleasset_from_staging(article.aid,
+                self._stage('somefile.txt', b'\x04\x00'))
+
+        self.assertEquals(url, article.assets.all()[0].file.url)
+
+    def test_staged_files_are_removed(self):
+        article = modelfactories.ArticleFactory.create()
+
+        tasks.create_articleassets_from_staging(article.aid,
+                [self._stage('somefile.txt', b'\x04\x00')])
+
+        self.assertEquals(os.listdir(self.staging_dir), [])
+
+    def test_unknown_aid_raises_ValueError_and_discards_files(self):
+        staged_assets = [self._stage('somefile.txt', b'\x04\x00')]
+
+        self.assertRaises(ValueError,
+                lambda: tasks.create_articleassets_from_staging('unknown-aid',
+                    staged_assets))
+        self.assertEquals(os.listdir(self.staging_dir), [])
+
+    def test_failures_keep_staged_files_and_remove_stored_files(self):
+        article = modelfactories.ArticleFactory.create()
+        staged_assets = [self._stage('fig1.txt', b'\x01'),
+                         {'staged_name': 'missing', 'filename': 'fig2.txt'}]
+
+        self.assertRaises(IOError,
+                lambda: tasks.create_articleassets_from_staging(article.aid,
+                    staged_assets))
+
+        storage = models.ArticleAsset._meta.get_field('file').storage
+        stored_name = models.make_article_directory_path('assets')(
+                models.ArticleAsset(article=article), 'fig1.txt')
+
+        self.assertFalse(storage.exists(stored_name))
+        self.assertEquals(os.listdir(self.staging_dir),
+                          [staged_assets[0]['staged_name']])
+
+    def test_stale_staged_files_are_removed(self):
+        stale = tasks.stage_asset_content(b'\x01')
+        fresh = tasks.stage_asset_content(b'\x02')
+        mtime = time.time() - tasks.ASSETS_STAGING_MAX_AGE - 1
+        os.utime(os.path.join(self.staging_dir, stale), (mtime, mtime))
+
+        tasks.remove_stale_staged_assets()
+
+        self.assertEquals(os.listdir(self.staging_dir), [fresh])
+
+
 class CreateArticleHTMLRenditionsTests(TestCase):
     def test_htmls_urls_are_returned(self):
         article = modelfactories.ArticleFactory.create()
@@ -899,6 +1276,62 @@ class CreateArticleHTMLRenditionsTests(TestCase):
         for url, lang in urls:
             self.assertTrue(url.endswith(u'-' + lang + u'.html'))
 
+    def test_renditions_are_keyed_by_xml_and_packtools_version(self):
+        import packtools
+        article = modelfactories.ArticleFactory.create()
+        tasks.create_article_html_renditions(article.pk)
+
+        for html in article.htmls.all():
+            self.assertEquals(html.source_hash, article.xml_checksum)
+            self.assertEquals(html.build_version, packtools.__version__)
+
+    def test_up_to_date_renditions_are_skipped(self):
+        article = modelfactories.ArticleFactory.create()
+        first = tasks.create_article_html_renditions(article.pk)
+        updated_at = sorted(h.updated_at for h in article.htmls.all())
+
+        second = tasks.create_article_html_renditions(article.pk)
+
+        self.assertEquals(sorted(first), sorted(second))
+        self.assertEquals(updated_at,
+                sorted(h.updated_at for h in article.htmls.all()))
+
+    def test_outdated_renditions_are_rebuilt(self):
+        article = modelfactories.ArticleFactory.create()
+        tasks.create_article_html_renditions(article.pk)
+        article.htmls.update(build_version=u'0.0')
+
+        result = tasks.create_article_html_renditions(article.pk)
+
+        self.assertEquals(article.htmls.filter(build_version=u'0.0').count(), 0)
+        self.assertEquals(sorted(result),
+                sorted(html.file.url for html in article.htmls.all()))
+
+    def test_renditions_keep_their_filenames_when_rebuilt(self):
+        article = modelfactories.ArticleFactory.create()
+        first = tasks.create_article_html_renditions(article.pk)
+
+        second = tasks.create_article_html_renditions(article.pk, force=True)
+
+        self.assertEquals(sorted(first), sorted(second))
+
+    def test_threaded_rendering_matches_sequential_rendering(self):
+        import packtools
+        article = modelfactories.ArticleFactory.create()
+        xml_string = str(article.xml)
+        generator = packtools.HTMLGenerator.parse(io.BytesIO(xml_string))
+
+        threaded = tasks._render_html_renditions(generator, xml_string)
+
+        original_threads = tasks.HTML_RENDITIONS_THREADS
+        tasks.HTML_RENDITIONS_THREADS = 1
+        try:
+            sequential = tasks._render_html_renditions(generator, xml_string)
+        finally:
+            tasks.HTML_RENDITIONS_THREADS = original_threads
+
+        self.assertEquals(threaded, sequential)
+
 
 class ConvertImageToJpegTests(TestCase):
     def test_convert_gif_image_to_jpeg(self):
@@ -999,3 +1432,69 @@ class CreatePreferredImageFileTests(TestCase):
         self.assertRaises(ValueError,
                 lambda: tasks.create_preferred_image_file(999999))
 
+    def test_derivatives_are_created(self):
+        from PIL import Image
+        asset = modelfactories.ArticleAssetFactory.create()
+        tasks.create_preferred_image_file(asset.pk)
+
+        derivatives = dict((d.name, d) for d in asset.derivatives.all())
+        self.assertEquals(sorted(derivatives.keys()),
+                sorted(tasks.ARTICLE_ASSET_DERIVATIVES.keys()))
+
+        for name, (max_width, max_height) in tasks.ARTICLE_ASSET_DERIVATIVES.items():
+            derivative = derivatives[name]
+            self.assertTrue(derivative.width <= max_width)
+            self.assertTrue(derivative.height <= max_height)
+            self.assertEquals(Image.open(derivative.file.path).size,
+                    (derivative.width, derivative.height))
+
+            # evitar que arquivos temporários sobrem no disco.
+            self.unlink_registry.append(derivative.file.path)
+
+        modified_asset = models.ArticleAsset.objects.get(pk=asset.pk)
+        self.unlink_registry.append(asset.file.path)
+        self.unlink_registry.append(modified_asset.preferred_alt_file.path)
+
+    def test_files_are_replaced_when_recreated(self):
+        asset = modelfactories.ArticleAssetFactory.create()
+        first = tasks.create_preferred_image_file(asset.pk)
+        second = tasks.create_preferred_image_file(asset.pk)
+
+        self.assertEquals(first, second)
+        self.assertEquals(asset.derivatives.count(),
+                len(tasks.ARTICLE_ASSET_DERIVATIVES))
+
+        modified_asset = models.ArticleAsset.objects.get(pk=asset.pk)
+        self.unlink_registry.append(asset.file.path)
+        self.unlink_registry.append(modified_asset.preferred_alt_file.path)
+        self.unlink_registry.extend(d.file.path
+                for d in asset.derivatives.all())
+
+
+class FitSizeTests(TestCase):
+    def test_proportions_are_kept(self):
+        self.assertEquals(tasks._fit_size((2000, 1000), (150, 150)), (150, 75))
+
+    def test_small_images_are_not_enlarged(self):
+        self.assertEquals(tasks._fit_size((100, 50), (150, 150)), (100, 50))
+
+
+class ToResizableModeTests(TestCase):
+    def _resize(self, mode):
+        from PIL import Image
+        image = tasks._to_resizable_mode(Image.new(mode, (20, 10)))
+        return image.resize((10, 5), Image.ANTIALIAS)
+
+    def test_color_modes_are_converted_to_RGB(self):
+        for mode in ('P', 'RGBA', 'CMYK'):
+            self.assertEquals(self._resize(mode).mode, 'RGB')
+
+    def test_grayscale_modes_are_converted_to_L(self):
+        for mode in ('1', 'I', 'I;16', 'F'):
+            self.assertEquals(self._resize(mode).mode, 'L')
+
+    def test_16_bit_images_are_scaled_down(self):
+        from PIL import Image
+        image = tasks._to_resizable_mode(Image.new('I;16', (2, 2), 0xFFFF))
+
+        self.assertEquals(image.getpixel((0, 0)), 255)
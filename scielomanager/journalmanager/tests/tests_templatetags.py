@@ -1,7 +1,12 @@
 from django.test import TestCase
 from django import forms
+from django.core.cache import cache
 from django.template import Template, Context
 
+from django_factory_boy import auth
+from journalmanager import models
+from journalmanager.tests import modelfactories
+
 
 class StampRegularFieldTests(TestCase):
 
@@ -168,3 +173,49 @@ class StampInlineFormsetFieldTests(TestCase):
 
         self.assertIn('<span class="req-field">', out)
 
+
+class UserCollectionsDashboardTests(TestCase):
+
+    def setUp(self):
+        self.timeout = models.USER_COLLECTIONS_DASHBOARD_CACHE_TIMEOUT
+        models.USER_COLLECTIONS_DASHBOARD_CACHE_TIMEOUT = 60
+        cache.clear()
+
+        self.user = auth.UserF(is_active=True)
+        self.collection = modelfactories.CollectionFactory.create(name=u'Brasil')
+        self.collection.add_user(self.user, is_manager=True)
+        self.other_collection = modelfactories.CollectionFactory.create(name=u'Chile')
+        self.other_collection.add_user(self.user)
+
+    def tearDown(self):
+        models.USER_COLLECTIONS_DASHBOARD_CACHE_TIMEOUT = self.timeout
+        cache.clear()
+
+    def _render(self, **context):
+        context['user'] = self.user
+        return Template(
+                "{% load user_collections_dashboard %}"
+                "{% user_collections_dashboard user %}"
+            ).render(Context(context))
+
+    def test_memberships_are_loaded_in_one_query(self):
+        self.assertNumQueries(1, self._render)
+
+    def test_default_and_managed_collections(self):
+        out = self._render()
+
+        self.assertIn('<li id="brasil" class="dropdown active">', out)
+        self.assertIn('<li id="chile" class="dropdown">', out)
+        self.assertIn('<li id="edit-brasil">', out)
+        self.assertIn('<li class="disabled" id="edit-chile">', out)
+
+    def test_fragment_is_cached(self):
+        self._render()
+        self.assertNumQueries(0, self._render)
+
+    def test_cache_is_invalidated_when_memberships_change(self):
+        self._render()
+
+        self.other_collection.make_default_to_user(self.user)
+
+        self.assertIn('<li id="chile" class="dropdown active">', self._render())
@@ -1,4 +1,5 @@
 # coding: utf-8
+import re
 import json
 import urlparse
 from datetime import datetime
@@ -54,6 +55,9 @@ MSG_FORM_SAVED_PARTIALLY = _(u'Saved partially. You can continue to fill in this
 MSG_FORM_MISSING = _(u'There are some errors or missing data.')
 MSG_DELETE_PENDED = _(u'The pended form has been deleted.')
 
+# consultas compostas apenas por partes de um ISSN, e.g. 1234-5 ou 12345678
+ISSN_QUERY_REGEX = re.compile(r'^[\d-]{4,}[xX]?$')
+
 user_request_context = usercontext.get_finder()
 
 
@@ -175,18 +179,16 @@ def journal_index(request):
     """
     Journal list by active collection
     """
-    filters = {}
+    journals = models.Journal.userobjects.active()
 
     if request.GET.get('q'):
-        filters['title__icontains'] = request.GET.get('q')
+        journals = journals.simple_search(request.GET.get('q'))
 
     if request.GET.get('letter'):
-        filters['title__istartswith'] = request.GET.get('letter')
+        journals = journals.startswith(request.GET.get('letter'))
 
     if request.GET.get('jstatus'):
-        filters['membership__status'] = request.GET.get('jstatus')
-
-    journals = models.Journal.userobjects.active().filter(**filters)
+        journals = journals.filter(membership__status=request.GET.get('jstatus'))
 
     objects = get_paginated(journals, request.GET.get('page', 1))
 
@@ -268,15 +270,13 @@ def sponsor_index(request):
     """
     Sponsor list by active collection
     """
-    filters = {}
+    sponsors = models.Sponsor.userobjects.active()
 
     if request.GET.get('q'):
-        filters['name__icontains'] = request.GET.get('q')
+        sponsors = sponsors.simple_search(request.GET.get('q'))
 
     if request.GET.get('letter'):
-        filters['name__istartswith'] = request.GET.get('letter')
-
-    sponsors = models.Sponsor.userobjects.active().filter(**filters)
+        sponsors = sponsors.startswith(request.GET.get('letter'))
 
     objects = get_paginated(sponsors, request.GET.get('page', 1))
 
@@ -1168,11 +1168,12 @@ def ajx_search_journal(request):
 
     if 'q' in request.GET:
         query = request.GET.get('q')
-        journals = models.Journal.objects.filter(Q(title__icontains=query) |
-                                                 Q(short_title__icontains=query) |
-                                                 Q(print_issn__icontains=query) |
-                                                 Q(eletronic_issn__icontains=query) |
-                                                 Q(acronym__icontains=query))
+        if ISSN_QUERY_REGEX.match(query):
+            journals = models.Journal.objects.filter(Q(print_issn__icontains=query) |
+                                                     Q(eletronic_issn__icontains=query))
+        else:
+            # busca entre todos os periódicos, e não apenas nos das coleções do usuário
+            journals = models.Journal.userobjects.get_query_set().simple_search(query)
 
         data = [{'id': journal.id, 'title': journal.title, 'print_issn': journal.print_issn,
                  'eletronic_issn': journal.eletronic_issn, 'short_title': journal.short_title,
@@ -1,12 +1,12 @@
 from django.contrib.auth import logout
-from maintenancewindow import models
+from maintenancewindow import state
 
 
 class MaintenanceMiddleware(object):
 
     def process_request(self, request):
 
-        on_maintenance = models.Event.on_maintenance()
+        on_maintenance = state.get_state().on_maintenance
 
         if on_maintenance and not request.user.is_staff:
             logout(request)
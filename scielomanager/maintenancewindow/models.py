@@ -1,14 +1,21 @@
 from datetime import date
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 
+from . import state
+
 
 class EventManager(models.Manager):
 
-    def scheduled_events(self, actual_date=date.today()):
+    def scheduled_events(self, actual_date=None):
         """
-        Returns a list of scheduled events with the end_date greater than a given date.
+        Returns a list of scheduled events with the end_date greater than a given date,
+        which defaults to the current date.
         """
+        if actual_date is None:
+            actual_date = date.today()
 
         return self.filter(end_at__gte=actual_date, is_finished=False)
 
@@ -24,6 +31,8 @@ class EventManager(models.Manager):
 
     def set_blocking_users_events_to_false(self):
         self.filter(is_blocking_users=True).update(is_blocking_users=False)
+        # `update` does not send signals
+        state.invalidate()
 
 
 class Event(models.Model):
@@ -53,3 +62,13 @@ class Event(models.Model):
         """
 
         return cls.objects.filter(is_blocking_users=True).exists()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_maintenance_state(sender, **kwargs):
+    """
+    Discards the cached maintenance state when an event is changed.
+    """
+    state.invalidate()
+
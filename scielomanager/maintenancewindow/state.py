@@ -0,0 +1,132 @@
+# coding: utf-8
+"""
+Cached state of the maintenance window, i.e. the scheduled events and the
+event blocking users access, shared by the context processors and the
+maintenance middleware.
+
+The state is kept in process and in the shared cache. It is invalidated
+when an `Event` is changed and expires at the next `begin_at`/`end_at`
+boundary of the events, or at midnight, when the scheduled events change.
+"""
+import time
+import datetime
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+STATE_CACHE_KEY = 'maintenancewindow:state'
+GENERATION_CACHE_KEY = 'maintenancewindow:state:generation'
+
+# Seconds during which the in-process state is used without checking
+# whether another process has invalidated it.
+RECHECK_INTERVAL = 10
+
+_lock = threading.Lock()
+_local = {'state': None, 'checked_at': 0}
+
+
+class MaintenanceState(object):
+    """
+    Snapshot of the maintenance window, valid until `expires_at`.
+    """
+    def __init__(self, scheduled_events, blocking_event, expires_at,
+                 generation):
+        self.scheduled_events = scheduled_events
+        self.blocking_event = blocking_event
+        self.expires_at = expires_at
+        self.generation = generation
+
+    @property
+    def on_maintenance(self):
+        return self.blocking_event is not None
+
+    def is_valid(self, generation, now):
+        return self.generation == generation and now < self.expires_at
+
+
+def _next_boundary(events, now):
+    """
+    Returns the first `begin_at`/`end_at` of `events` after `now`, or the
+    next midnight, whichever comes first.
+    """
+    boundary = datetime.datetime.combine(
+        now.date() + datetime.timedelta(days=1), datetime.time())
+    for event in events:
+        for moment in (event.begin_at, event.end_at):
+            if now < moment < boundary:
+                boundary = moment
+
+    return boundary
+
+
+def _get_generation():
+    generation = cache.get(GENERATION_CACHE_KEY)
+    if generation is None:
+        generation = repr(time.time())
+        cache.add(GENERATION_CACHE_KEY, generation)
+        generation = cache.get(GENERATION_CACHE_KEY) or generation
+
+    return generation
+
+
+def _build_state(generation, now):
+    from .models import Event
+
+    scheduled_events = list(Event.objects.scheduled_events(now.date()))
+    # more than one blocking event must not break every page, as `get` would
+    blocking_events = list(Event.objects.filter(
+        is_blocking_users=True).order_by('pk')[:1])
+    blocking_event = blocking_events[0] if blocking_events else None
+
+    events = list(scheduled_events)
+    if blocking_event is not None:
+        events.append(blocking_event)
+
+    return MaintenanceState(scheduled_events, blocking_event,
+                            _next_boundary(events, now), generation)
+
+
+def get_state():
+    """
+    Returns the current `MaintenanceState`. The state is not cached if
+    `settings.MAINTENANCE_STATE_CACHE_TIMEOUT` is 0.
+    """
+    now = datetime.datetime.now()
+
+    cache_timeout = getattr(settings, 'MAINTENANCE_STATE_CACHE_TIMEOUT', 0)
+    if not cache_timeout:
+        return _build_state(None, now)
+
+    with _lock:
+        state = _local['state']
+        if (state is not None and now < state.expires_at and
+                time.time() - _local['checked_at'] < RECHECK_INTERVAL):
+            return state
+
+    generation = _get_generation()
+    if state is None or not state.is_valid(generation, now):
+        state = cache.get(STATE_CACHE_KEY)
+        if state is None or not state.is_valid(generation, now):
+            state = _build_state(generation, now)
+            timeout = int((state.expires_at - now).total_seconds())
+            cache.set(STATE_CACHE_KEY, state,
+                      max(min(timeout, cache_timeout), 1))
+
+    with _lock:
+        _local['state'] = state
+        _local['checked_at'] = time.time()
+
+    return state
+
+
+def invalidate():
+    """
+    Discards the cached state, in this and in the other processes.
+    """
+    cache.set(GENERATION_CACHE_KEY, repr(time.time()))
+    cache.delete(STATE_CACHE_KEY)
+
+    with _lock:
+        _local['state'] = None
@@ -1,4 +1,6 @@
 # coding: utf-8
+import datetime
+
 from django.test import TestCase
 from maintenancewindow import models
 from .modelfactories import (
@@ -43,3 +45,10 @@ class MaintenancewindowTests(TestCase):
         )
 
         self.assertTrue(len(models.Event.objects.scheduled_events(actual_date="2012-11-11")) > 0)
+
+    def test_scheduled_events_defaults_to_the_current_date(self):
+        EventFactory.create(
+            end_at=datetime.datetime.now() + datetime.timedelta(days=1),
+        )
+
+        self.assertEqual(len(models.Event.objects.scheduled_events()), 1)
@@ -0,0 +1,68 @@
+# coding: utf-8
+import datetime
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from maintenancewindow import state
+from .modelfactories import EventFactory
+
+
+@override_settings(MAINTENANCE_STATE_CACHE_TIMEOUT=3600)
+class MaintenanceStateTests(TestCase):
+
+    def setUp(self):
+        state.invalidate()
+
+    def tearDown(self):
+        state.invalidate()
+
+    def test_state_is_cached(self):
+        state.get_state()
+        self.assertNumQueries(0, state.get_state)
+
+    def test_state_is_invalidated_when_events_are_saved(self):
+        self.assertFalse(state.get_state().on_maintenance)
+
+        event = EventFactory.create(is_blocking_users=True)
+
+        self.assertEqual(state.get_state().blocking_event, event)
+
+    def test_state_is_invalidated_when_blocking_events_are_reset(self):
+        EventFactory.create(is_blocking_users=True)
+        self.assertTrue(state.get_state().on_maintenance)
+
+        from maintenancewindow.models import Event
+        Event.objects.set_blocking_users_events_to_false()
+
+        self.assertFalse(state.get_state().on_maintenance)
+
+    def test_many_blocking_events(self):
+        first = EventFactory.create(is_blocking_users=True)
+        EventFactory.create(is_blocking_users=True)
+
+        self.assertEqual(state.get_state().blocking_event, first)
+
+    def test_scheduled_events(self):
+        now = datetime.datetime.now()
+        event = EventFactory.create(begin_at=now,
+                                    end_at=now + datetime.timedelta(hours=1))
+
+        self.assertEqual(state.get_state().scheduled_events, [event])
+
+
+class NextBoundaryTests(TestCase):
+
+    def test_next_midnight_without_events(self):
+        now = datetime.datetime(2014, 5, 10, 14, 30)
+        self.assertEqual(state._next_boundary([], now),
+                         datetime.datetime(2014, 5, 11))
+
+    def test_first_boundary_after_now(self):
+        now = datetime.datetime(2014, 5, 10, 14, 30)
+        event = EventFactory.build(
+            begin_at=datetime.datetime(2014, 5, 10, 14, 0),
+            end_at=datetime.datetime(2014, 5, 10, 16, 0))
+
+        self.assertEqual(state._next_boundary([event], now),
+                         datetime.datetime(2014, 5, 10, 16, 0))
@@ -30,7 +30,7 @@ CELERYBEAT_SCHEDULE = {
         'args': ()
     },
     'process-dirty-articles-daily': {
-        'task': 'journalmanager.tasks.process_dirty_articles',
+        'task': 'journalmanager.tasks.process_dirty_articles_in_bulk',
         'schedule': crontab(minute=0, hour=2),
         'args': ()
     },
@@ -40,6 +40,11 @@ CELERYBEAT_SCHEDULE = {
         'schedule': crontab(minute=0, hour=3),
         'args': ()
     },
+    'remove-stale-staged-assets-daily': {
+        'task': 'journalmanager.tasks.remove_stale_staged_assets',
+        'schedule': crontab(minute=0, hour=4),
+        'args': ()
+    },
 }
 app.conf.update(
     CELERYBEAT_SCHEDULE=CELERYBEAT_SCHEDULE,
@@ -2,8 +2,10 @@
 """
 Interface do connector tipo `Storage`:
     - add(id: str, data: dict)
+    - bulk_add(items: iterable of (str, dict)) -> list
     - get(id: str) -> dict
-    - scan(query: str) -> str
+    - scan(query: str, fields: list, batch_size: int, slice_id: int,
+           max_slices: int) -> str
     - scroll(scroll_id: str) -> (str, list)
 """
 import os
@@ -11,6 +13,7 @@ import logging
 import functools
 
 import elasticsearch
+from elasticsearch import helpers
 
 from .. import tools
 from . import exceptions
@@ -22,7 +25,10 @@ __all__ = ['ArticleElasticsearch']
 LOGGER = logging.getLogger(__name__)
 # Consumo de memória com XML (aprox): ES_RESULTS_PER_SHARD * total_shards * 200KB
 # i.e., 10MB por lote (atualmente com 5 shards).
-ES_RESULTS_PER_SHARD = '10'
+ES_RESULTS_PER_SHARD = 10
+# Limite do tamanho do lote escolhido pelo cliente. Lotes que contém o campo
+# `source` devem ser consideravelmente menores.
+ES_SCAN_MAX_BATCH_SIZE = 1000
 ES_SCROLL_TIMEOUT = '30s'
 ES_NODES = tools.get_setting_or_raise('ELASTICSEARCH_NODES')
 ES_ARTICLE_INDEX_NAME = tools.get_setting_or_raise('ES_ARTICLE_INDEX_NAME')
@@ -98,20 +104,101 @@ class _Elasticsearch(object):
         _ = self.es_client.index(index=self.index, doc_type=self.doctype,
                 id=id, body=data)
 
+    @translate_exceptions
+    def bulk_add(self, items, chunk_size=500):
+        """Armazena, por meio da API *bulk*, os pares `(id, data)` de `items`.
+
+        Retorna a lista dos identificadores armazenados com sucesso. Falhas
+        individuais são registradas no log e não interrompem o lote.
+
+        :param items: iterável de pares `(id, data)`.
+        :param chunk_size: (opcional) quantidade de registros por requisição.
+        """
+        actions = ({'_index': self.index, '_type': self.doctype, '_id': id,
+                    '_source': data} for id, data in items)
+
+        succeeded = []
+        for ok, result in helpers.streaming_bulk(self.es_client, actions,
+                chunk_size=chunk_size, raise_on_error=False):
+            op_result = result.get('index', {})
+            if ok:
+                succeeded.append(op_result.get('_id'))
+            else:
+                LOGGER.error('Cannot index record "%s". The error message '
+                        'is: "%s"', op_result.get('_id'), op_result.get('error'))
+
+        return succeeded
+
     def get(self, id):
         return NotImplemented
 
+    def _get_number_of_shards(self):
+        """Obtém a quantidade de shards primários do índice `self.index`.
+        """
+        if not hasattr(self, '_number_of_shards'):
+            resp = self.es_client.indices.get_settings(index=self.index)
+            index_settings = resp[self.index]['settings']
+            try:
+                total = index_settings['index']['number_of_shards']
+            except KeyError:
+                total = index_settings['index.number_of_shards']
+
+            self._number_of_shards = int(total)
+
+        return self._number_of_shards
+
     @translate_exceptions
-    def scan(self, query):
+    def scan(self, query, fields=None, batch_size=None, slice_id=None,
+            max_slices=None):
         """Consulta expressão definida por `query`.
 
         Esse método é otimizado para a recuperação de grandes quantidades de
         dados, portanto: 1) a ordenação dos resultados por relevância é
         desabilitada e 2) os resultados devem ser recuperados por lotes.
+
+        A consulta pode ser particionada em até `total de shards` fatias
+        disjuntas, que podem ser percorridas concorrentemente. Cada fatia
+        corresponde a um subconjunto dos shards do índice.
+
+        :param fields: (opcional) lista dos campos que devem ser retornados.
+        :param batch_size: (opcional) quantidade aproximada de resultados por
+                           lote, limitada a `ES_SCAN_MAX_BATCH_SIZE`.
+        :param slice_id: (opcional) índice, a partir de 0, da fatia.
+        :param max_slices: (opcional) quantidade total de fatias.
         """
+        params = {}
+        total_shards = None
+
+        if max_slices is not None or slice_id is not None:
+            total_shards = self._get_number_of_shards()
+            if (max_slices is None or slice_id is None or
+                    not 0 < max_slices <= total_shards or
+                    not 0 <= slice_id < max_slices):
+                raise exceptions.BadRequestError(
+                        'slice_id must be in [0, max_slices) and max_slices '
+                        'in [1, %s]' % total_shards)
+
+            shards = [str(shard) for shard in range(total_shards)
+                      if shard % max_slices == slice_id]
+            params['preference'] = '_shards:' + ','.join(shards)
+            total_shards = len(shards)
+
+        if fields:
+            params['_source_include'] = ','.join(fields)
+
+        if batch_size:
+            if total_shards is None:
+                total_shards = self._get_number_of_shards()
+
+            # em buscas do tipo `scan` o tamanho do lote é definido por shard
+            batch_size = min(batch_size, ES_SCAN_MAX_BATCH_SIZE)
+            results_per_shard = max(1, -(-batch_size // total_shards))
+        else:
+            results_per_shard = ES_RESULTS_PER_SHARD
+
         resp = self.es_client.search(body=query, scroll=ES_SCROLL_TIMEOUT,
                 search_type='scan', index=self.index, doc_type=self.doctype,
-                size=ES_RESULTS_PER_SHARD)
+                size=results_per_shard, **params)
 
         return resp.get('_scroll_id')
 
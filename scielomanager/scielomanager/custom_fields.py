@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import io
 
+from django.core import exceptions
 from django.db import models
 from django.db.models.fields import TextField
 from django.forms import forms
@@ -55,6 +56,17 @@ class ContentTypeRestrictedFileField(models.FileField):
 
 
 class XMLSPS(object):
+    """Documento XML SPS.
+
+    A árvore lxml é produzida apenas no primeiro acesso, de maneira que
+    instâncias carregadas do banco de dados e nunca consultadas não pagam
+    pelo parsing. A serialização é sempre produzida a partir da árvore, da
+    mesma maneira, e é mantida em cache até que a árvore seja obtida para
+    modificação, por meio de `mutable_root_etree`.
+    """
+    # atributos próprios, que não devem ser delegados à árvore.
+    _own_attrs = frozenset(['_raw_string', '_xml_string', '_root_etree'])
+
     def __init__(self, data):
         if isinstance(data, str):
             xml_string = data
@@ -63,20 +75,48 @@ class XMLSPS(object):
         else:
             raise TypeError('xml must be str or unicode')
 
-        self.root_etree = etree.parse(io.BytesIO(xml_string))
+        self._raw_string = xml_string
+        self._xml_string = None
+        self._root_etree = None
+
+    @property
+    def root_etree(self):
+        """Árvore lxml do documento, para leitura.
+        """
+        if self._root_etree is None:
+            self._root_etree = etree.parse(io.BytesIO(self._raw_string))
+            self._raw_string = None
+
+        return self._root_etree
+
+    @property
+    def mutable_root_etree(self):
+        """Árvore lxml do documento, para modificação. A serialização em
+        cache é descartada, e portanto a árvore deve ser obtida novamente
+        por meio deste atributo após cada serialização.
+        """
+        root_etree = self.root_etree
+        self._xml_string = None
+        return root_etree
 
     def __repr__(self):
         return u'<%s xml_etree=%s>' % (self.__class__.__name__,
-                repr(self.root_etree))
+                repr(self._root_etree))
 
     def __unicode__(self):
         return str(self).decode('utf-8')
 
     def __str__(self):
-        return etree.tostring(self.root_etree, encoding=u'utf-8',
-                xml_declaration=True)
+        if self._xml_string is None:
+            self._xml_string = etree.tostring(self.root_etree,
+                    encoding=u'utf-8', xml_declaration=True)
+
+        return self._xml_string
 
     def __getattr__(self, name):
+        if name in self._own_attrs:
+            raise AttributeError(name)
+
         return getattr(self.root_etree, name)
 
 
@@ -93,8 +133,20 @@ class XMLSPSField(TextField):
 
         return XMLSPS(value)
 
+    def validate(self, value, model_instance):
+        super(XMLSPSField, self).validate(value, model_instance)
+
+        if value is not None:
+            try:
+                self.to_python(value).root_etree
+            except etree.XMLSyntaxError as exc:
+                raise exceptions.ValidationError(
+                        _('Invalid XML: %s') % unicode(exc))
+
     def get_prep_value(self, value):
-        return str(value)
+        # a serialização exige o parsing, e portanto documentos mal formados
+        # levantam `etree.XMLSyntaxError` e não são persistidos.
+        return str(self.to_python(value))
 
 
 from south.modelsinspector import add_introspection_rules
@@ -14,7 +14,8 @@ Executa tarefas de manutenção da integração com o Elasticsearch.
 Os comandos são:
     createindex    Cria o índice e define o mapping.
     deleteindex    Remove o índice.
-    reindex        Reindexa todos os artigos.
+    reindex        Reindexa todos os artigos, em lotes. Aceita como argumento
+                   opcional a quantidade de artigos por lote.
 """
 
 
@@ -32,9 +33,9 @@ def _delete_index():
     client.delete_index()
 
 
-def _reindex_articles():
+def _reindex_articles(chunk_size=None):
     tasks.mark_articles_as_dirty()
-    tasks.process_dirty_articles.delay()
+    tasks.process_dirty_articles_in_bulk.delay(chunk_size=chunk_size)
 
 
 class Command(BaseCommand):
@@ -55,7 +56,13 @@ class Command(BaseCommand):
             elif command == 'deleteindex':
                 _delete_index()
             elif command == 'reindex':
-                _reindex_articles()
+                try:
+                    chunk_size = int(args[1]) if len(args) > 1 else None
+                except ValueError:
+                    raise CommandError(
+                            _to_bytestring(u'Tamanho de lote inválido'))
+
+                _reindex_articles(chunk_size=chunk_size)
             else:
                 raise CommandError(
                         _to_bytestring(u'Comando inválido'))
@@ -172,6 +172,7 @@ INSTALLED_APPS = (
     'export',
     'health',
     'thrift',
+    'api',
     'scielomanager',  # apenas para management commands
 )
 
@@ -320,6 +321,28 @@ if 'thrift' in INSTALLED_APPS:
     THRIFT_CONFIG = {
         'HOST': '0.0.0.0',
         'PORT': '6000',
+        # `threaded`: um processo com WORKERS threads.
+        # `prefork`: WORKERS processos, cada um com THREADS threads.
+        'MODE': 'threaded',
+        'WORKERS': 8,
+        'THREADS': 4,
+        # tempo máximo, em segundos, de espera pelas chamadas em andamento
+        # durante o encerramento do servidor.
+        'DRAIN_TIMEOUT': 30,
+        # tempo máximo, em segundos, de reutilização das conexões com o BD.
+        'CONN_MAX_AGE': 600,
+        # tempo máximo, em segundos, de ociosidade das conexões com o BD antes
+        # que a sua disponibilidade seja verificada.
+        'CONN_HEALTH_CHECK_INTERVAL': 30,
+        # cache dos resultados de getJournal, getIssue e getCollection:
+        # quantidade de structs no cache local, tempo de vida (em segundos) e
+        # alias, em `CACHES`, do cache compartilhado (None desabilita). O
+        # cache compartilhado é necessário para que alterações nos membros do
+        # corpo editorial, realizadas pela aplicação web, sejam percebidas
+        # antes de CACHE_TIMEOUT.
+        'CACHE_MAX_ENTRIES': 10000,
+        'CACHE_TIMEOUT': 300,
+        'CACHE_ALIAS': None,
     }
 
 
@@ -341,6 +364,7 @@ ELASTICSEARCH_NODES = (
 
 ES_ARTICLE_INDEX_NAME = 'icatman'
 ES_ARTICLE_DOC_TYPE = 'article'
+ES_BULK_CHUNK_SIZE = 500  # artigos por lote na indexação em massa
 
 # URL wayta
 WAYTA_URL = "http://wayta.scielo.org"
@@ -352,6 +376,40 @@ CHECKIN_EXPIRATION_TIME_SPAN = 7  # days
 # Liga e desliga de funcionalidades da app ``validator``
 VALIDATOR_ENABLE_HTML_PREVIEWER = True
 
+# Tempo de vida (em segundos) das respostas da API armazenadas em cache. O
+# valor 0 desabilita o cache. Em produção, configure em `CACHES` um backend
+# compartilhado entre os processos, como o memcached.
+API_CACHE_TIMEOUT = 60 * 60
+
+# Tempo de vida (em segundos) do grid de fascículos dos periódicos armazenado
+# em cache (ver `Journal.issues_as_grid`).
+ISSUES_GRID_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Tempo de vida (em segundos) do menu de coleções dos usuários armazenado em
+# cache (ver `user_collections_dashboard`). O valor 0 desabilita o cache.
+USER_COLLECTIONS_DASHBOARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Tempo máximo de vida (em segundos) do estado da janela de manutenção
+# armazenado em cache (ver `maintenancewindow.state`). O valor 0 desabilita o
+# cache.
+MAINTENANCE_STATE_CACHE_TIMEOUT = 60 * 60
+
+# Quantidade máxima de idiomas de um artigo cujos documentos HTML são
+# produzidos simultaneamente.
+HTML_RENDITIONS_THREADS = 4
+
+# Tempo (em segundos) após o qual os arquivos não processados do diretório de
+# staging dos ativos digitais são removidos (ver
+# `journalmanager.tasks.remove_stale_staged_assets`).
+ASSETS_STAGING_MAX_AGE = 60 * 60 * 24
+
+# Versões reduzidas, em JPEG, produzidas a partir das imagens TIFF dos artigos,
+# na forma {nome: (largura máxima, altura máxima)}.
+ARTICLE_ASSET_DERIVATIVES = {
+    'thumbnail': (150, 150),
+    'web': (1024, 1024),
+}
+
 # ## END App customization settings
 #################################################################
 # Local deployment settings: there *must* be an unversioned
@@ -9,12 +9,11 @@ PROJECT_PATH = os.path.abspath(os.path.dirname(__file__))
 execfile(os.path.join(PROJECT_PATH, 'settings.py'))
 
 
-INSTALLED_APPS += (
-    'api',
-)
-
 ALLOWED_HOSTS = ['*']
 API_BALAIO_DEFAULT_TIMEOUT = 0  # in seconds
+API_CACHE_TIMEOUT = 0  # cache das respostas da API desabilitado
+MAINTENANCE_STATE_CACHE_TIMEOUT = 0  # cache da janela de manutenção desabilitado
+USER_COLLECTIONS_DASHBOARD_CACHE_TIMEOUT = 0  # cache do menu de coleções desabilitado
 
 JOURNAL_COVER_MAX_SIZE = 30 * 1024
 JOURNAL_LOGO_MAX_SIZE = 13 * 1024
@@ -10,3 +10,80 @@ class ElasticsearchTests(MockerTestCase):
         self.assertEqual(ArticleElasticsearch().es_client,
                          ArticleElasticsearch().es_client)
 
+
+
+class IndicesClientStub(object):
+    def __init__(self, number_of_shards):
+        self.number_of_shards = number_of_shards
+
+    def get_settings(self, index):
+        return {index: {'settings': {'index': {
+            'number_of_shards': str(self.number_of_shards)}}}}
+
+
+class ElasticsearchClientStub(object):
+    def __init__(self, number_of_shards=5):
+        self.indices = IndicesClientStub(number_of_shards)
+        self.search_kwargs = None
+
+    def search(self, **kwargs):
+        self.search_kwargs = kwargs
+        return {'_scroll_id': 'scroll-id'}
+
+
+class ElasticsearchScanTests(MockerTestCase):
+
+    def _make_client(self, number_of_shards=5):
+        from scielomanager.connectors.storage import _Elasticsearch
+        es_client = ElasticsearchClientStub(number_of_shards)
+        return _Elasticsearch(es_client, 'index', 'doctype'), es_client
+
+    def test_defaults(self):
+        client, es_client = self._make_client()
+
+        self.assertEqual(client.scan('{}'), 'scroll-id')
+        self.assertEqual(es_client.search_kwargs['size'], 10)
+        self.assertEqual(es_client.search_kwargs['search_type'], 'scan')
+        self.assertNotIn('preference', es_client.search_kwargs)
+        self.assertNotIn('_source_include', es_client.search_kwargs)
+
+    def test_fields_projection(self):
+        client, es_client = self._make_client()
+
+        client.scan('{}', fields=['aid', 'doi'])
+        self.assertEqual(es_client.search_kwargs['_source_include'], 'aid,doi')
+
+    def test_batch_size_is_split_among_shards(self):
+        client, es_client = self._make_client(number_of_shards=5)
+
+        client.scan('{}', batch_size=100)
+        self.assertEqual(es_client.search_kwargs['size'], 20)
+
+    def test_batch_size_is_capped(self):
+        from scielomanager.connectors.storage import ES_SCAN_MAX_BATCH_SIZE
+        client, es_client = self._make_client(number_of_shards=1)
+
+        client.scan('{}', batch_size=ES_SCAN_MAX_BATCH_SIZE * 10)
+        self.assertEqual(es_client.search_kwargs['size'],
+                         ES_SCAN_MAX_BATCH_SIZE)
+
+    def test_slices_are_disjoint_sets_of_shards(self):
+        client, es_client = self._make_client(number_of_shards=5)
+
+        preferences = []
+        for slice_id in range(2):
+            client.scan('{}', batch_size=100, slice_id=slice_id, max_slices=2)
+            preferences.append(es_client.search_kwargs['preference'])
+
+        self.assertEqual(preferences, ['_shards:0,2,4', '_shards:1,3'])
+        # o tamanho do lote é dividido entre os shards da fatia
+        self.assertEqual(es_client.search_kwargs['size'], 50)
+
+    def test_invalid_slices_raise_BadRequestError(self):
+        from scielomanager.connectors import exceptions
+        client, es_client = self._make_client(number_of_shards=5)
+
+        for slice_id, max_slices in [(0, 6), (2, 2), (-1, 2), (0, 0),
+                                     (None, 2), (0, None)]:
+            self.assertRaises(exceptions.BadRequestError, client.scan, '{}',
+                    slice_id=slice_id, max_slices=max_slices)
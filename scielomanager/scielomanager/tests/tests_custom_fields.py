@@ -0,0 +1,74 @@
+# coding: utf-8
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from lxml import etree
+
+from scielomanager.custom_fields import XMLSPS, XMLSPSField
+
+
+SAMPLE = u'<article article-type="research-article"><front/></article>'
+
+
+class XMLSPSTests(TestCase):
+
+    def test_tree_is_not_parsed_on_init(self):
+        xml = XMLSPS(SAMPLE)
+        self.assertIsNone(xml._root_etree)
+
+    def test_tree_is_parsed_on_first_access(self):
+        xml = XMLSPS(SAMPLE)
+        self.assertEquals(xml.xpath('/article/@article-type'),
+                ['research-article'])
+        self.assertIsNotNone(xml._root_etree)
+
+    def test_serialization_is_normalized(self):
+        xml = XMLSPS(SAMPLE)
+        serialized = str(xml)
+
+        self.assertTrue(serialized.startswith("<?xml version='1.0' encoding='utf-8'?>"))
+        self.assertEquals(str(XMLSPS(serialized)), serialized)
+
+    def test_serialization_is_stable_across_reads(self):
+        xml = XMLSPS(SAMPLE)
+        before = str(xml)
+        xml.getroot()
+        xml.root_etree
+
+        self.assertIs(str(xml), before)
+
+    def test_serialization_reflects_mutations(self):
+        xml = XMLSPS(SAMPLE)
+        str(xml)
+        xml.mutable_root_etree.getroot().set('article-type', 'correction')
+
+        self.assertIn('article-type="correction"', str(xml))
+
+    def test_serialization_is_cached(self):
+        xml = XMLSPS(SAMPLE)
+        xml.getroot()
+
+        self.assertIs(str(xml), str(xml))
+
+    def test_invalid_types_raise_TypeError(self):
+        self.assertRaises(TypeError, lambda: XMLSPS(1))
+
+    def test_syntax_errors_are_raised_on_first_access(self):
+        xml = XMLSPS(u'<article></articlezzz>')
+        self.assertRaises(etree.XMLSyntaxError, lambda: xml.getroot())
+
+
+class XMLSPSFieldTests(TestCase):
+
+    def test_malformed_xml_is_not_prepared_for_storage(self):
+        field = XMLSPSField()
+        self.assertRaises(etree.XMLSyntaxError,
+                lambda: field.get_prep_value(u'<article></articlezzz>'))
+
+    def test_malformed_xml_does_not_validate(self):
+        field = XMLSPSField()
+        self.assertRaises(ValidationError,
+                lambda: field.validate(XMLSPS(u'<article></articlezzz>'), None))
+
+    def test_prepared_value_is_normalized(self):
+        field = XMLSPSField()
+        self.assertEquals(field.get_prep_value(SAMPLE), str(XMLSPS(SAMPLE)))
@@ -0,0 +1,39 @@
+# coding: utf-8
+import threading
+
+from django.test import TestCase
+from lxml import isoschematron
+
+from journalmanager.tasks import BASIC_ARTICLE_META_PATH
+from scielomanager.utils.schematron import get_schematron
+
+
+class GetSchematronTests(TestCase):
+
+    def test_instances_are_reused_by_the_same_thread(self):
+        self.assertIs(get_schematron(BASIC_ARTICLE_META_PATH),
+                get_schematron(BASIC_ARTICLE_META_PATH))
+
+    def test_instances_are_not_shared_between_threads(self):
+        instances = []
+
+        def _target():
+            instances.append(get_schematron(BASIC_ARTICLE_META_PATH))
+
+        thread = threading.Thread(target=_target)
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(instances[0], get_schematron(BASIC_ARTICLE_META_PATH))
+
+    def test_factory_is_used_only_once(self):
+        calls = []
+
+        def _factory(path):
+            calls.append(path)
+            return isoschematron.Schematron(file=BASIC_ARTICLE_META_PATH)
+
+        for _ in range(2):
+            get_schematron('factory-test.sch', factory=_factory)
+
+        self.assertEquals(len(calls), 1)
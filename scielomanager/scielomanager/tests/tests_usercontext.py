@@ -0,0 +1,59 @@
+from django.test import TestCase
+from django.test.client import RequestFactory
+
+from django_factory_boy import auth
+from journalmanager.tests import modelfactories
+from scielomanager.utils import usercontext
+from scielomanager.utils.middlewares import threadlocal
+
+
+class UserRequestContextFinderTests(TestCase):
+
+    def setUp(self):
+        self.user = auth.UserF(is_active=True)
+        self.collection = modelfactories.CollectionFactory.create()
+        self.collection.add_user(self.user, is_manager=True)
+        self.other_collection = modelfactories.CollectionFactory.create()
+        self.other_collection.add_user(self.user)
+
+        self.middleware = threadlocal.ThreadLocalMiddleware()
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.middleware.process_request(self.request)
+
+        self.finder = usercontext.UserRequestContextFinder()
+
+    def tearDown(self):
+        self.middleware.process_response(self.request, None)
+
+    def test_active_collection(self):
+        self.assertEqual(self.finder.get_current_user_active_collection(),
+                         self.collection)
+
+    def test_managed_collections(self):
+        self.assertEqual(self.finder.get_current_user_managed_collections(),
+                         frozenset([self.collection.pk]))
+
+    def test_context_is_resolved_once_per_request(self):
+        self.assertNumQueries(1, self.finder.get_current_user_active_collection)
+        self.assertNumQueries(0, self.finder.get_current_user_active_collection)
+        self.assertNumQueries(0, self.finder.get_current_user_managed_collections)
+
+        self.assertNumQueries(1, list, self.finder.get_current_user_collections())
+        self.assertNumQueries(0, list, self.finder.get_current_user_collections())
+
+    def test_context_is_not_shared_between_requests(self):
+        self.finder.get_current_user_active_collection()
+
+        self.middleware.process_response(self.request, None)
+        self.middleware.process_request(self.request)
+
+        self.assertNumQueries(1, self.finder.get_current_user_active_collection)
+
+    def test_context_is_cleared_when_memberships_change(self):
+        self.finder.get_current_user_active_collection()
+
+        self.other_collection.make_default_to_user(self.user)
+
+        self.assertEqual(self.finder.get_current_user_active_collection(),
+                         self.other_collection)
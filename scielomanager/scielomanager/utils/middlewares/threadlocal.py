@@ -3,8 +3,8 @@ import threading
 
 #
 # Hey, make sure you are not messing with
-# `_request` attribute of the threadlocal
-# scope!
+# `_request` and `_storage` attributes of
+# the threadlocal scope!
 #
 th_localstore = threading.local()
 
@@ -16,13 +16,16 @@ class ThreadLocalMiddleware(object):
     """
     def process_request(self, request):
         th_localstore._request = request
+        th_localstore._storage = {}
 
     def process_response(self, request, response):
         th_localstore._request = None
+        th_localstore._storage = None
         return response
 
     def process_exception(self, request, exception):
         th_localstore._request = None
+        th_localstore._storage = None
 
 
 def get_current_request():
@@ -32,6 +35,18 @@ def get_current_request():
     return getattr(th_localstore, '_request', None)
 
 
+def get_request_storage():
+    """
+    Get a dict bound to the current request, used to memoize
+    data that is valid during the whole request-response cycle.
+    Returns ``None`` if there is no current request.
+    """
+    if get_current_request() is None:
+        return None
+
+    return getattr(th_localstore, '_storage', None)
+
+
 def get_current_user():
     """
     Get a reference to the current user. This is a shortcut
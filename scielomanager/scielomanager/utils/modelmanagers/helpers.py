@@ -27,6 +27,10 @@ def _makeUserRequestContext(user):
             if colls:
                 return colls.get(usercollections__is_default=True)
 
+        def get_current_user_managed_collections(self):
+            return frozenset(self.get_current_user_collections().filter(
+                usercollections__is_manager=True).values_list('pk', flat=True))
+
     return UserRequestContextTestFinder
 
 
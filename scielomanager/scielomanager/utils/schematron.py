@@ -0,0 +1,39 @@
+# coding: utf-8
+"""Cache de validadores Schematron.
+
+Instâncias de `lxml.isoschematron.Schematron` não são thread-safe, e
+copiá-las por meio de `copy.deepcopy` implica em copiar também o XSLT
+compilado. Por isso cada thread mantém suas próprias instâncias, compiladas
+uma única vez e indexadas pelo caminho do schema.
+"""
+import threading
+
+from lxml import isoschematron
+
+
+_local = threading.local()
+
+
+def _schematron_from_filepath(path):
+    return isoschematron.Schematron(file=path)
+
+
+def get_schematron(path, factory=_schematron_from_filepath):
+    """ Retorna a instância de `isoschematron.Schematron` do schema em `path`
+    pertencente à thread corrente.
+
+    :param path: caminho para o arquivo do schema.
+    :param factory: (opcional) função que recebe `path` e retorna a instância
+                    de `isoschematron.Schematron`, executada apenas quando não
+                    há instância em cache.
+    """
+    try:
+        cache = _local.schematrons
+    except AttributeError:
+        cache = _local.schematrons = {}
+
+    try:
+        return cache[path]
+    except KeyError:
+        schematron = cache[path] = factory(path)
+        return schematron
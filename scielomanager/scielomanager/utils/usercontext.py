@@ -9,6 +9,98 @@ from django.utils.datastructures import SortedDict
 
 _finders = SortedDict()
 
+USER_CONTEXT_KEY = 'usercontext'
+
+
+class UserContext(object):
+    """
+    The collections the user is part of, resolved lazily and at most
+    once per instance.
+    """
+    def __init__(self, user):
+        self.user = user
+        self._collections = None
+        self._memberships = None
+
+    @property
+    def collections(self):
+        """
+        Queryset of all collections the user is part. The same instance
+        is returned on each access, so that its results are fetched once.
+        """
+        if self._collections is None:
+            self._collections = self.user.user_collection.all()
+
+        return self._collections
+
+    @property
+    def memberships(self):
+        """
+        List of `UserCollections` of the user, with their collections.
+        """
+        if self._memberships is None:
+            self._memberships = list(
+                self.user.usercollections_set.select_related('collection'))
+
+        return self._memberships
+
+    @property
+    def active_collection(self):
+        """
+        The default collection of the user.
+        """
+        if not self.memberships:
+            raise RuntimeError('The current request doesnt have usercontext')
+
+        defaults = [uc.collection for uc in self.memberships if uc.is_default]
+        model = self.collections.model
+        if not defaults:
+            raise model.DoesNotExist(
+                '%s matching query does not exist.' % model._meta.object_name)
+        elif len(defaults) > 1:
+            raise model.MultipleObjectsReturned(
+                'get() returned more than one %s' % model._meta.object_name)
+
+        return defaults[0]
+
+    @property
+    def managed_collections(self):
+        """
+        Set of the primary keys of the collections managed by the user.
+        """
+        return frozenset(uc.collection_id for uc in self.memberships
+                         if uc.is_manager)
+
+
+def get_user_context(user):
+    """
+    Returns the `UserContext` of `user`, memoized during the
+    current request.
+    """
+    storage = threadlocal.get_request_storage()
+    if storage is None:
+        return UserContext(user)
+
+    key = (USER_CONTEXT_KEY, user.pk)
+    if key not in storage:
+        storage[key] = UserContext(user)
+
+    return storage[key]
+
+
+def clear_user_context():
+    """
+    Discards the memoized user contexts of the current request. Must be
+    called when the relationship between users and collections changes.
+    """
+    storage = threadlocal.get_request_storage()
+    if storage is None:
+        return
+
+    for key in storage.keys():
+        if key[0] == USER_CONTEXT_KEY:
+            del storage[key]
+
 
 class UserRequestContextFinder(object):
     """
@@ -18,25 +110,34 @@ class UserRequestContextFinder(object):
     Instances of this class should provide data necessary
     for the context to be built.
     """
-    def get_current_user_collections(self):
+    def get_current_user_context(self):
         """
-        Returns a queryset of all collections the current user is part.
+        Returns the `UserContext` of the current user.
         """
         user = threadlocal.get_current_user()
         if user:
-            return user.user_collection.all()
+            return get_user_context(user)
         else:
             raise RuntimeError('The current request doesnt have usercontext')
 
+    def get_current_user_collections(self):
+        """
+        Returns a queryset of all collections the current user is part.
+        """
+        return self.get_current_user_context().collections
+
     def get_current_user_active_collection(self):
         """
         Returns the active collection of the current user.
         """
-        colls = self.get_current_user_collections()
-        if colls:
-            return colls.get(usercollections__is_default=True)
-        else:
-            raise RuntimeError('The current request doesnt have usercontext')
+        return self.get_current_user_context().active_collection
+
+    def get_current_user_managed_collections(self):
+        """
+        Returns the set of primary keys of the collections
+        managed by the current user.
+        """
+        return self.get_current_user_context().managed_collections
 
 
 def get_finder():
@@ -2,23 +2,44 @@
 from optparse import make_option
 
 from thriftpywrap import make_server, _PROTO_FACTORY, _TRANS_FACTORY
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 
 from thrift import spec
 from thrift.server import RPCHandler
+from thrift.workers import ThreadPoolServer, serve_prefork
+
+
+THRIFT_CONFIG = getattr(settings, 'THRIFT_CONFIG', {})
+MODES = ('threaded', 'prefork')
 
 
 class Command(BaseCommand):
+    help = ('Starts the Thrift RPC server. In `threaded` mode, --workers is '
+            'the number of threads; in `prefork` mode, it is the number of '
+            'processes, each one with --threads threads.')
     option_list = BaseCommand.option_list + (
         make_option('--fd', action='store', type=int, dest='fd'),
         make_option('--host', action='store', type=str, dest='host'),
         make_option('--port', action='store', type=int, dest='port'),
+        make_option('--mode', action='store', type='choice', choices=MODES,
+            dest='mode', default=THRIFT_CONFIG.get('MODE', 'threaded')),
+        make_option('--workers', action='store', type=int, dest='workers',
+            default=THRIFT_CONFIG.get('WORKERS', 8)),
+        make_option('--threads', action='store', type=int, dest='threads',
+            default=THRIFT_CONFIG.get('THREADS', 4)),
+        make_option('--drain-timeout', action='store', type=int,
+            dest='drain_timeout',
+            default=THRIFT_CONFIG.get('DRAIN_TIMEOUT', 30)),
     )
 
     def handle(self, *args, **kwargs):
         if kwargs.get('fd') and kwargs.get('host'):
             raise ValueError('--fd and --host are mutually exclusive')
 
+        if kwargs['workers'] < 1 or kwargs['threads'] < 1:
+            raise CommandError('--workers and --threads must be positive')
+
         server = make_server(spec.JournalManagerServices,
                              RPCHandler(),
                              fd=kwargs['fd'],
@@ -27,8 +48,19 @@ class Command(BaseCommand):
                              proto_factory=_PROTO_FACTORY(),
                              trans_factory=_TRANS_FACTORY())
 
+        if kwargs['mode'] == 'prefork':
+            threads = kwargs['threads']
+        else:
+            threads = kwargs['workers']
+
+        server = ThreadPoolServer.from_server(server, threads=threads,
+                drain_timeout=kwargs['drain_timeout'])
+
         try:
-            server.serve()
+            if kwargs['mode'] == 'prefork':
+                serve_prefork(server, processes=kwargs['workers'])
+            else:
+                server.install_signal_handlers()
+                server.serve()
         finally:
             server.trans.close()
-
@@ -0,0 +1,200 @@
+# coding: utf-8
+"""
+Cache dos resultados das funções de leitura da interface RPC.
+
+Os structs são armazenados em um cache LRU local ao processo e,
+opcionalmente, em um cache compartilhado entre processos (ver
+`THRIFT_CONFIG['CACHE_ALIAS']`), indexados por (entidade, pk, collection_id).
+
+Cada struct é acompanhado da geração do cache em que foi produzido. A geração
+é renovada pelos signals `post_save`, `post_delete` e `m2m_changed` dos modelos
+serializados nos structs (`INVALIDATING_MODELS`), e pelo signal
+`journalmanager.models.bulk_updated`, enviado após as alterações em lote.
+Artigos são serializados apenas como parte dos seus fascículos, de maneira que
+a criação de artigos ainda não associados a fascículos não renova a geração.
+
+A geração é local ao processo a menos que o cache compartilhado seja
+configurado. Sem ele, as alterações realizadas por outros processos são
+percebidas apenas após `CACHE_TIMEOUT`.
+"""
+import time
+import threading
+import collections
+
+from django.conf import settings
+from django.core.cache import get_cache
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from thriftpy.utils import serialize, deserialize
+
+from journalmanager import models
+from editorialmanager import models as em_models
+
+
+THRIFT_CONFIG = getattr(settings, 'THRIFT_CONFIG', {})
+CACHE_ALIAS = THRIFT_CONFIG.get('CACHE_ALIAS')
+CACHE_MAX_ENTRIES = THRIFT_CONFIG.get('CACHE_MAX_ENTRIES', 10000)
+CACHE_TIMEOUT = THRIFT_CONFIG.get('CACHE_TIMEOUT', 300)
+
+GENERATION_KEY = 'thrift:generation'
+GENERATION_TIMEOUT = 60 * 60 * 24 * 30
+
+# modelos serializados, diretamente ou por meio de relações, pelos structs
+# produzidos por `getJournal`, `getIssue` e `getCollection`.
+INVALIDATING_MODELS = (
+    models.Collection,
+    models.Membership,
+    models.Journal,
+    models.JournalMission,
+    models.JournalTimeline,
+    models.Language,
+    models.StudyArea,
+    models.SubjectCategory,
+    models.UseLicense,
+    models.Issue,
+    models.IssueTitle,
+    em_models.EditorialBoard,
+    em_models.EditorialMember,
+    em_models.RoleType,
+)
+
+
+class LRUCache(object):
+    """Cache LRU, thread-safe, com tempo de expiração das entradas.
+    """
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                expires_at, value = self._data.pop(key)
+            except KeyError:
+                return None
+
+            if expires_at < time.time():
+                return None
+
+            self._data[key] = (expires_at, value)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.time() + self.timeout, value)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ResultCache(object):
+    """Cache de structs em dois níveis: local ao processo e compartilhado.
+
+    :param local: instância de `LRUCache`.
+    :param shared: (opcional) backend do cache do Django.
+    """
+    def __init__(self, local, shared=None):
+        self.local = local
+        self.shared = shared
+        self._generation = time.time()
+
+    def generation(self):
+        if self.shared is None:
+            return self._generation
+
+        generation = self.shared.get(GENERATION_KEY)
+        if generation is None:
+            generation = time.time()
+            self.shared.set(GENERATION_KEY, generation, GENERATION_TIMEOUT)
+
+        return generation
+
+    def renew_generation(self):
+        self._generation = time.time()
+        if self.shared is not None:
+            self.shared.set(GENERATION_KEY, self._generation,
+                    GENERATION_TIMEOUT)
+
+        self.local.clear()
+
+    def _shared_key(self, key):
+        return 'thrift:%s:%s:%s' % key
+
+    def get_or_build(self, key, version, struct_cls, build):
+        """Retorna o struct de `key` na versão `version`, produzido por
+        `build` caso não esteja em cache.
+
+        A versão deve ser obtida antes da execução de `build`, de maneira que
+        alterações concorrentes resultem em versões distintas.
+
+        :param key: tupla (entidade, pk, collection_id).
+        :param version: tupla que identifica a versão dos dados.
+        :param struct_cls: classe do struct, utilizada na desserialização.
+        :param build: função sem argumentos que produz o struct.
+        """
+        version = (self.generation(),) + tuple(version)
+
+        cached = self.local.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        if self.shared is not None:
+            cached = self.shared.get(self._shared_key(key))
+            if cached is not None and cached[0] == version:
+                struct = deserialize(struct_cls(), cached[1])
+                self.local.set(key, (version, struct))
+                return struct
+
+        struct = build()
+
+        self.local.set(key, (version, struct))
+        if self.shared is not None:
+            self.shared.set(self._shared_key(key),
+                    (version, serialize(struct)), CACHE_TIMEOUT)
+
+        return struct
+
+
+RESULT_CACHE = ResultCache(LRUCache(CACHE_MAX_ENTRIES, CACHE_TIMEOUT),
+        shared=get_cache(CACHE_ALIAS) if CACHE_ALIAS else None)
+
+
+def invalidate_on_change(sender, instance, **kwargs):
+    if issubclass(sender, INVALIDATING_MODELS):
+        RESULT_CACHE.renew_generation()
+
+    elif issubclass(sender, models.Article):
+        # artigos recém criados, ainda sem fascículo, não fazem parte de
+        # nenhum struct
+        if not (kwargs.get('created') and instance.issue_id is None):
+            RESULT_CACHE.renew_generation()
+
+
+def invalidate_on_relations_change(sender, instance, action, **kwargs):
+    # `sender` é o modelo intermediário da relação
+    if (action in ('post_add', 'post_remove', 'post_clear') and
+            isinstance(instance, INVALIDATING_MODELS)):
+        RESULT_CACHE.renew_generation()
+
+
+def invalidate_on_bulk_update(sender, **kwargs):
+    RESULT_CACHE.renew_generation()
+
+
+post_save.connect(invalidate_on_change,
+        dispatch_uid='thrift.resultcache.invalidate_on_save')
+post_delete.connect(invalidate_on_change,
+        dispatch_uid='thrift.resultcache.invalidate_on_delete')
+m2m_changed.connect(invalidate_on_relations_change,
+        dispatch_uid='thrift.resultcache.invalidate_on_relations_change')
+models.bulk_updated.connect(invalidate_on_bulk_update,
+        dispatch_uid='thrift.resultcache.invalidate_on_bulk_update')
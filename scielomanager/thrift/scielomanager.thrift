@@ -31,7 +31,7 @@ namespace py scielomanager
  * IMPORTANTE! Alterar o valor de VERSION após qualquer alteração na interface.
  * Regras em: http://semver.org/lang/pt-BR/
  */
-const string VERSION = "2.1.0"
+const string VERSION = "2.5.0"
 
 
 #
@@ -73,6 +73,10 @@ struct RelatedArticle {
  * 
  * O campo `timestamp` é produzido pelo SciELO Manager e representa a data
  * de modificação do registro.
+ *
+ * Quando obtidos por meio de consultas com projeção de campos (ver
+ * `ScanArticlesOptions`), apenas `aid` e os campos solicitados são
+ * preenchidos.
  */
 struct Article {
     1: optional string abbrev_journal_title;
@@ -85,10 +89,10 @@ struct Article {
     8: optional string pid;
     9: required string aid;
     10: optional string head_subject;
-    11: required string article_type;
-    12: required string version;
+    11: optional string article_type;
+    12: optional string version;
     13: optional bool is_aop;
-    14: required string source;
+    14: optional string source;
     15: optional string timestamp;
     16: optional list<RelatedArticle> links_to;
     17: optional list<RelatedArticle> referrers;
@@ -250,6 +254,52 @@ struct ScanArticlesResults {
     2: optional string next_batch_id;
 }
 
+/*
+ * JournalsPage, IssuesPage e CollectionsPage representam uma página de
+ * resultados das funções de listagem paginadas por cursor.
+ *
+ * O campo `next_cursor` é um valor opaco que deve ser passado na próxima
+ * chamada para obter a página seguinte. Uma página vazia indica que não há
+ * mais resultados no momento; o mesmo cursor pode ser armazenado e utilizado
+ * posteriormente para retomar a coleta a partir daquele ponto.
+ */
+struct JournalsPage {
+    1: required list<Journal> items;
+    2: optional string next_cursor;
+}
+
+struct IssuesPage {
+    1: required list<Issue> items;
+    2: optional string next_cursor;
+}
+
+struct CollectionsPage {
+    1: required list<Collection> items;
+    2: optional string next_cursor;
+}
+
+/*
+ * ScanArticlesOptions representa opções de consultas realizadas por meio da
+ * função `scanArticlesWithOptions`.
+ *
+ *  - fields: lista dos campos de `Article` que devem ser retornados. O campo
+ *    `aid` é sempre retornado. A omissão do campo `source`, que contém o XML
+ *    completo, reduz consideravelmente o tamanho dos lotes.
+ *  - batch_size: quantidade aproximada de resultados por lote, limitada
+ *    pelo servidor.
+ *  - slice_id e max_slices: a consulta é particionada em `max_slices` fatias
+ *    disjuntas, e apenas a fatia `slice_id` (de 0 a max_slices - 1) é
+ *    percorrida. Dessa forma, um cliente pode percorrer concorrentemente as
+ *    `max_slices` fatias de uma consulta. O valor máximo de `max_slices` é
+ *    a quantidade de shards do índice.
+ */
+struct ScanArticlesOptions {
+    1: optional list<string> fields;
+    2: optional i32 batch_size;
+    3: optional i32 slice_id;
+    4: optional i32 max_slices;
+}
+
 /*
  * ResultStatus representa o status da execução de uma tarefa assíncrona.
  *
@@ -285,6 +335,16 @@ struct ArticleAssetMeta {
     2: optional string use_license;
 }
 
+/*
+ * ArticleAssetFile representa o conteúdo de um ativo digital a ser adicionado
+ * por meio de `addArticleAssets`.
+ */
+struct ArticleAssetFile {
+    1: string filename;
+    2: binary content;
+    3: optional ArticleAssetMeta meta;
+}
+
 
 service JournalManagerServices {
     /*
@@ -296,6 +356,22 @@ service JournalManagerServices {
     string addArticle(1:string xml_string, 2:bool overwrite) throws (
             1:ServerError srv_err);
 
+    /*
+     * Adiciona, em lote, novas entidades tipo Article, com base em seus docs
+     * XML. Todos os itens são processados por uma única tarefa e em uma
+     * única transação.
+     *
+     * Retorna string `task_id` correspondente ao identificador da tarefa
+     * criada. `task_id` deve ser utilizada para obter o resultado da função,
+     * que é uma lista com o resultado de cada item, na mesma ordem de
+     * `xml_strings`, no formato `[code, value]`. `code` igual a 0 indica
+     * sucesso e `value` é o `aid` do artigo; demais valores de `code`
+     * indicam erro (1: artigo duplicado, 2: XML inválido, 3: tipo inválido)
+     * e `value` é a mensagem de erro.
+     */
+    string addArticles(1:list<string> xml_strings, 2:bool overwrite) throws (
+            1:ServerError srv_err);
+
     /*
      * Adiciona um novo ativo digital, vinculado a uma entidade Article.
      *
@@ -305,6 +381,18 @@ service JournalManagerServices {
     string addArticleAsset(1:string aid, 2:string filename, 3:binary content, 
             4:ArticleAssetMeta meta) throws (1:ServerError srv_err);
 
+    /*
+     * Adiciona, em lote, novos ativos digitais vinculados a uma entidade
+     * Article (e.g. o conjunto de figuras do artigo). Todos os itens são
+     * processados por uma única tarefa e em uma única transação.
+     *
+     * Retorna string `task_id` correspondente ao identificador da tarefa
+     * criada. `task_id` deve ser utilizada para obter o resultado da função,
+     * que é a lista das URLs dos ativos, na mesma ordem de `assets`.
+     */
+    string addArticleAssets(1:string aid, 2:list<ArticleAssetFile> assets)
+            throws (1:ServerError srv_err);
+
     /*
      * Consulta o resultado da execução de uma determinada tarefa assíncrona.
      */
@@ -323,6 +411,18 @@ service JournalManagerServices {
     string scanArticles(1:string es_dsl_query) throws (1:ServerError srv_err, 
             2:BadRequestError req_err, 3:TimeoutError tou_err); 
 
+    /*
+     * Realiza consulta em entidades do tipo `Article`, assim como
+     * `scanArticles`, de acordo com as opções de projeção de campos, tamanho
+     * dos lotes e particionamento definidas em `options`.
+     *
+     * BadRequestError é levantada caso as opções de particionamento sejam
+     * inválidas.
+     */
+    string scanArticlesWithOptions(1:string es_dsl_query,
+            2:ScanArticlesOptions options) throws (1:ServerError srv_err,
+            2:BadRequestError req_err, 3:TimeoutError tou_err);
+
     /*
      * Obtém lote de resultados de consulta.
      *
@@ -401,4 +501,35 @@ service JournalManagerServices {
      */
 
     list<Collection> getCollections(1: optional string from_date, 2: optional string until_date, 3: i32 limit, 4: i32 offset)  throws (1:ServerError srv_err, 2:BadRequestError req_err)
+
+    /*
+     * Obtém página de periódicos de uma coleção ou de todo o catálogo.
+     *
+     * Os periódicos são ordenados pela data de modificação e o cursor
+     * codifica a posição do último item retornado, de maneira que a
+     * consulta de cada página tem custo proporcional ao seu tamanho e não é
+     * afetada pela inclusão de novos registros. Registros modificados durante
+     * a coleta são reposicionados no final da listagem. A primeira página é
+     * obtida omitindo `cursor`.
+     *
+     * BadRequestError é levantada caso `cursor` seja inválido.
+     */
+
+    JournalsPage getJournalsPage(1: optional i64 collection_id, 2: optional string from_date, 3: optional string until_date, 4: i32 limit, 5: optional string cursor)  throws (1:ServerError srv_err, 2:BadRequestError req_err)
+
+    /*
+     * Obtém página de fascículos de um periódico ou de todo o catálogo.
+     *
+     * Ver `getJournalsPage`.
+     */
+
+    IssuesPage getIssuesPage(1: optional i64 journal_id, 2: optional string from_date, 3: optional string until_date, 4: i32 limit, 5: optional string cursor)  throws (1:ServerError srv_err, 2:BadRequestError req_err)
+
+    /*
+     * Obtém página de coleções do catálogo.
+     *
+     * As coleções são ordenadas pelo seu identificador. Ver `getJournalsPage`.
+     */
+
+    CollectionsPage getCollectionsPage(1: i32 limit, 2: optional string cursor)  throws (1:ServerError srv_err, 2:BadRequestError req_err)
 }
@@ -1,16 +1,29 @@
 #coding: utf-8
 import logging
 import json
+import time
 import datetime
+import base64
+import threading
+from collections import defaultdict
 
-from django.db import close_connection
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
 from celery.result import AsyncResult
 
 from journalmanager import tasks
 from thrift import spec
+from thrift.resultcache import RESULT_CACHE
 from scielomanager import connectors
-from journalmanager.models import Journal, Issue, Collection, JournalTimeline
-from editorialmanager.models import EditorialBoard
+from journalmanager.models import (
+        Journal,
+        Issue,
+        Collection,
+        JournalTimeline,
+        Article,
+)
+from editorialmanager.models import EditorialBoard, EditorialMember
 from django.core.exceptions import ObjectDoesNotExist
 
 LOGGER = logging.getLogger(__name__)
@@ -18,28 +31,186 @@ ARTICLE_ES_CLIENT = connectors.ArticleElasticsearch()
 
 LIMIT = 100
 
+# Tempo máximo, em segundos, de reutilização das conexões com o BD. O valor 0
+# faz com que as conexões sejam fechadas ao final de cada chamada, e None
+# faz com que sejam mantidas indefinidamente.
+CONN_MAX_AGE = getattr(settings, 'THRIFT_CONFIG', {}).get('CONN_MAX_AGE', 600)
+
+# Tempo máximo, em segundos, de ociosidade de uma conexão com o BD antes que
+# a sua disponibilidade seja verificada por meio de `SELECT 1`. As conexões
+# encerradas pelo servidor do BD, por ociosidade ou reinício, não são
+# percebidas de outra maneira. O valor None desabilita a verificação.
+CONN_HEALTH_CHECK_INTERVAL = getattr(settings, 'THRIFT_CONFIG', {}).get(
+        'CONN_HEALTH_CHECK_INTERVAL', 30)
+
+CURSOR_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
 ERRNO_NS = {
         'IntegrityError': 1,
         'ValueError': 2,
 }
 
 
+_connection_state = threading.local()
+
+
+def _close_connection():
+    try:
+        connection.close()
+    except Exception as exc:
+        LOGGER.warning('Error while closing a DB connection: %s', exc)
+        connection.connection = None
+
+
+def _is_usable(raw_connection):
+    try:
+        cursor = raw_connection.cursor()
+        try:
+            cursor.execute('SELECT 1')
+        finally:
+            cursor.close()
+    except Exception:
+        return False
+
+    return True
+
+
+def close_obsolete_connection():
+    """ Fecha a conexão com o BD da thread corrente caso tenha sido fechada
+    pelo servidor, ou caso tenha excedido `CONN_MAX_AGE`. Conexões ociosas
+    por mais de `CONN_HEALTH_CHECK_INTERVAL` são verificadas.
+    """
+    raw_connection = connection.connection
+    if raw_connection is None:
+        return
+
+    if getattr(raw_connection, 'closed', False):
+        LOGGER.info('Discarding a DB connection closed by the server')
+        _close_connection()
+        return
+
+    now = time.time()
+    if getattr(_connection_state, 'connection_id', None) != id(raw_connection):
+        _connection_state.connection_id = id(raw_connection)
+        _connection_state.opened_at = now
+        _connection_state.used_at = now
+
+    if (CONN_MAX_AGE is not None and
+            now - _connection_state.opened_at >= CONN_MAX_AGE):
+        _close_connection()
+        return
+
+    if (CONN_HEALTH_CHECK_INTERVAL is not None and
+            now - _connection_state.used_at >= CONN_HEALTH_CHECK_INTERVAL):
+        if not _is_usable(raw_connection):
+            LOGGER.info('Discarding an unusable DB connection')
+            _close_connection()
+            return
+
+    _connection_state.used_at = now
+
+
+def release_connection():
+    """ Encerra a transação corrente, para que a conexão não permaneça ociosa
+    com uma transação aberta. Conexões inutilizáveis são fechadas.
+    """
+    if connection.connection is None:
+        return
+
+    try:
+        transaction.rollback_unless_managed()
+    except Exception as exc:
+        LOGGER.warning('Discarding an unusable DB connection: %s', exc)
+        _close_connection()
+    else:
+        close_obsolete_connection()
+
+
 def resource_cleanup(tocall):
-    """ O Celery vaza recursos de conexão com o BD quando utiliza o ORM como
-    backend de tarefas. Além disso, o próprio ORM do Django utiliza o signal
-    `request_finished` para disparar a rotina `django.db.close_connection`, e
-    como a interface RPC é dissociada dos ciclos convencionais de
-    request/response, devemos executar essa limpeza manualmente.
+    """ O Django utiliza os signals `request_started` e `request_finished`
+    para gerenciar as conexões com o BD, e como a interface RPC é dissociada
+    dos ciclos convencionais de request/response, devemos realizar esse
+    gerenciamento manualmente.
+
+    As conexões são mantidas entre as chamadas, uma por thread, e são
+    descartadas quando inutilizáveis ou quando excedem `CONN_MAX_AGE`.
     """
     def wrapper(*args, **kwargs):
+        close_obsolete_connection()
         try:
             return tocall(*args, **kwargs)
         finally:
-            close_connection()
+            release_connection()
 
     return wrapper
 
 
+def encode_cursor(key, pk):
+    """
+    Get the opaque continuation token for the position (`key`, `pk`).
+
+    :param key: datetime instance or None.
+    :param pk: primary key of the last item of the page.
+    """
+    if key is not None:
+        key = key.strftime(CURSOR_DATETIME_FORMAT)
+
+    return base64.urlsafe_b64encode(json.dumps([key, pk]))
+
+
+def decode_cursor(cursor):
+    """
+    Get the position (`key`, `pk`) encoded by `encode_cursor`.
+
+    Raises `spec.BadRequestError` if `cursor` is not valid.
+    """
+    try:
+        key, pk = json.loads(base64.urlsafe_b64decode(str(cursor)))
+        if key is not None:
+            key = datetime.datetime.strptime(key, CURSOR_DATETIME_FORMAT)
+
+        return key, int(pk)
+
+    except (TypeError, ValueError):
+        raise spec.BadRequestError(message=u'Invalid cursor: %s' % cursor)
+
+
+def paginate_by_cursor(queryset, limit, cursor=None, key_field=None):
+    """
+    Get a page of `queryset` and the cursor to the next page.
+
+    Items are ordered by (`key_field`, pk), or just by pk if `key_field` is
+    None, and the page is selected with a range condition on these fields
+    instead of an offset, so its cost does not depend on how deep it is.
+    When the page is empty the given `cursor` is returned, so harvesters
+    can resume later from the same position.
+
+    Returns a pair (list of items, cursor).
+    """
+    if key_field:
+        queryset = queryset.order_by(key_field, 'pk')
+    else:
+        queryset = queryset.order_by('pk')
+
+    if cursor:
+        key, pk = decode_cursor(cursor)
+        if key_field:
+            # the redundant `__gte` condition allows the use of the index on
+            # `key_field`.
+            queryset = queryset.filter(**{key_field + '__gte': key}).filter(
+                    Q(**{key_field + '__gt': key}) | Q(pk__gt=pk))
+        else:
+            queryset = queryset.filter(pk__gt=pk)
+
+    items = list(queryset[:limit])
+    if not items:
+        return items, cursor
+
+    last = items[-1]
+    key = getattr(last, key_field) if key_field else None
+    return items, encode_cursor(key, last.pk)
+
+
 def article_from_es(data):
     """
     Get an instance of `spec.Article` from Elasticsearch datastructure.
@@ -190,15 +361,27 @@ def editorial_board_member_from_model(data):
     return editorial_board_member
 
 
-def issue_from_model(data):
+def issue_from_model(data, journal=None, article_aids=None,
+        editorial_members=None):
     """
     Get an instance of `spec.Issue` from models.issue instance.
+
+    The optional arguments receive data previously loaded for a batch of
+    issues (see `issues_extra_data`), so no further queries are needed.
+
+    :param journal: (optional) instance of `spec.Journal` of the issue.
+    :param article_aids: (optional) list of the aids of the issue's articles.
+    :param editorial_members: (optional) list of models.EditorialMember
+                              instances of the issue's editorial board.
     """
 
-    try:
-        eb = data.editorialboard.editorialmember_set.all()
-    except ObjectDoesNotExist:
-        eb = []
+    if editorial_members is not None:
+        eb = editorial_members
+    else:
+        try:
+            eb = data.editorialboard.editorialmember_set.all()
+        except ObjectDoesNotExist:
+            eb = []
 
     try:
         it = data.issuetitle_set.all()
@@ -207,7 +390,7 @@ def issue_from_model(data):
 
     issue = spec.Issue(
         id=data.pk,
-        journal=journal_from_model(data.journal),
+        journal=journal or journal_from_model(data.journal),
         volume=data.volume,
         number=data.number,
         created=data.created.isoformat(),
@@ -224,13 +407,81 @@ def issue_from_model(data):
         spe_text=data.spe_text,
         identification=data.identification,
         issue_title=[issue_title_from_model(i) for i in it],
-        articles=[i.aid for i in data.articles.all()],
+        articles=(article_aids if article_aids is not None
+                  else list(data.articles.values_list('aid', flat=True))),
         editorial_board=[editorial_board_member_from_model(i) for i in eb]
     )
 
     return issue
 
 
+def journals_queryset():
+    """
+    Queryset of `Journal` with all the relations used by `journal_from_model`
+    previously loaded, so a whole page costs a fixed number of queries.
+    """
+    return Journal.objects.select_related('use_license').prefetch_related(
+            'study_areas', 'subject_categories', 'missions__language',
+            'issue_set')
+
+
+def issues_queryset():
+    """
+    Queryset of `Issue` with all the relations used by `issue_from_model`
+    previously loaded, except the ones loaded by `issues_extra_data`.
+    """
+    return Issue.objects.select_related('journal__use_license',
+            'use_license').prefetch_related('journal__study_areas',
+            'journal__subject_categories', 'journal__missions__language',
+            'journal__issue_set', 'issuetitle_set__language')
+
+
+def issues_extra_data(issues):
+    """
+    Loads, with one query each, the aids of the articles and the editorial
+    board members of all `issues`.
+
+    Returns a pair of mappings issue pk -> list.
+    """
+    issue_pks = [issue.pk for issue in issues]
+
+    article_aids = defaultdict(list)
+    for issue_pk, aid in Article.objects.filter(
+            issue__in=issue_pks).values_list('issue', 'aid'):
+        article_aids[issue_pk].append(aid)
+
+    editorial_members = defaultdict(list)
+    for member in EditorialMember.objects.select_related(
+            'role', 'board').filter(board__issue__in=issue_pks):
+        editorial_members[member.board.issue_id].append(member)
+
+    return article_aids, editorial_members
+
+
+def issues_from_models(issues):
+    """
+    Get a list of `spec.Issue` from the `issues` queryset, built with a
+    fixed number of queries regardless of its length.
+
+    :param issues: queryset produced by `issues_queryset`.
+    """
+    issues = list(issues)
+    article_aids, editorial_members = issues_extra_data(issues)
+
+    journals = {}
+    results = []
+    for issue in issues:
+        if issue.journal_id not in journals:
+            journals[issue.journal_id] = journal_from_model(issue.journal)
+
+        results.append(issue_from_model(issue,
+                journal=journals[issue.journal_id],
+                article_aids=article_aids[issue.pk],
+                editorial_members=editorial_members[issue.pk]))
+
+    return results
+
+
 def journal_timeline_from_model(jtl):
 
     timeline = []
@@ -247,6 +498,21 @@ def journal_timeline_from_model(jtl):
     return timeline
 
 
+def stage_asset(filename, content, meta=None):
+    """
+    Spool `content` to the assets staging area and get the reference to be
+    enqueued, so that only a few bytes go through the broker.
+
+    :param meta: (optional) `spec.ArticleAssetMeta` instance.
+    """
+    return {
+        'staged_name': tasks.stage_asset_content(content),
+        'filename': filename,
+        'owner': getattr(meta, 'owner', None),
+        'use_license': getattr(meta, 'use_license', None),
+    }
+
+
 class RPCHandler(object):
     """Implementação do serviço `JournalManagerServices`.
     """
@@ -261,6 +527,17 @@ class RPCHandler(object):
             LOGGER.exception(exc)
             raise spec.ServerError()
 
+    @resource_cleanup
+    def addArticles(self, xml_strings, overwrite):
+        try:
+            delayed_task = tasks.create_articles_from_strings.delay(
+                    xml_strings, overwrite_if_exists=overwrite)
+            return delayed_task.id
+
+        except Exception as exc:
+            LOGGER.exception(exc)
+            raise spec.ServerError()
+
     @resource_cleanup
     def getTaskResult(self, task_id):
         async_result = AsyncResult(task_id)
@@ -307,6 +584,27 @@ class RPCHandler(object):
             LOGGER.exception(exc)
             raise spec.ServerError()
 
+    def scanArticlesWithOptions(self, es_dsl_query, options):
+        options = options or spec.ScanArticlesOptions()
+        fields = options.fields
+        if fields and 'aid' not in fields:
+            fields = ['aid'] + list(fields)
+
+        try:
+            return ARTICLE_ES_CLIENT.scan(es_dsl_query, fields=fields,
+                    batch_size=options.batch_size, slice_id=options.slice_id,
+                    max_slices=options.max_slices)
+
+        except connectors.exceptions.BadRequestError as exc:
+            raise spec.BadRequestError(message=unicode(exc))
+
+        except connectors.exceptions.TimeoutError:
+            raise spec.TimeoutError()
+
+        except Exception as exc:
+            LOGGER.exception(exc)
+            raise spec.ServerError()
+
     def getScanArticlesBatch(self, batch_id):
         try:
             next_id, batch = ARTICLE_ES_CLIENT.scroll(batch_id)
@@ -337,57 +635,88 @@ class RPCHandler(object):
     @resource_cleanup
     def addArticleAsset(self, aid, filename, content, meta):
         try:
-            delayed_task = tasks.create_articleasset_from_bytes.delay(
-                    aid, filename, content, meta.owner, meta.use_license)
+            staged_asset = stage_asset(filename, content, meta)
+            delayed_task = tasks.create_articleasset_from_staging.delay(
+                    aid, staged_asset)
             return delayed_task.id
 
         except Exception as exc:
             LOGGER.exception(exc)
             raise spec.ServerError()
 
-    def getJournal(self, journal_id, collection_id=None):
-
+    @resource_cleanup
+    def addArticleAssets(self, aid, assets):
         try:
-            journal_model = Journal.objects.get(pk=journal_id)
-            journal_struct = journal_from_model(journal_model)
-        except Journal.DoesNotExist:
-            raise spec.DoesNotExist()
+            staged_assets = [stage_asset(asset.filename, asset.content,
+                                         asset.meta)
+                             for asset in assets]
+            delayed_task = tasks.create_articleassets_from_staging.delay(
+                    aid, staged_assets)
+            return delayed_task.id
+
         except Exception as exc:
-            LOGGER.ServerError(exc)
+            LOGGER.exception(exc)
             raise spec.ServerError()
 
-        journal_struct.timeline = []
+    @resource_cleanup
+    def getJournal(self, journal_id, collection_id=None):
 
-        if collection_id:
-            jtl_model = JournalTimeline.objects.filter(
-                journal=journal_model, collection=collection_id).order_by('since')
+        def build():
+            journal_model = journals_queryset().get(pk=journal_id)
+            journal_struct = journal_from_model(journal_model)
+            journal_struct.timeline = []
+
+            if collection_id:
+                jtl_model = JournalTimeline.objects.filter(
+                    journal=journal_model, collection=collection_id).order_by('since')
+
+                journal_struct.timeline = journal_timeline_from_model(jtl_model)
 
-            journal_struct.timeline = journal_timeline_from_model(jtl_model)
+            return journal_struct
 
-        return journal_struct
+        try:
+            return RESULT_CACHE.get_or_build(
+                    ('journal', journal_id, collection_id), (), spec.Journal,
+                    build)
+        except Journal.DoesNotExist:
+            raise spec.DoesNotExist()
+        except Exception as exc:
+            LOGGER.exception(exc)
+            raise spec.ServerError()
 
+    @resource_cleanup
     def getIssue(self, issue_id):
 
+        def build():
+            return issue_from_model(issues_queryset().get(pk=issue_id))
+
         try:
-            data = Issue.objects.get(pk=issue_id)
-            return issue_from_model(data)
+            return RESULT_CACHE.get_or_build(('issue', issue_id, None), (),
+                    spec.Issue, build)
         except Issue.DoesNotExist:
             raise spec.DoesNotExist()
         except Exception as exc:
-            LOGGER.ServerError(exc)
+            LOGGER.exception(exc)
             raise spec.ServerError()
 
+    @resource_cleanup
     def getCollection(self, collection_id):
 
+        def build():
+            return collection_from_model(
+                    Collection.objects.get(pk=collection_id))
+
         try:
-            data = Collection.objects.get(pk=collection_id)
-            return collection_from_model(data)
+            return RESULT_CACHE.get_or_build(
+                    ('collection', collection_id, None), (), spec.Collection,
+                    build)
         except Collection.DoesNotExist:
             raise spec.DoesNotExist()
         except Exception as exc:
-            LOGGER.ServerError(exc)
+            LOGGER.exception(exc)
             raise spec.ServerError()
 
+    @resource_cleanup
     def getJournals(self, collection_id, from_date=None, until_date=None, limit=None, offset=None):
         query = {}
         limit = limit or LIMIT
@@ -404,13 +733,14 @@ class RPCHandler(object):
             query['collections__pk'] = collection_id
 
         try:
-            data = [journal_from_model(i) for i in Journal.objects.filter(**query)[offset:offset+limit]]
+            data = [journal_from_model(i) for i in journals_queryset().filter(**query)[offset:offset+limit]]
         except Exception as exc:
             LOGGER.ServerError(exc)
             raise spec.ServerError()
 
         return data
 
+    @resource_cleanup
     def getIssues(self, journal_id, from_date=None, until_date=None, limit=None, offset=None):
         query = {}
         limit = limit or LIMIT
@@ -427,13 +757,14 @@ class RPCHandler(object):
             query['journal__pk'] = journal_id
 
         try:
-            data = [issue_from_model(i) for i in Issue.objects.filter(**query)[offset:offset+limit]]
+            data = issues_from_models(issues_queryset().filter(**query)[offset:offset+limit])
         except Exception as exc:
             LOGGER.ServerError(exc)
             raise spec.ServerError()
 
         return data
 
+    @resource_cleanup
     def getCollections(self, from_date=None, until_date=None, limit=None, offset=None):
         query = {}
         limit = limit or LIMIT
@@ -452,3 +783,78 @@ class RPCHandler(object):
             raise spec.ServerError()
 
         return data
+
+    @resource_cleanup
+    def getJournalsPage(self, collection_id=None, from_date=None,
+            until_date=None, limit=None, cursor=None):
+        query = {}
+        limit = limit or LIMIT
+
+        if from_date or until_date:
+            from_date = from_date or '0001-01-01'
+            until_date = until_date or datetime.datetime.now().isoformat()[:10]
+            query = {
+                "created__range": [from_date, until_date]
+            }
+
+        if collection_id:
+            query['collections__pk'] = collection_id
+
+        try:
+            journals, next_cursor = paginate_by_cursor(
+                    journals_queryset().filter(**query), limit, cursor=cursor,
+                    key_field='updated')
+            data = [journal_from_model(i) for i in journals]
+        except spec.BadRequestError:
+            raise
+        except Exception as exc:
+            LOGGER.exception(exc)
+            raise spec.ServerError()
+
+        return spec.JournalsPage(items=data, next_cursor=next_cursor)
+
+    @resource_cleanup
+    def getIssuesPage(self, journal_id=None, from_date=None, until_date=None,
+            limit=None, cursor=None):
+        query = {}
+        limit = limit or LIMIT
+
+        if from_date or until_date:
+            from_date = from_date or '0001-01-01'
+            until_date = until_date or datetime.datetime.now().isoformat()[:10]
+            query = {
+                "created__range": [from_date, until_date]
+            }
+
+        if journal_id:
+            query['journal__pk'] = journal_id
+
+        try:
+            issues, next_cursor = paginate_by_cursor(
+                    issues_queryset().filter(**query), limit, cursor=cursor,
+                    key_field='updated')
+            data = issues_from_models(issues)
+        except spec.BadRequestError:
+            raise
+        except Exception as exc:
+            LOGGER.exception(exc)
+            raise spec.ServerError()
+
+        return spec.IssuesPage(items=data, next_cursor=next_cursor)
+
+    @resource_cleanup
+    def getCollectionsPage(self, limit=None, cursor=None):
+        limit = limit or LIMIT
+
+        try:
+            collections, next_cursor = paginate_by_cursor(
+                    Collection.objects.prefetch_related('journal_set'), limit,
+                    cursor=cursor)
+            data = [collection_from_model(i) for i in collections]
+        except spec.BadRequestError:
+            raise
+        except Exception as exc:
+            LOGGER.exception(exc)
+            raise spec.ServerError()
+
+        return spec.CollectionsPage(items=data, next_cursor=next_cursor)
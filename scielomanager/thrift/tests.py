@@ -0,0 +1,575 @@
+# coding: utf-8
+import os
+import time
+import Queue
+import shutil
+import signal
+import datetime
+import tempfile
+import threading
+
+from django.test import TestCase, SimpleTestCase
+from django.db import connection, DatabaseError
+from django.core.cache import get_cache
+from thriftpy.transport import TTransportException
+
+from journalmanager import models
+from journalmanager.tests import modelfactories
+from thrift import server, resultcache, workers
+
+
+# quantidade máxima de consultas ao banco de dados por página de resultados.
+QUERIES_BUDGET = 12
+
+
+def count_queries(func, *args, **kwargs):
+    """Retorna a quantidade de consultas ao banco de dados realizadas durante
+    a execução de `func`.
+    """
+    old_debug_cursor = connection.use_debug_cursor
+    connection.use_debug_cursor = True
+    try:
+        start = len(connection.queries)
+        func(*args, **kwargs)
+        return len(connection.queries) - start
+    finally:
+        connection.use_debug_cursor = old_debug_cursor
+
+
+class ResourceCleanupTests(TestCase):
+
+    def test_connections_are_reused_between_calls(self):
+        @server.resource_cleanup
+        def get_raw_connection():
+            modelfactories.CollectionFactory.create()
+            return connection.connection
+
+        self.assertIs(get_raw_connection(), get_raw_connection())
+
+
+class BrokenConnection(object):
+    """Conexão encerrada pelo servidor do BD sem que o cliente perceba."""
+    closed = False
+
+    def __init__(self):
+        self.close_calls = 0
+
+    def cursor(self):
+        raise DatabaseError('server closed the connection unexpectedly')
+
+    def close(self):
+        self.close_calls += 1
+
+
+class CloseObsoleteConnectionTests(TestCase):
+
+    def _make_idle(self, raw_connection):
+        now = time.time()
+        server._connection_state.connection_id = id(raw_connection)
+        server._connection_state.opened_at = now
+        server._connection_state.used_at = (
+                now - server.CONN_HEALTH_CHECK_INTERVAL - 1)
+
+    def test_idle_usable_connections_are_kept(self):
+        connection.cursor()
+        raw_connection = connection.connection
+        self._make_idle(raw_connection)
+
+        server.close_obsolete_connection()
+
+        self.assertIs(connection.connection, raw_connection)
+
+    def test_idle_unusable_connections_are_closed(self):
+        connection.cursor()
+        raw_connection = connection.connection
+        broken = BrokenConnection()
+        connection.connection = broken
+        try:
+            self._make_idle(broken)
+            server.close_obsolete_connection()
+            self.assertEqual(broken.close_calls, 1)
+        finally:
+            connection.connection = raw_connection
+
+    def test_recently_used_connections_are_not_checked(self):
+        connection.cursor()
+        raw_connection = connection.connection
+        broken = BrokenConnection()
+        connection.connection = broken
+        try:
+            server._connection_state.connection_id = None
+            server.close_obsolete_connection()
+            self.assertEqual(broken.close_calls, 0)
+        finally:
+            connection.connection = raw_connection
+
+
+class GetJournalsQueriesTests(TestCase):
+
+    def _make_journals(self, total):
+        for _ in range(total):
+            journal = modelfactories.JournalFactory.create()
+            journal.study_areas.add(modelfactories.StudyAreaFactory.create())
+            journal.subject_categories.add(
+                    modelfactories.SubjectCategoryFactory.create())
+            modelfactories.IssueFactory.create(journal=journal)
+
+    def test_queries_do_not_grow_with_page_size(self):
+        handler = server.RPCHandler()
+
+        self._make_journals(1)
+        single = count_queries(handler.getJournals, None, limit=100)
+
+        self._make_journals(4)
+        many = count_queries(handler.getJournals, None, limit=100)
+
+        self.assertEqual(single, many)
+        self.assertTrue(many <= QUERIES_BUDGET)
+
+    def test_journals_are_returned(self):
+        self._make_journals(3)
+        journals = server.RPCHandler().getJournals(None, limit=100)
+
+        self.assertEqual(len(journals), 3)
+        for journal in journals:
+            self.assertEqual(len(journal.study_areas), 1)
+            self.assertEqual(len(journal.issues), 1)
+
+
+class GetIssuesQueriesTests(TestCase):
+
+    def _make_issues(self, total):
+        for _ in range(total):
+            issue = modelfactories.IssueFactory.create()
+            modelfactories.IssueTitleFactory.create(issue=issue)
+
+    def test_queries_do_not_grow_with_page_size(self):
+        handler = server.RPCHandler()
+
+        self._make_issues(1)
+        single = count_queries(handler.getIssues, None, limit=100)
+
+        self._make_issues(4)
+        many = count_queries(handler.getIssues, None, limit=100)
+
+        self.assertEqual(single, many)
+        self.assertTrue(many <= QUERIES_BUDGET)
+
+    def test_issues_are_returned(self):
+        self._make_issues(3)
+        issues = server.RPCHandler().getIssues(None, limit=100)
+
+        self.assertEqual(len(issues), 3)
+        for issue in issues:
+            self.assertEqual(len(issue.issue_title), 1)
+            self.assertEqual(issue.articles, [])
+            self.assertEqual(issue.editorial_board, [])
+
+
+class CursorTests(TestCase):
+
+    def test_encoded_position_is_decoded(self):
+        key = datetime.datetime(2015, 3, 4, 10, 20, 30, 123)
+        cursor = server.encode_cursor(key, 42)
+
+        self.assertEqual(server.decode_cursor(cursor), (key, 42))
+
+    def test_position_without_key(self):
+        cursor = server.encode_cursor(None, 42)
+        self.assertEqual(server.decode_cursor(cursor), (None, 42))
+
+    def test_invalid_cursors_raise_BadRequestError(self):
+        # respectivamente: base64 inválido, `[]` e `[null, null]`.
+        for cursor in ['foo', 'W10=', 'W251bGwsIG51bGxd']:
+            self.assertRaises(server.spec.BadRequestError,
+                    server.decode_cursor, cursor)
+
+
+class GetJournalsPageTests(TestCase):
+
+    def test_pages_cover_all_journals_once(self):
+        journals = [modelfactories.JournalFactory.create() for _ in range(5)]
+        handler = server.RPCHandler()
+
+        seen = []
+        cursor = None
+        while True:
+            page = handler.getJournalsPage(limit=2, cursor=cursor)
+            if not page.items:
+                break
+            seen.extend(j.id for j in page.items)
+            cursor = page.next_cursor
+
+        self.assertEqual(sorted(seen), sorted(j.pk for j in journals))
+
+    def test_empty_page_keeps_the_cursor(self):
+        modelfactories.JournalFactory.create()
+        handler = server.RPCHandler()
+
+        cursor = handler.getJournalsPage(limit=10).next_cursor
+        page = handler.getJournalsPage(limit=10, cursor=cursor)
+
+        self.assertEqual(page.items, [])
+        self.assertEqual(page.next_cursor, cursor)
+
+    def test_updated_journals_are_harvested_again(self):
+        journal = modelfactories.JournalFactory.create()
+        handler = server.RPCHandler()
+
+        cursor = handler.getJournalsPage(limit=10).next_cursor
+        journal.save()
+        page = handler.getJournalsPage(limit=10, cursor=cursor)
+
+        self.assertEqual([j.id for j in page.items], [journal.pk])
+
+    def test_invalid_cursor_raises_BadRequestError(self):
+        self.assertRaises(server.spec.BadRequestError,
+                server.RPCHandler().getJournalsPage, limit=10, cursor='foo')
+
+
+class GetIssuesPageTests(TestCase):
+
+    def test_pages_cover_all_issues_once(self):
+        issues = [modelfactories.IssueFactory.create() for _ in range(5)]
+        handler = server.RPCHandler()
+
+        seen = []
+        cursor = None
+        while True:
+            page = handler.getIssuesPage(limit=2, cursor=cursor)
+            if not page.items:
+                break
+            seen.extend(i.id for i in page.items)
+            cursor = page.next_cursor
+
+        self.assertEqual(sorted(seen), sorted(i.pk for i in issues))
+
+
+class GetCollectionsPageTests(TestCase):
+
+    def test_pages_cover_all_collections_once(self):
+        collections = [modelfactories.CollectionFactory.create()
+                       for _ in range(3)]
+        handler = server.RPCHandler()
+
+        first = handler.getCollectionsPage(limit=2)
+        second = handler.getCollectionsPage(limit=2, cursor=first.next_cursor)
+
+        self.assertEqual([c.id for c in first.items + second.items],
+                         [c.pk for c in collections])
+
+
+class LRUCacheTests(TestCase):
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = resultcache.LRUCache(max_entries=2, timeout=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_expired_entries_are_missed(self):
+        cache = resultcache.LRUCache(max_entries=2, timeout=-1)
+        cache.set('a', 1)
+
+        self.assertIsNone(cache.get('a'))
+
+
+class ResultCacheTests(TestCase):
+
+    def setUp(self):
+        self.cache = resultcache.ResultCache(
+                resultcache.LRUCache(max_entries=10, timeout=60))
+        self.builds = []
+
+    def _build(self):
+        struct = server.spec.Collection(name=u'Brasil', acronym=u'scl')
+        self.builds.append(struct)
+        return struct
+
+    def test_structs_are_built_once_per_version(self):
+        key = ('collection', 1, None)
+        first = self.cache.get_or_build(key, (1,), server.spec.Collection,
+                self._build)
+        second = self.cache.get_or_build(key, (1,), server.spec.Collection,
+                self._build)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.builds), 1)
+
+    def test_new_versions_are_rebuilt(self):
+        key = ('collection', 1, None)
+        self.cache.get_or_build(key, (1,), server.spec.Collection, self._build)
+        self.cache.get_or_build(key, (2,), server.spec.Collection, self._build)
+
+        self.assertEqual(len(self.builds), 2)
+
+    def test_new_generations_are_rebuilt(self):
+        key = ('collection', 1, None)
+        self.cache.get_or_build(key, (), server.spec.Collection, self._build)
+        self.cache.renew_generation()
+        self.cache.get_or_build(key, (), server.spec.Collection, self._build)
+
+        self.assertEqual(len(self.builds), 2)
+
+    def test_generations_renewed_by_other_processes_are_rebuilt(self):
+        shared = get_cache('django.core.cache.backends.locmem.LocMemCache')
+        cache = resultcache.ResultCache(
+                resultcache.LRUCache(max_entries=10, timeout=60), shared)
+        other_process_cache = resultcache.ResultCache(
+                resultcache.LRUCache(max_entries=10, timeout=60), shared)
+
+        key = ('collection', 1, None)
+        cache.get_or_build(key, (), server.spec.Collection, self._build)
+        other_process_cache.renew_generation()
+        cache.get_or_build(key, (), server.spec.Collection, self._build)
+
+        self.assertEqual(len(self.builds), 2)
+
+
+class InvalidationTests(TestCase):
+
+    def setUp(self):
+        self.generation = resultcache.RESULT_CACHE.generation()
+
+    def test_serialized_models_renew_the_generation(self):
+        modelfactories.JournalFactory.create()
+
+        self.assertNotEqual(resultcache.RESULT_CACHE.generation(),
+                self.generation)
+
+    def test_new_articles_without_issue_keep_the_generation(self):
+        modelfactories.ArticleFactory.create()
+
+        self.assertEqual(resultcache.RESULT_CACHE.generation(),
+                self.generation)
+
+    def test_bulk_updates_renew_the_generation(self):
+        models.bulk_updated.send(sender=models.Article, journal_pks=[1])
+
+        self.assertNotEqual(resultcache.RESULT_CACHE.generation(),
+                self.generation)
+
+
+class GetJournalCacheTests(TestCase):
+
+    def test_repeated_reads_are_served_from_cache(self):
+        journal = modelfactories.JournalFactory.create()
+        handler = server.RPCHandler()
+
+        handler.getJournal(journal.pk)
+        self.assertEqual(count_queries(handler.getJournal, journal.pk), 0)
+
+    def test_changes_are_visible(self):
+        journal = modelfactories.JournalFactory.create()
+        handler = server.RPCHandler()
+        handler.getJournal(journal.pk)
+
+        journal.title = u'Other title'
+        journal.save()
+
+        self.assertEqual(handler.getJournal(journal.pk).title, u'Other title')
+
+    def test_issues_moved_in_bulk_are_visible(self):
+        journal = modelfactories.JournalFactory.create()
+        issue = modelfactories.IssueFactory.create()
+        handler = server.RPCHandler()
+        handler.getJournal(journal.pk)
+
+        # `update` não dispara signals
+        models.Issue.objects.filter(pk=issue.pk).update(journal=journal)
+        models.bulk_updated.send(sender=models.Issue, journal_pks=[journal.pk])
+
+        self.assertEqual(handler.getJournal(journal.pk).issues, [issue.pk])
+
+    def test_missing_journals_raise_DoesNotExist(self):
+        self.assertRaises(server.spec.DoesNotExist,
+                server.RPCHandler().getJournal, 0)
+
+
+class GetIssueCacheTests(TestCase):
+
+    def test_repeated_reads_are_served_from_cache(self):
+        issue = modelfactories.IssueFactory.create()
+        handler = server.RPCHandler()
+
+        handler.getIssue(issue.pk)
+        self.assertEqual(count_queries(handler.getIssue, issue.pk), 0)
+
+    def test_linked_articles_are_visible(self):
+        issue = modelfactories.IssueFactory.create()
+        article = modelfactories.ArticleFactory.create()
+        handler = server.RPCHandler()
+        handler.getIssue(issue.pk)
+
+        article.issue = issue
+        article.save()
+
+        self.assertEqual(handler.getIssue(issue.pk).articles, [article.aid])
+
+    def test_missing_issues_raise_DoesNotExist(self):
+        self.assertRaises(server.spec.DoesNotExist,
+                server.RPCHandler().getIssue, 0)
+
+
+class StubClient(object):
+    """Conexão aceita pelo servidor, que atua também como transporte e
+    protocolo.
+    """
+    def __init__(self):
+        self.close_calls = 0
+
+    def get_transport(self, client):
+        return client
+
+    def get_protocol(self, trans):
+        return trans
+
+    def close(self):
+        self.close_calls += 1
+
+
+class StubServerTransport(object):
+    """Socket do servidor, que entrega os clientes de `clients` e, após o
+    início do encerramento, é interrompido como pelo recebimento de sinais.
+    """
+    def __init__(self, clients):
+        self.clients = Queue.Queue()
+        for client in clients:
+            self.clients.put(client)
+        self.stopping = None
+
+    def listen(self):
+        pass
+
+    def accept(self):
+        while True:
+            try:
+                return self.clients.get(timeout=0.01)
+            except Queue.Empty:
+                if self.stopping.is_set():
+                    raise IOError('interrupted system call')
+
+
+class BlockingProcessor(object):
+    """Processor cuja primeira chamada aguarda `release`."""
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.finished = threading.Event()
+
+    def process(self, iprot, oprot):
+        if self.finished.is_set():
+            raise TTransportException()
+
+        self.started.set()
+        self.release.wait(5)
+        self.finished.set()
+
+
+class ThreadPoolServerTests(SimpleTestCase):
+
+    def _make_server(self, drain_timeout):
+        self.client = StubClient()
+        self.processor = BlockingProcessor()
+        trans = StubServerTransport([self.client])
+        thrift_server = workers.ThreadPoolServer(self.processor, trans,
+                itrans_factory=self.client, iprot_factory=self.client,
+                otrans_factory=self.client, oprot_factory=self.client,
+                threads=2, drain_timeout=drain_timeout)
+        trans.stopping = thrift_server.stopping
+        return thrift_server
+
+    def _serve(self, thrift_server):
+        serving = threading.Thread(target=thrift_server.serve)
+        serving.daemon = True
+        serving.start()
+        self.assertTrue(self.processor.started.wait(5))
+        return serving
+
+    def tearDown(self):
+        self.processor.release.set()
+
+    def test_accepted_calls_are_completed_before_stopping(self):
+        thrift_server = self._make_server(drain_timeout=5)
+        serving = self._serve(thrift_server)
+
+        thrift_server.stopping.set()
+        serving.join(0.1)
+        self.assertTrue(serving.is_alive())
+
+        self.processor.release.set()
+        serving.join(5)
+        self.assertFalse(serving.is_alive())
+        self.assertTrue(self.processor.finished.is_set())
+        self.assertEqual(self.client.close_calls, 2)
+
+    def test_stops_after_drain_timeout(self):
+        thrift_server = self._make_server(drain_timeout=0.1)
+        serving = self._serve(thrift_server)
+
+        thrift_server.stopping.set()
+        serving.join(5)
+
+        self.assertFalse(serving.is_alive())
+        self.assertFalse(self.processor.finished.is_set())
+
+
+class PreforkStubServer(object):
+    """Servidor cujos processos registram o seu pid em `directory`. O
+    primeiro processo termina com erro, e o processo que completa
+    `processes` registros solicita o encerramento do processo pai.
+    """
+    def __init__(self, directory, processes):
+        self.directory = directory
+        self.processes = processes
+        self.trans = StubServerTransport([])
+        self.stopping = threading.Event()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stopping.set())
+
+    def serve(self, listen=True):
+        crash_marker = os.path.join(self.directory, 'crashed')
+        try:
+            os.close(os.open(crash_marker, os.O_CREAT | os.O_EXCL))
+        except OSError:
+            pass
+        else:
+            raise RuntimeError('first process crashed')
+
+        open(os.path.join(self.directory, str(os.getpid())), 'w').close()
+        if len(os.listdir(self.directory)) - 1 == self.processes:
+            os.kill(os.getppid(), signal.SIGTERM)
+
+        while not self.stopping.is_set():
+            self.stopping.wait(0.01)
+
+
+class ServePreforkTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.old_handlers = dict((signum, signal.getsignal(signum))
+                for signum in (signal.SIGTERM, signal.SIGINT))
+        self.old_respawn_delay = workers.RESPAWN_DELAY
+        workers.RESPAWN_DELAY = 0
+
+    def tearDown(self):
+        workers.RESPAWN_DELAY = self.old_respawn_delay
+        for signum, handler in self.old_handlers.items():
+            signal.signal(signum, handler)
+        shutil.rmtree(self.directory)
+
+    def test_crashed_processes_are_respawned_and_all_are_stopped(self):
+        workers.serve_prefork(PreforkStubServer(self.directory, 2), 2)
+
+        pids = set(os.listdir(self.directory)) - set(['crashed'])
+        self.assertEqual(len(pids), 2)
+        for pid in pids:
+            # todos os processos filhos já foram coletados
+            self.assertRaises(OSError, os.waitpid, int(pid), os.WNOHANG)
@@ -0,0 +1,223 @@
+# coding: utf-8
+"""
+Modos de execução do servidor Thrift.
+
+- threaded: um único processo com um pool de threads, que atendem as conexões
+  aceitas pela thread principal.
+- prefork: um conjunto de processos filhos, cada um com o seu próprio pool de
+  threads, que compartilham o socket aberto pelo processo pai. Como as threads
+  de um mesmo processo disputam o GIL, esse é o modo que distribui as chamadas
+  entre os núcleos da máquina.
+
+Em ambos os modos, os sinais SIGTERM e SIGINT iniciam o encerramento gracioso:
+novas conexões deixam de ser aceitas, e as conexões já aceitas são atendidas
+por até `drain_timeout` segundos.
+"""
+import os
+import time
+import errno
+import signal
+import logging
+import threading
+import Queue
+
+from django.db import close_connection
+from thriftpy.server import TThreadedServer
+from thriftpy.transport import TTransportException
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Intervalo mínimo, em segundos, entre a morte e a recriação de um processo.
+RESPAWN_DELAY = 1
+# Intervalo, em segundos, entre tentativas de aceitar conexões após um erro.
+ACCEPT_ERROR_DELAY = 0.1
+# Intervalo, em segundos, entre verificações de disponibilidade de threads.
+IDLE_POLL_INTERVAL = 0.01
+
+
+class ThreadPoolServer(TThreadedServer):
+    """Servidor Thrift com uma quantidade fixa de threads.
+
+    Novas conexões são aceitas apenas quando há threads disponíveis, de
+    maneira que, no modo prefork, as conexões são distribuídas entre os
+    processos ociosos. Cada thread mantém a sua própria conexão com o BD.
+    """
+    def __init__(self, *args, **kwargs):
+        self.threads = kwargs.pop('threads')
+        self.drain_timeout = kwargs.pop('drain_timeout')
+        super(ThreadPoolServer, self).__init__(*args, **kwargs)
+
+        self.stopping = threading.Event()
+        self._clients = Queue.Queue()
+        self._idle = threading.Semaphore(self.threads)
+        self._workers = []
+
+    @classmethod
+    def from_server(cls, server, threads, drain_timeout):
+        """Cria uma instância com os mesmos processor, transporte e
+        protocolos de `server`.
+        """
+        return cls(server.processor, server.trans,
+                   itrans_factory=server.itrans_factory,
+                   iprot_factory=server.iprot_factory,
+                   otrans_factory=server.otrans_factory,
+                   oprot_factory=server.oprot_factory,
+                   threads=threads, drain_timeout=drain_timeout)
+
+    def install_signal_handlers(self):
+        def stop(signum, frame):
+            LOGGER.info('Received signal %s. Stopping', signum)
+            self.stopping.set()
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, stop)
+
+    def serve(self, listen=True):
+        """Atende as conexões até que `self.stopping` seja sinalizado.
+
+        :param listen: (opcional) se False, o socket já deve estar aberto.
+        """
+        if listen:
+            self.trans.listen()
+
+        for _ in range(self.threads):
+            worker = threading.Thread(target=self._work)
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+        LOGGER.info('Process %s serving with %s threads', os.getpid(),
+                self.threads)
+
+        while not self.stopping.is_set():
+            # `Semaphore.acquire` bloqueante não é interrompido por sinais
+            if not self._idle.acquire(False):
+                self.stopping.wait(IDLE_POLL_INTERVAL)
+                continue
+
+            try:
+                client = self.trans.accept()
+            except Exception as exc:
+                # o recebimento de sinais interrompe `accept`
+                self._idle.release()
+                if not self.stopping.is_set():
+                    LOGGER.exception(exc)
+                    time.sleep(ACCEPT_ERROR_DELAY)
+                continue
+
+            self._clients.put(client)
+
+        self._drain()
+
+    def handle(self, client):
+        itrans = self.itrans_factory.get_transport(client)
+        otrans = self.otrans_factory.get_transport(client)
+        iprot = self.iprot_factory.get_protocol(itrans)
+        oprot = self.oprot_factory.get_protocol(otrans)
+
+        try:
+            while not self.stopping.is_set():
+                self.processor.process(iprot, oprot)
+        except TTransportException:
+            pass
+        except Exception as exc:
+            LOGGER.exception(exc)
+        finally:
+            itrans.close()
+            otrans.close()
+
+    def _work(self):
+        try:
+            while True:
+                client = self._clients.get()
+                if client is None:
+                    break
+
+                try:
+                    self.handle(client)
+                finally:
+                    self._idle.release()
+        finally:
+            close_connection()
+
+    def _drain(self):
+        LOGGER.info('Process %s draining connections', os.getpid())
+
+        for _ in self._workers:
+            self._clients.put(None)
+
+        deadline = time.time() + self.drain_timeout
+        for worker in self._workers:
+            worker.join(max(0, deadline - time.time()))
+
+        pending = len([w for w in self._workers if w.is_alive()])
+        if pending:
+            LOGGER.warning('Process %s stopped with %s threads still busy',
+                    os.getpid(), pending)
+
+
+def serve_prefork(server, processes):
+    """Executa `server` em `processes` processos filhos, que são recriados
+    caso terminem inesperadamente.
+
+    :param server: instância de `ThreadPoolServer`.
+    """
+    server.trans.listen()
+    # as conexões com o BD não podem ser compartilhadas entre processos
+    close_connection()
+
+    children = set()
+    stopping = threading.Event()
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                server.install_signal_handlers()
+                # sinal recebido antes da instalação dos handlers
+                if stopping.is_set():
+                    server.stopping.set()
+                server.serve(listen=False)
+            except Exception as exc:
+                LOGGER.exception(exc)
+                status = 1
+            finally:
+                os._exit(status)
+
+        children.add(pid)
+        # sinal recebido antes que o processo fosse registrado em `children`
+        if stopping.is_set():
+            os.kill(pid, signal.SIGTERM)
+
+    def stop(signum, frame):
+        LOGGER.info('Received signal %s. Stopping %s processes', signum,
+                len(children))
+        stopping.set()
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, stop)
+
+    for _ in range(processes):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except OSError as exc:
+            if exc.errno == errno.EINTR:
+                continue
+            raise
+
+        children.discard(pid)
+        if not stopping.is_set():
+            LOGGER.warning('Process %s exited with status %s. Respawning',
+                    pid, status)
+            time.sleep(RESPAWN_DELAY)
+            spawn()
@@ -4,6 +4,7 @@ import lxml
 import pkg_resources
 import packtools
 from scielomanager.tools import get_setting_or_raise
+from scielomanager.utils.schematron import get_schematron
 logger = logging.getLogger(__name__)
 
 try:
@@ -46,8 +47,8 @@ def analyze_xml(file, extra_schematron=None):
     """
     result = err = None
     if extra_schematron:
-        extra_sch = packtools.utils.get_schematron_from_filepath(
-                extra_schematron)
+        extra_sch = get_schematron(extra_schematron,
+                factory=packtools.utils.get_schematron_from_filepath)
         extra_sch = [extra_sch]
     else:
         extra_sch = None